@@ -6,16 +6,24 @@ Discovers active hosts on the network using multiple methods
 
 import subprocess
 import re
+import sys
 import json
 from datetime import datetime
-from typing import List, Dict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+MAPPING_DIR = REPO_ROOT / "scripts" / "05_network_mapping"
+
+if str(MAPPING_DIR) not in sys.path:
+    sys.path.insert(0, str(MAPPING_DIR))
+from device_table import DeviceTable, DISCOVERY_FIELDS
 
 class HostDiscovery:
     def __init__(self, subnet: str = "192.168.0"):
         self.subnet = subnet
-        self.discovered_hosts = []
+        self.discovered_hosts = DeviceTable(fields=DISCOVERY_FIELDS)
     
-    def arp_scan(self) -> List[Dict]:
+    def arp_scan(self) -> DeviceTable:
         """Scan network using ARP cache"""
         print("[*] Running ARP scan...")
         
@@ -45,12 +53,12 @@ class HostDiscovery:
                             "timestamp": datetime.now().isoformat()
                         })
             
-            self.discovered_hosts = hosts
-            return hosts
+            self.discovered_hosts = DeviceTable(hosts, DISCOVERY_FIELDS)
+            return self.discovered_hosts
         
         except Exception as e:
             print(f"[!] Error during ARP scan: {e}")
-            return []
+            return DeviceTable(fields=DISCOVERY_FIELDS)
     
     def get_hostname(self, arp_line: str) -> str:
         """Extract hostname from ARP line if available"""
@@ -79,7 +87,7 @@ class HostDiscovery:
     def export_json(self, filename: str = "discovered_hosts.json"):
         """Export discovered hosts to JSON"""
         with open(filename, 'w') as f:
-            json.dump(self.discovered_hosts, f, indent=4)
+            json.dump(self.discovered_hosts.to_dicts(), f, indent=4)
         print(f"[✓] Results exported to: {filename}")
     
     def print_results(self):
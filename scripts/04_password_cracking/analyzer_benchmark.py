@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Password Analyzer Benchmark
+Measures PasswordAnalyzer throughput and checks its output against results
+frozen from the original regex-based implementation (golden output)
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import random
+import string
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from password_analyzer import PasswordAnalyzer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+WORDLIST_DIR = REPO_ROOT / "configs" / "wordlists"
+GOLDEN_FILE = REPO_ROOT / "configs" / "benchmarks" / "analyzer_golden.json"
+GOLDEN_COUNT = 2000
+
+# Fields frozen in the golden file: the classifier's features, then scoring
+FEATURE_FIELDS = ('has_lowercase', 'has_uppercase', 'has_digits', 'has_special',
+                  'has_sequence', 'has_repetition', 'entropy', 'charset_size')
+GOLDEN_FIELDS = FEATURE_FIELDS + ('is_common', 'score', 'strength')
+
+class ReferenceAnalyzer:
+    """The original multi-pass analyzer (four regex searches for the
+    character classes, repeated by get_charset_size, plus separate walks for
+    sequences and repetition), frozen as the golden reference.
+    
+    It is a standalone copy, not a PasswordAnalyzer subclass, so later
+    changes to the analyzer cannot leak into it. Only the digit pattern
+    differs from the original: it matches [0-9], so digits are actually
+    detected.
+    """
+    
+    common_passwords = {
+        'password', '123456', '12345678', 'qwerty', 'abc123',
+        'monkey', 'letmein', 'trustno1', 'dragon', 'baseball',
+        'iloveyou', 'master', 'sunshine', 'ashley', 'bailey',
+        'shadow', 'superman', 'password1', 'password123'
+    }
+    
+    def analyze_password(self, password: str) -> Dict:
+        analysis = {
+            'password': password,
+            'length': len(password),
+            **self.features(password),
+            'is_common': password.lower() in self.common_passwords,
+            'crack_time': None,
+            'strength': None,
+            'score': 0
+        }
+        
+        analysis['score'] = self.calculate_score(analysis)
+        analysis['strength'] = self.determine_strength(analysis['score'])
+        analysis['crack_time'] = self.estimate_crack_time(analysis)
+        
+        return analysis
+    
+    def features(self, password: str) -> Dict:
+        """Character classes, sequence/repetition flags, entropy, charset"""
+        return {
+            'has_lowercase': bool(re.search(r'[a-z]', password)),
+            'has_uppercase': bool(re.search(r'[A-Z]', password)),
+            'has_digits': bool(re.search(r'[0-9]', password)),
+            'has_special': bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password)),
+            'has_sequence': self.has_sequence(password),
+            'has_repetition': self.has_repetition(password),
+            'entropy': self.calculate_entropy(password),
+            'charset_size': self.get_charset_size(password),
+        }
+    
+    def has_sequence(self, password: str) -> bool:
+        sequences = ['abc', '123', 'qwe', 'asd', 'zxc']
+        password_lower = password.lower()
+        
+        for seq in sequences:
+            if seq in password_lower:
+                return True
+        
+        for i in range(len(password) - 2):
+            if password[i:i+3].isdigit():
+                nums = [int(password[i]), int(password[i+1]), int(password[i+2])]
+                if nums[1] - nums[0] == 1 and nums[2] - nums[1] == 1:
+                    return True
+                if nums[0] - nums[1] == 1 and nums[1] - nums[2] == 1:
+                    return True
+        
+        return False
+    
+    def has_repetition(self, password: str) -> bool:
+        for i in range(len(password) - 2):
+            if password[i] == password[i+1] == password[i+2]:
+                return True
+        return False
+    
+    def get_charset_size(self, password: str) -> int:
+        charset = 0
+        
+        if re.search(r'[a-z]', password):
+            charset += 26
+        if re.search(r'[A-Z]', password):
+            charset += 26
+        if re.search(r'[0-9]', password):
+            charset += 10
+        if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+            charset += 32
+        
+        return charset
+    
+    def calculate_entropy(self, password: str) -> float:
+        charset_size = self.get_charset_size(password)
+        if charset_size == 0:
+            return 0
+        
+        return round(len(password) * math.log2(charset_size), 2)
+    
+    def calculate_score(self, analysis: Dict) -> int:
+        score = 0
+        
+        length = analysis['length']
+        if length >= 16:
+            score += 30
+        elif length >= 12:
+            score += 25
+        elif length >= 8:
+            score += 20
+        elif length >= 6:
+            score += 10
+        else:
+            score += 5
+        
+        for flag in ('has_lowercase', 'has_uppercase', 'has_digits', 'has_special'):
+            if analysis[flag]:
+                score += 10
+        
+        entropy = analysis['entropy']
+        if entropy >= 80:
+            score += 20
+        elif entropy >= 60:
+            score += 15
+        elif entropy >= 40:
+            score += 10
+        elif entropy >= 20:
+            score += 5
+        
+        if analysis['is_common']:
+            score -= 40
+        if analysis['has_sequence']:
+            score -= 15
+        if analysis['has_repetition']:
+            score -= 10
+        
+        return max(0, min(100, score))
+    
+    def determine_strength(self, score: int) -> str:
+        if score >= 80:
+            return "VERY STRONG"
+        elif score >= 60:
+            return "STRONG"
+        elif score >= 40:
+            return "MODERATE"
+        elif score >= 20:
+            return "WEAK"
+        else:
+            return "VERY WEAK"
+    
+    def estimate_crack_time(self, analysis: Dict) -> str:
+        charset = analysis['charset_size']
+        if charset == 0:
+            return "Instant"
+        
+        seconds = charset ** analysis['length'] / 1_000_000_000
+        if seconds < 1:
+            return "Instant"
+        elif seconds < 60:
+            return f"{int(seconds)} seconds"
+        elif seconds < 3600:
+            return f"{int(seconds / 60)} minutes"
+        elif seconds < 86400:
+            return f"{int(seconds / 3600)} hours"
+        elif seconds < 31536000:
+            return f"{int(seconds / 86400)} days"
+        elif seconds < 31536000 * 1000:
+            return f"{int(seconds / 31536000)} years"
+        else:
+            return "Centuries"
+
+def build_corpus(count: int, seed: int = 1906) -> List[str]:
+    """Deterministic mix of shipped wordlist entries and random passwords"""
+    rng = random.Random(seed)
+    corpus = []
+    
+    for path in sorted(WORDLIST_DIR.glob("*.txt")):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            corpus.extend(line.rstrip('\n') for line in f if line.strip())
+    
+    alphabet = string.ascii_letters + string.digits + string.punctuation + ' '
+    pieces = ['abc', '123', '987', 'qwe', 'asd', 'zxc', 'aaa', '111', '!!!', 'password', '2024']
+    while len(corpus) < count:
+        length = rng.randint(0, 20)
+        password = ''.join(rng.choice(alphabet) for _ in range(length))
+        if rng.random() < 0.3:
+            cut = rng.randint(0, len(password))
+            password = password[:cut] + rng.choice(pieces) + password[cut:]
+        corpus.append(password)
+    
+    return corpus[:count]
+
+def write_golden(path: Path = GOLDEN_FILE, count: int = GOLDEN_COUNT):
+    """Freeze the reference analyzer's results for the first count passwords"""
+    reference = ReferenceAnalyzer()
+    rows = []
+    for password in build_corpus(count):
+        analysis = reference.analyze_password(password)
+        rows.append([password] + [analysis[field] for field in GOLDEN_FIELDS])
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # One row per line, so the fixture diffs readably if it is ever regenerated
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'{{"fields": {json.dumps(GOLDEN_FIELDS)},\n "rows": [\n')
+        f.write(',\n'.join(json.dumps(row, ensure_ascii=False) for row in rows))
+        f.write('\n]}\n')
+    print(f"[✓] Wrote {len(rows):,} golden results to {path}")
+
+def check_golden(path: Path = GOLDEN_FILE) -> int:
+    """Compare PasswordAnalyzer against the frozen results; returns mismatch count
+    
+    The features and the score must match exactly. is_common is the one
+    input allowed to differ, since the breached-password blocklist and the
+    dictionary now flag far more passwords than the original built-in set.
+    The score is therefore recomputed with the reference's is_common, which
+    still catches any drift in the classifier or in the scoring rules.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    fields = golden["fields"]
+    current = PasswordAnalyzer()
+    mismatches = widened = 0
+    
+    for row in golden["rows"]:
+        password, expected = row[0], dict(zip(fields, row[1:]))
+        analysis = current.analyze_password(password)
+        widened += analysis['is_common'] != expected['is_common']
+        
+        score = current.calculate_score({**analysis, 'is_common': expected['is_common']})
+        actual = {field: analysis[field] for field in FEATURE_FIELDS}
+        actual.update(is_common=expected['is_common'], score=score, strength=current.determine_strength(score))
+        if actual != expected:
+            mismatches += 1
+            if mismatches <= 10:
+                diff = {k: (expected[k], actual[k]) for k in expected if expected[k] != actual[k]}
+                print(f"[!] Mismatch for {password!r}: {diff}")
+    
+    print(f"[*] Golden set: {len(golden['rows']):,} passwords "
+          f"({widened:,} now also flagged common by the blocklist/dictionary)")
+    return mismatches
+
+def measure(analyze: Callable[[str], Dict], corpus: List[str], repeat: int) -> float:
+    """Best-of-N analyses per second"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for password in corpus:
+            analyze(password)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║       PASSWORD ANALYZER BENCHMARK - Competition Tool      ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    parser = argparse.ArgumentParser(description="PasswordAnalyzer micro-benchmark")
+    parser.add_argument("--count", type=int, default=100000, help="passwords in the corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs (best is kept)")
+    parser.add_argument("--check-only", action="store_true", help="only run the golden-output check")
+    parser.add_argument("--write-golden", action="store_true",
+                        help=f"regenerate {GOLDEN_FILE.name} from the frozen reference analyzer")
+    args = parser.parse_args()
+    
+    if args.write_golden:
+        write_golden()
+        return
+    
+    mismatches = check_golden()
+    if mismatches:
+        print(f"[!] Golden-output check FAILED: {mismatches:,} mismatch(es)")
+        sys.exit(1)
+    print("[✓] Golden-output check passed: features and scores match the reference analyzer")
+    
+    if args.check_only:
+        return
+    
+    corpus = build_corpus(args.count)
+    print(f"[*] Corpus: {len(corpus):,} passwords")
+    
+    reference = ReferenceAnalyzer()
+    current = PasswordAnalyzer()
+    before = measure(reference.features, corpus, args.repeat)
+    after = measure(current.features, corpus, args.repeat)
+    original = measure(reference.analyze_password, corpus, args.repeat)
+    full = measure(current.analyze_password, corpus, args.repeat)
+    
+    print("\n" + "="*60)
+    print("  THROUGHPUT (analyses/second)")
+    print("="*60)
+    print("Character features:")
+    print(f"  Reference (multi-pass):  {before:>14,.0f}")
+    print(f"  Current (single-pass):   {after:>14,.0f}")
+    print(f"  Speedup:                 {after / before:>14.2f}x")
+    print("Full analysis:")
+    print(f"  Original analyzer:       {original:>14,.0f}")
+    print(f"  Current analyzer:        {full:>14,.0f}   (adds pattern, blocklist and crack-time estimates)")
+    print("="*60 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Archive Hash Extractor
+Streams ZIP and 7z headers into John the Ripper / Hashcat hash lines
+without extracting or reading whole archives
+"""
+
+import os
+import sys
+import lzma
+import zlib
+import struct
+import zipfile
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from zip_cracker import (AES_AUTH_LENGTH, AES_METHOD, AES_SALT_LENGTH, FLAG_ENCRYPTED,
+                         LOCAL_HEADER, LOCAL_HEADER_SIGNATURE, _aes_extra)
+
+ARCHIVE_SUFFIXES = ('.zip', '.7z')
+DEFAULT_MAX_DATA = 8 << 20   # encrypted bytes inlined into one hash line
+
+ZIP_SIGNATURES = (b'PK\x03\x04', b'PK\x05\x06')
+MAX_PKZIP_ENTRIES = 3        # $pkzip2$ lines carry up to 3 entries
+
+SEVENZIP_SIGNATURE = b"7z\xbc\xaf\x27\x1c"
+SEVENZIP_HEADER_SIZE = 32
+SEVENZIP_START_HEADER = struct.Struct('<QQI')   # next header offset, size, CRC
+SEVENZIP_AES = b'\x06\xf1\x07\x01'
+SEVENZIP_LZMA = b'\x03\x01\x01'
+SEVENZIP_LZMA2 = b'\x21'
+
+# 7z property IDs (7zFormat.txt)
+K_END = 0x00
+K_HEADER = 0x01
+K_ARCHIVE_PROPERTIES = 0x02
+K_ADDITIONAL_STREAMS_INFO = 0x03
+K_MAIN_STREAMS_INFO = 0x04
+K_FILES_INFO = 0x05
+K_PACK_INFO = 0x06
+K_UNPACK_INFO = 0x07
+K_SUBSTREAMS_INFO = 0x08
+K_SIZE = 0x09
+K_CRC = 0x0A
+K_FOLDER = 0x0B
+K_CODERS_UNPACK_SIZE = 0x0C
+K_NUM_UNPACK_STREAM = 0x0D
+K_ENCODED_HEADER = 0x17
+
+# Coder after AES -> data type in John's $7z$ format
+SEVENZIP_COMPRESSION = {
+    SEVENZIP_LZMA: 1,
+    SEVENZIP_LZMA2: 2,
+    b'\x03\x04\x01': 3,   # PPMd
+    b'\x04\x02\x02': 6,   # BZip2
+    b'\x04\x01\x08': 7,   # Deflate
+}
+
+class ArchiveHashError(ValueError):
+    """Raised for unreadable or unsupported archives"""
+
+# ---------------------------------------------------------------------------
+# ZIP
+# ---------------------------------------------------------------------------
+
+def zip_hashes(path, max_data: int = DEFAULT_MAX_DATA) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """($pkzip2$/$zip2$ hashes, skipped-entry notes) for a ZIP archive
+    
+    The central directory gives each entry's sizes and CRC; for the
+    encrypted entries one seek to the local header and one read of the
+    encrypted data follow. ZipCrypto entries share one $pkzip2$ hash
+    (smallest entries first, as zip2john does); each WinZip AES entry gets
+    its own $zip2$ hash.
+    """
+    name = Path(path).name
+    hashes = []
+    skipped = []
+    zipcrypto = []
+    
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        encrypted = sorted((info for info in archive.infolist() if info.flag_bits & FLAG_ENCRYPTED),
+                           key=lambda info: info.compress_size)
+        for info in encrypted:
+            if info.compress_size > max_data:
+                skipped.append(f"{info.filename}: {info.compress_size:,} bytes exceeds --max-data")
+                continue
+            
+            f.seek(info.header_offset)
+            fields = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+            if fields[0] != LOCAL_HEADER_SIGNATURE:
+                raise ArchiveHashError(f"Bad local header for {info.filename}")
+            mod_time, name_length, extra_length = fields[4], fields[9], fields[10]
+            f.seek(name_length, os.SEEK_CUR)
+            local_extra = f.read(extra_length)
+            data = f.read(info.compress_size)
+            
+            if info.compress_type == AES_METHOD:
+                strength = _aes_extra(local_extra) or _aes_extra(info.extra)
+                if strength not in AES_SALT_LENGTH:
+                    skipped.append(f"{info.filename}: unsupported AES strength")
+                    continue
+                salt_length = AES_SALT_LENGTH[strength]
+                salt = data[:salt_length]
+                verifier = data[salt_length:salt_length + 2]
+                payload = data[salt_length + 2:-AES_AUTH_LENGTH]
+                auth = data[-AES_AUTH_LENGTH:]
+                hashes.append((f"{name}/{info.filename}",
+                               f"$zip2$*0*{strength}*0*{salt.hex()}*{verifier.hex()}*"
+                               f"{len(payload):x}*{payload.hex()}*{auth.hex()}*$/zip2$"))
+            elif len(zipcrypto) < MAX_PKZIP_ENTRIES:
+                zipcrypto.append(
+                    f"2*0*{info.compress_size:x}*{info.file_size:x}*{info.CRC:x}*0*"
+                    f"{LOCAL_HEADER.size + name_length + extra_length:x}*{info.compress_type:x}*"
+                    f"{len(data):x}*{info.CRC >> 16:04x}*{mod_time:04x}*{data.hex()}")
+    
+    if zipcrypto:
+        hashes.insert(0, (name, f"$pkzip2${len(zipcrypto)}*1*{'*'.join(zipcrypto)}*$/pkzip2$"))
+    return hashes, skipped
+
+# ---------------------------------------------------------------------------
+# 7z
+# ---------------------------------------------------------------------------
+
+class _HeaderReader:
+    """Cursor over a 7z header buffer"""
+    
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+    
+    def byte(self) -> int:
+        if self.pos >= len(self.data):
+            raise ArchiveHashError("Truncated 7z header")
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+    
+    def read(self, size: int) -> bytes:
+        if self.pos + size > len(self.data):
+            raise ArchiveHashError("Truncated 7z header")
+        value = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return value
+    
+    def number(self) -> int:
+        """7z variable-length number: leading 1 bits of the first byte
+        count the extra little-endian bytes"""
+        first = self.byte()
+        mask = 0x80
+        value = 0
+        for i in range(8):
+            if not first & mask:
+                return value | ((first & (mask - 1)) << (8 * i))
+            value |= self.byte() << (8 * i)
+            mask >>= 1
+        return value
+    
+    def bits(self, count: int) -> List[bool]:
+        if self.byte():   # all defined
+            return [True] * count
+        packed = self.read((count + 7) // 8)
+        return [bool(packed[i // 8] & (0x80 >> (i % 8))) for i in range(count)]
+    
+    def digests(self, count: int) -> List[Optional[int]]:
+        return [struct.unpack('<I', self.read(4))[0] if defined else None
+                for defined in self.bits(count)]
+    
+    def skip_property(self):
+        self.read(self.number())
+
+def _read_folder(r: _HeaderReader) -> Dict:
+    coders = []
+    for _ in range(r.number()):
+        flags = r.byte()
+        if flags & 0x80:
+            raise ArchiveHashError("Alternative coder methods are not supported")
+        method = r.read(flags & 0x0F)
+        inputs, outputs = (r.number(), r.number()) if flags & 0x10 else (1, 1)
+        props = r.read(r.number()) if flags & 0x20 else b''
+        coders.append({'method': method, 'inputs': inputs, 'outputs': outputs, 'props': props})
+    
+    total_inputs = sum(c['inputs'] for c in coders)
+    total_outputs = sum(c['outputs'] for c in coders)
+    bind_pairs = [(r.number(), r.number()) for _ in range(total_outputs - 1)]
+    packed_count = total_inputs - len(bind_pairs)
+    if packed_count == 1:
+        bound = {i for i, _ in bind_pairs}
+        packed = [i for i in range(total_inputs) if i not in bound]
+    else:
+        packed = [r.number() for _ in range(packed_count)]
+    return {'coders': coders, 'bind_pairs': bind_pairs, 'packed': packed,
+            'unpack_sizes': [], 'crc': None, 'substreams': []}
+
+def _read_streams_info(r: _HeaderReader) -> Dict:
+    """PackInfo, UnpackInfo (folders) and SubStreamsInfo of a StreamsInfo block"""
+    info = {'pack_pos': 0, 'pack_sizes': [], 'folders': []}
+    while True:
+        prop = r.byte()
+        if prop == K_END:
+            return info
+        
+        if prop == K_PACK_INFO:
+            info['pack_pos'] = r.number()
+            count = r.number()
+            while True:
+                prop = r.byte()
+                if prop == K_END:
+                    break
+                if prop == K_SIZE:
+                    info['pack_sizes'] = [r.number() for _ in range(count)]
+                elif prop == K_CRC:
+                    r.digests(count)
+                else:
+                    r.skip_property()
+        
+        elif prop == K_UNPACK_INFO:
+            if r.byte() != K_FOLDER:
+                raise ArchiveHashError("Malformed 7z folder list")
+            count = r.number()
+            if r.byte():
+                raise ArchiveHashError("External 7z folder lists are not supported")
+            folders = info['folders'] = [_read_folder(r) for _ in range(count)]
+            if r.byte() != K_CODERS_UNPACK_SIZE:
+                raise ArchiveHashError("Malformed 7z unpack sizes")
+            for folder in folders:
+                folder['unpack_sizes'] = [r.number() for c in folder['coders'] for _ in range(c['outputs'])]
+            while True:
+                prop = r.byte()
+                if prop == K_END:
+                    break
+                if prop == K_CRC:
+                    for folder, crc in zip(folders, r.digests(count)):
+                        folder['crc'] = crc
+                else:
+                    r.skip_property()
+        
+        elif prop == K_SUBSTREAMS_INFO:
+            folders = info['folders']
+            streams = [1] * len(folders)
+            prop = r.byte()
+            if prop == K_NUM_UNPACK_STREAM:
+                streams = [r.number() for _ in folders]
+                prop = r.byte()
+            
+            sizes = []
+            for folder, count in zip(folders, streams):
+                if not count:
+                    sizes.append([])
+                    continue
+                total = _folder_unpack_size(folder)
+                known = [r.number() for _ in range(count - 1)] if prop == K_SIZE else []
+                sizes.append(known + [total - sum(known)])
+            if prop == K_SIZE:
+                prop = r.byte()
+            
+            # CRCs are listed only for streams whose CRC the folder does not give
+            missing = sum(count for folder, count in zip(folders, streams)
+                          if not (count == 1 and folder['crc'] is not None))
+            crcs = []
+            while prop != K_END:
+                if prop == K_CRC:
+                    crcs = r.digests(missing)
+                else:
+                    r.skip_property()
+                prop = r.byte()
+            
+            crcs = iter(crcs)
+            for folder, count, folder_sizes in zip(folders, streams, sizes):
+                if count == 1 and folder['crc'] is not None:
+                    folder['substreams'] = [(folder_sizes[0], folder['crc'])]
+                else:
+                    folder['substreams'] = [(size, next(crcs, None)) for size in folder_sizes]
+        
+        else:
+            raise ArchiveHashError(f"Unexpected 7z property 0x{prop:02x}")
+
+def _output_index(folder: Dict, coder_index: int) -> int:
+    return sum(c['outputs'] for c in folder['coders'][:coder_index])
+
+def _input_index(folder: Dict, coder_index: int) -> int:
+    return sum(c['inputs'] for c in folder['coders'][:coder_index])
+
+def _folder_unpack_size(folder: Dict) -> int:
+    """Size of the folder's final output (the one stream no coder consumes)"""
+    bound = {out for _, out in folder['bind_pairs']}
+    for index, size in enumerate(folder['unpack_sizes']):
+        if index not in bound:
+            return size
+    return 0
+
+def _pack_stream(info: Dict, folder_index: int, position: int) -> Tuple[int, int]:
+    """(offset from the end of the signature header, size) of a packed stream"""
+    index = sum(len(f['packed']) for f in info['folders'][:folder_index]) + position
+    sizes = info['pack_sizes']
+    if index >= len(sizes):
+        raise ArchiveHashError("7z pack stream out of range")
+    return info['pack_pos'] + sum(sizes[:index]), sizes[index]
+
+def _aes_coder(folder: Dict) -> Optional[int]:
+    for index, coder in enumerate(folder['coders']):
+        if coder['method'] == SEVENZIP_AES:
+            return index
+    return None
+
+def _aes_properties(props: bytes) -> Tuple[int, bytes, bytes]:
+    """(cycles power, salt, IV) from the 7zAES coder properties"""
+    if not props:
+        raise ArchiveHashError("Missing 7zAES properties")
+    first = props[0]
+    cycles = first & 0x3F
+    if not first & 0xC0:
+        return cycles, b'', b''
+    second = props[1]
+    salt_size = ((first >> 7) & 1) + (second >> 4)
+    iv_size = ((first >> 6) & 1) + (second & 0x0F)
+    salt = props[2:2 + salt_size]
+    iv = props[2 + salt_size:2 + salt_size + iv_size]
+    return cycles, salt, iv
+
+def _folder_hash(f, info: Dict, folder_index: int, max_data: int) -> str:
+    """John/Hashcat $7z$ hash of an encrypted folder"""
+    folder = info['folders'][folder_index]
+    coders = folder['coders']
+    aes = _aes_coder(folder)
+    aes_input = _input_index(folder, aes)
+    aes_output = _output_index(folder, aes)
+    if coders[aes]['inputs'] != 1 or aes_input not in folder['packed']:
+        raise ArchiveHashError("AES is not applied to a packed stream")
+    offset, pack_size = _pack_stream(info, folder_index, folder['packed'].index(aes_input))
+    if pack_size > max_data:
+        raise ArchiveHashError(f"{pack_size:,} encrypted bytes exceeds --max-data")
+    
+    cycles, salt, iv = _aes_properties(coders[aes]['props'])
+    unpack_size = folder['unpack_sizes'][aes_output]
+    crc = folder['crc']
+    crc_length = None
+    
+    if len(coders) == 1:
+        data_type = 0
+        if crc is None and len(folder['substreams']) == 1:
+            crc = folder['substreams'][0][1]
+    elif len(coders) == 2:
+        other = coders[1 - aes]
+        data_type = SEVENZIP_COMPRESSION.get(other['method'])
+        if data_type is None or other['inputs'] != 1 or other['outputs'] != 1:
+            raise ArchiveHashError(f"Unsupported 7z coder {other['method'].hex()} after AES")
+        if crc is not None:
+            crc_length = _folder_unpack_size(folder)
+        elif folder['substreams'] and folder['substreams'][0][1] is not None:
+            # Solid folder: check the first file, which decompresses first
+            crc_length, crc = folder['substreams'][0]
+    else:
+        raise ArchiveHashError("Unsupported 7z coder chain (filters with AES)")
+    if crc is None:
+        raise ArchiveHashError("No CRC to verify the encrypted 7z data")
+    
+    f.seek(SEVENZIP_HEADER_SIZE + offset)
+    data = f.read(pack_size)
+    if len(data) != pack_size:
+        raise ArchiveHashError("Truncated 7z archive")
+    
+    padded_iv = iv.ljust(16, b'\0')
+    line = (f"$7z${data_type}${cycles}${len(salt)}${salt.hex()}${len(iv)}${padded_iv.hex()}"
+            f"${crc}${pack_size}${unpack_size}${data.hex()}")
+    if data_type:
+        line += f"${crc_length}${coders[1 - aes]['props'].hex()}"
+    return line
+
+def _decode_header(f, info: Dict) -> bytes:
+    """Unpack an LZMA/LZMA2-compressed (not encrypted) 7z header"""
+    folder = info['folders'][0]
+    if len(folder['coders']) != 1:
+        raise ArchiveHashError("Unsupported 7z header coder chain")
+    coder = folder['coders'][0]
+    props = coder['props']
+    if coder['method'] == SEVENZIP_LZMA:
+        value = props[0]
+        filters = [{'id': lzma.FILTER_LZMA1, 'lc': value % 9, 'lp': (value // 9) % 5,
+                    'pb': value // 45, 'dict_size': struct.unpack('<I', props[1:5])[0]}]
+    elif coder['method'] == SEVENZIP_LZMA2:
+        value = props[0]
+        dict_size = 0xFFFFFFFF if value == 40 else (2 | (value & 1)) << (value // 2 + 11)
+        filters = [{'id': lzma.FILTER_LZMA2, 'dict_size': dict_size}]
+    else:
+        raise ArchiveHashError(f"Unsupported 7z header coder {coder['method'].hex()}")
+    
+    offset, size = _pack_stream(info, 0, 0)
+    f.seek(SEVENZIP_HEADER_SIZE + offset)
+    decoder = lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=filters)
+    return decoder.decompress(f.read(size), max_length=folder['unpack_sizes'][0])
+
+def sevenzip_hashes(path, max_data: int = DEFAULT_MAX_DATA) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """($7z$ hashes, skipped notes) for a 7z archive
+    
+    Reads the 32-byte signature header and the header at its end (plus the
+    packed header when it is compressed). With header encryption (-mhe) the
+    encrypted header itself is the hash; otherwise the smallest encrypted
+    folder is. Only that folder's packed bytes are read.
+    """
+    name = Path(path).name
+    with open(path, 'rb') as f:
+        start = f.read(SEVENZIP_HEADER_SIZE)
+        if len(start) < SEVENZIP_HEADER_SIZE or not start.startswith(SEVENZIP_SIGNATURE):
+            raise ArchiveHashError("Not a 7z archive")
+        next_offset, next_size, next_crc = SEVENZIP_START_HEADER.unpack_from(start, 12)
+        if not next_size:
+            return [], []
+        f.seek(SEVENZIP_HEADER_SIZE + next_offset)
+        header = f.read(next_size)
+        if len(header) != next_size or zlib.crc32(header) != next_crc:
+            raise ArchiveHashError("7z header is truncated or corrupt")
+        
+        r = _HeaderReader(header)
+        prop = r.byte()
+        while prop == K_ENCODED_HEADER:
+            info = _read_streams_info(r)
+            if not info['folders']:
+                raise ArchiveHashError("Empty 7z encoded header")
+            if _aes_coder(info['folders'][0]) is not None:
+                return [(name, _folder_hash(f, info, 0, max_data))], []
+            r = _HeaderReader(_decode_header(f, info))
+            prop = r.byte()
+        if prop != K_HEADER:
+            raise ArchiveHashError(f"Unexpected 7z header type 0x{prop:02x}")
+        
+        info = None
+        prop = r.byte()
+        while prop not in (K_END, K_FILES_INFO):
+            if prop == K_ARCHIVE_PROPERTIES:
+                while r.byte() != K_END:
+                    r.skip_property()
+            elif prop == K_ADDITIONAL_STREAMS_INFO:
+                _read_streams_info(r)
+            elif prop == K_MAIN_STREAMS_INFO:
+                info = _read_streams_info(r)
+            else:
+                raise ArchiveHashError(f"Unexpected 7z property 0x{prop:02x}")
+            prop = r.byte()
+        
+        encrypted = [i for i, folder in enumerate(info['folders'] if info else [])
+                     if _aes_coder(folder) is not None]
+        skipped = []
+        for index in sorted(encrypted, key=lambda i: sum(info['folders'][i]['unpack_sizes'])):
+            try:
+                return [(name, _folder_hash(f, info, index, max_data))], skipped
+            except ArchiveHashError as e:
+                skipped.append(f"folder {index}: {e}")
+        return [], skipped
+
+# ---------------------------------------------------------------------------
+# Batch extraction
+# ---------------------------------------------------------------------------
+
+def extract_archive(path: str, max_data: int = DEFAULT_MAX_DATA) -> Dict:
+    """Hashes of one archive; errors are reported in the result, not raised"""
+    result = {'path': str(path), 'hashes': [], 'skipped': [], 'error': None}
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(6)
+        if magic == SEVENZIP_SIGNATURE:
+            result['hashes'], result['skipped'] = sevenzip_hashes(path, max_data)
+        elif magic[:4] in ZIP_SIGNATURES:
+            result['hashes'], result['skipped'] = zip_hashes(path, max_data)
+        else:
+            raise ArchiveHashError("Not a ZIP or 7z archive")
+    except (ArchiveHashError, zipfile.BadZipFile, lzma.LZMAError, OSError) as e:
+        result['error'] = str(e)
+    return result
+
+def iter_archives(paths: Iterable[str]) -> Iterator[str]:
+    """Files named on the command line, plus .zip/.7z files under directories"""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    if file_name.lower().endswith(ARCHIVE_SUFFIXES):
+                        yield os.path.join(root, file_name)
+        else:
+            yield path
+
+def extract_all(paths: Iterable[str], workers: int = 0,
+                max_data: int = DEFAULT_MAX_DATA) -> Iterator[Dict]:
+    """extract_archive over many archives on a process pool, in input order
+    
+    Each archive costs a few small reads, so a bounded queue of in-flight
+    archives per worker keeps the disk busy without queueing a whole
+    directory tree at once.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for path in paths:
+            yield extract_archive(path, max_data)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append(pool.submit(extract_archive, path, max_data))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract John/Hashcat hashes from encrypted ZIP and 7z archives")
+    parser.add_argument("paths", nargs="+", help="archives, or directories to search for .zip/.7z files")
+    parser.add_argument("-o", "--output", default="-", help="hash file to write (default: stdout)")
+    parser.add_argument("--format", choices=("john", "hashcat"), default="john",
+                        help="john prefixes each hash with the archive name; hashcat writes bare hashes")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: all cores)")
+    parser.add_argument("--max-data", type=int, default=DEFAULT_MAX_DATA, metavar="BYTES",
+                        help="largest encrypted entry to inline into a hash (default: 8 MiB)")
+    args = parser.parse_args()
+    
+    # Progress goes to stderr when the hashes go to stdout
+    console = sys.stderr if args.output == '-' else sys.stdout
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    
+    archives = hashes = failures = 0
+    try:
+        for result in extract_all(iter_archives(args.paths), args.workers, args.max_data):
+            archives += 1
+            if result['error']:
+                failures += 1
+                print(f"[!] {result['path']}: {result['error']}", file=console)
+                continue
+            for note in result['skipped']:
+                print(f"[!] {result['path']}: skipped {note}", file=console)
+            if not result['hashes'] and not result['skipped']:
+                print(f"[*] {result['path']}: not encrypted", file=console)
+            for label, line in result['hashes']:
+                out.write(f"{label}:{line}\n" if args.format == "john" else f"{line}\n")
+                hashes += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    print(f"[✓] {hashes} hash(es) from {archives} archive(s)"
+          + (f", {failures} failed" if failures else ""), file=console)
+    if args.output != '-':
+        print(f"[✓] Saved to: {args.output}", file=console)
+    sys.exit(1 if failures and not hashes else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Breached Password Blocklist
+Compiles large password lists into an on-disk Bloom filter plus a sorted
+index of SHA-1 prefixes, and checks passwords against it via mmap
+"""
+
+import os
+import sys
+import math
+import mmap
+import heapq
+import struct
+import hashlib
+import argparse
+import tempfile
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from wordlist_io import iter_words
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_SOURCES = sorted((REPO_ROOT / "configs" / "wordlists").glob("*.txt"))
+DEFAULT_BLOCKLIST = REPO_ROOT / "configs" / "blocklist" / "breached"
+
+BLOOM_MAGIC = b'CTFBLOOM'
+BLOOM_HEADER = struct.Struct('>8sQQQ')   # magic, bits, hash count, entries
+RECORD_SIZE = 8                          # bytes of SHA-1 kept per entry
+RUN_SIZE = 4_000_000                     # prefixes sorted in memory per run
+
+def password_prefix(password: str) -> bytes:
+    """First RECORD_SIZE bytes of SHA-1 of the normalized password"""
+    return hashlib.sha1(password.lower().encode('utf-8', 'replace')).digest()[:RECORD_SIZE]
+
+def bloom_parameters(entries: int, fp_rate: float):
+    """Optimal (bits, hash count) for the given entry count and error rate"""
+    entries = max(entries, 1)
+    bits = math.ceil(-entries * math.log(fp_rate) / (math.log(2) ** 2))
+    bits = max(64, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / entries * math.log(2)))
+    return bits, hashes
+
+class _Records:
+    """Sequence view over the fixed-width records of the index (for bisect)"""
+    
+    def __init__(self, buf):
+        self.buf = buf
+        self.count = len(buf) // RECORD_SIZE
+    
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, i):
+        start = i * RECORD_SIZE
+        return self.buf[start:start + RECORD_SIZE]
+
+class Blocklist:
+    """Read-only blocklist backed by <path>.bloom and <path>.idx
+    
+    Lookups hash the password once. The Bloom filter rejects almost every
+    non-member after a few bit probes; only Bloom hits are confirmed by a
+    binary search of the sorted prefix index. Both files are memory-mapped,
+    so nothing is loaded up front and worker processes share the pages.
+    """
+    
+    def __init__(self, path=DEFAULT_BLOCKLIST):
+        self.path = Path(path)
+        
+        with open(self.path.with_suffix('.bloom'), 'rb') as f:
+            self._bloom = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.bits, self.hashes, self.entries = BLOOM_HEADER.unpack_from(self._bloom)
+        if magic != BLOOM_MAGIC:
+            raise ValueError(f"Not a blocklist Bloom filter: {self.path.with_suffix('.bloom')}")
+        
+        with open(self.path.with_suffix('.idx'), 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._index = b''
+        self._records = _Records(self._index)
+    
+    @classmethod
+    def open_default(cls) -> Optional['Blocklist']:
+        """Open the default artifact if it has been built, else None"""
+        if DEFAULT_BLOCKLIST.with_suffix('.bloom').exists():
+            return cls(DEFAULT_BLOCKLIST)
+        return None
+    
+    def might_contain(self, prefix: bytes) -> bool:
+        """Bloom filter test (no false negatives)"""
+        value = int.from_bytes(prefix, 'big')
+        h1 = value >> 32
+        h2 = (value & 0xFFFFFFFF) | 1
+        bits = self.bits
+        bloom = self._bloom
+        offset = BLOOM_HEADER.size
+        
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % bits
+            if not bloom[offset + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+    
+    def contains_prefix(self, prefix: bytes) -> bool:
+        """Exact check against the sorted index"""
+        i = bisect_left(self._records, prefix)
+        return i < len(self._records) and self._records[i] == prefix
+    
+    def __contains__(self, password: str) -> bool:
+        prefix = password_prefix(password)
+        return self.might_contain(prefix) and self.contains_prefix(prefix)
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def close(self):
+        self._bloom.close()
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+
+def _write_run(prefixes: List[int], tmpdir: str) -> str:
+    """Sort one in-memory run and spill it as big-endian 64-bit records"""
+    run = array('Q', sorted(prefixes))
+    if sys.byteorder == 'little':
+        run.byteswap()
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmpdir)
+    with os.fdopen(fd, 'wb') as f:
+        run.tofile(f)
+    return path
+
+def _read_run(path: str) -> Iterator[bytes]:
+    with open(path, 'rb', buffering=1 << 20) as f:
+        while True:
+            block = f.read(RECORD_SIZE * 65536)
+            if not block:
+                return
+            for i in range(0, len(block), RECORD_SIZE):
+                yield block[i:i + RECORD_SIZE]
+
+def build_blocklist(sources: Iterable[str],
+                    output=DEFAULT_BLOCKLIST,
+                    fp_rate: float = 0.001) -> int:
+    """Compile password lists into <output>.idx and <output>.bloom
+    
+    Prefixes are sorted in fixed-size runs spilled to temporary files and
+    then k-way merged with duplicates dropped, so memory use is bounded
+    by RUN_SIZE regardless of input size. Returns the number of entries.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    idx_path = output.with_suffix('.idx')
+    bloom_path = output.with_suffix('.bloom')
+    
+    with tempfile.TemporaryDirectory(dir=output.parent) as tmpdir:
+        runs = []
+        pending = []
+        for source in sources:
+            print(f"[*] Reading: {source}")
+            for password in iter_words(source):
+                pending.append(int.from_bytes(password_prefix(password), 'big'))
+                if len(pending) >= RUN_SIZE:
+                    runs.append(_write_run(pending, tmpdir))
+                    pending = []
+        if pending or not runs:
+            runs.append(_write_run(pending, tmpdir))
+        
+        print(f"[*] Merging {len(runs)} sorted run(s)...")
+        entries = 0
+        last = None
+        with open(idx_path, 'wb', buffering=1 << 20) as out:
+            for prefix in heapq.merge(*(_read_run(run) for run in runs)):
+                if prefix != last:
+                    out.write(prefix)
+                    last = prefix
+                    entries += 1
+    
+    bits, hashes = bloom_parameters(entries, fp_rate)
+    print(f"[*] Building Bloom filter: {bits:,} bits, {hashes} hash(es)")
+    bloom = bytearray(bits // 8)
+    for prefix in _read_run(str(idx_path)):
+        value = int.from_bytes(prefix, 'big')
+        h1 = value >> 32
+        h2 = (value & 0xFFFFFFFF) | 1
+        for i in range(hashes):
+            bit = (h1 + i * h2) % bits
+            bloom[bit >> 3] |= 1 << (bit & 7)
+    
+    with open(bloom_path, 'wb') as f:
+        f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, bits, hashes, entries))
+        f.write(bloom)
+    
+    print(f"[✓] Blocklist built: {entries:,} unique password(s)")
+    print(f"[✓] Index:        {idx_path} ({idx_path.stat().st_size:,} bytes)")
+    print(f"[✓] Bloom filter: {bloom_path} ({bloom_path.stat().st_size:,} bytes)")
+    return entries
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║       BREACHED PASSWORD BLOCKLIST - Competition Tool      ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    parser = argparse.ArgumentParser(description="Build or query the breached-password blocklist")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    build = sub.add_parser("build", help="compile password lists into a blocklist")
+    build.add_argument("sources", nargs="*", help="password lists (.gz/.xz/.bz2 or '-' for stdin; "
+                       "default: configs/wordlists/*.txt)")
+    build.add_argument("--output", default=str(DEFAULT_BLOCKLIST), help="artifact path prefix")
+    build.add_argument("--fp-rate", type=float, default=0.001, help="Bloom false-positive rate")
+    
+    check = sub.add_parser("check", help="check passwords against a blocklist")
+    check.add_argument("passwords", nargs="+")
+    check.add_argument("--blocklist", default=str(DEFAULT_BLOCKLIST), help="artifact path prefix")
+    
+    args = parser.parse_args()
+    
+    if args.command == "build":
+        sources = args.sources or [str(path) for path in DEFAULT_SOURCES]
+        build_blocklist(sources, args.output, args.fp_rate)
+    else:
+        blocklist = Blocklist(args.blocklist)
+        for password in args.passwords:
+            status = "BREACHED ⚠" if password in blocklist else "not found ✓"
+            print(f"  {'*' * len(password):<20} {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Crack Sessions
+Checkpoint and restore for long-running generation and cracking jobs
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from wordlist_io import is_compressed, open_wordlist
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SESSION_DIR = REPO_ROOT / "configs" / "cache" / "sessions"
+
+DEFAULT_INTERVAL = 60.0   # seconds between checkpoints
+
+class SessionError(ValueError):
+    """Raised for missing or unreadable session files"""
+
+class Session:
+    """A job's restorable state in a small JSON file
+    
+    The state holds the command line that started the job plus its
+    position: 'position' (wordlist byte offset, or line count for
+    compressed input and stdin), 'mask_index', 'output_offset' and the
+    'cracked' targets. Jobs call update() once per batch; it only writes
+    when the checkpoint interval has passed, so the hot loop pays one
+    clock read per batch. Writes go to a temporary file that replaces the
+    session atomically, so an interrupted write never loses the previous
+    checkpoint.
+    """
+    
+    def __init__(self, name: str, argv: List[str], interval: float = DEFAULT_INTERVAL,
+                 directory=SESSION_DIR):
+        self.name = name
+        self.path = Path(directory) / f"{name}.session"
+        self.interval = interval
+        self.state = {
+            'argv': list(argv),
+            'created': datetime.now().isoformat(),
+            'position': 0,
+            'mask_index': 0,
+            'output_offset': None,
+            'tried': 0,
+            'cracked': {},
+        }
+        self._last_save = time.monotonic()
+    
+    @classmethod
+    def load(cls, name: str, interval: float = DEFAULT_INTERVAL, directory=SESSION_DIR) -> 'Session':
+        session = cls(name, [], interval, directory)
+        try:
+            with open(session.path, 'r') as f:
+                session.state.update(json.load(f))
+        except FileNotFoundError:
+            raise SessionError(f"No session to restore: {session.path}") from None
+        except ValueError as e:
+            raise SessionError(f"Corrupt session file {session.path}: {e}") from None
+        return session
+    
+    @property
+    def argv(self) -> List[str]:
+        return self.state['argv']
+    
+    def update(self, **fields):
+        """Record progress; checkpoint if the interval has passed"""
+        self.state.update(fields)
+        if time.monotonic() - self._last_save >= self.interval:
+            self.save()
+    
+    def add_cracked(self, target: str, password: str):
+        """Finds are rare and valuable, so they are saved immediately"""
+        self.state['cracked'][target] = password
+        self.save()
+    
+    def save(self):
+        self.state['updated'] = datetime.now().isoformat()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._last_save = time.monotonic()
+    
+    def finish(self):
+        """The job ran to completion; nothing is left to restore"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+class WordlistCursor:
+    """Iterates a wordlist from a saved position, tracking the position
+    
+    After each word is yielded, .position is where the next word starts:
+    a byte offset for plain files (resumed with a seek) or a line count for
+    compressed files and stdin (resumed by skipping lines, which also works
+    for a deterministic generator piped in again).
+    """
+    
+    def __init__(self, path: str, position: int = 0):
+        self.path = str(path)
+        self.position = position
+        self.seekable = self.path != '-' and not is_compressed(self.path)
+    
+    def __iter__(self) -> Iterator[str]:
+        if self.seekable:
+            with open(self.path, 'rb', buffering=1 << 20) as f:
+                f.seek(self.position)
+                for line in f:
+                    self.position += len(line)
+                    yield line.decode('utf-8', 'replace').rstrip('\r\n')
+            return
+        
+        with open_wordlist(self.path) as f:
+            skipped = 0
+            for line in f:
+                if skipped < self.position:
+                    skipped += 1
+                    continue
+                self.position += 1
+                yield line.rstrip('\r\n')
+
+def add_session_arguments(parser):
+    """--session/--restore/--checkpoint-interval for a job's argument parser"""
+    parser.add_argument("--session", metavar="NAME",
+                        help="checkpoint progress under this name (configs/cache/sessions/)")
+    parser.add_argument("--restore", metavar="NAME",
+                        help="continue an interrupted session with its original arguments")
+    parser.add_argument("--checkpoint-interval", type=float, default=DEFAULT_INTERVAL,
+                        metavar="SECONDS", help="seconds between checkpoints (default: 60)")
+
+def open_session(parser, argv: Optional[List[str]] = None):
+    """Parse arguments, restoring them from a session when --restore is given
+    
+    --restore NAME is picked out before full parsing, so the job's own
+    required arguments come from the session file instead of the command
+    line. Returns (args, session); session is None when neither --session
+    nor --restore was used.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--restore")
+    pre.add_argument("--checkpoint-interval", type=float, default=DEFAULT_INTERVAL)
+    known, _ = pre.parse_known_args(argv)
+    
+    if known.restore:
+        try:
+            session = Session.load(known.restore, known.checkpoint_interval)
+        except SessionError as e:
+            print(f"[!] {e}", file=sys.stderr)
+            sys.exit(1)
+        args = parser.parse_args(session.argv)
+        print(f"[*] Restoring session '{known.restore}' "
+              f"(last checkpoint {session.state.get('updated', 'never')})", file=sys.stderr)
+        return args, session
+    
+    args = parser.parse_args(argv)
+    # Subcommands without session arguments (e.g. benchmark) have no .session
+    if getattr(args, 'session', None):
+        session = Session(args.session, argv, args.checkpoint_interval)
+        session.save()
+        return args, session
+    
+    return args, None
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Hash Throughput Calibration
+Benchmarks hashlib on every local core and caches guesses/second per hash
+algorithm, so crack-time estimates reflect this machine
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+CALIBRATION_FILE = REPO_ROOT / "configs" / "cache" / "hash_calibration.json"
+
+# Work factors assumed for the slow hashes
+PBKDF2_ITERATIONS = 100_000
+SCRYPT_PARAMS = {'n': 2 ** 14, 'r': 8, 'p': 1}
+
+# Hash algorithms by attack model. Rates are guesses/second for the whole
+# machine; the defaults are used until calibrate() has been run.
+ATTACK_MODELS = {
+    'offline_fast_hash': ['md5', 'sha1', 'sha256'],
+    'offline_slow_hash': ['pbkdf2_sha256', 'scrypt'],
+}
+ONLINE_THROTTLED_RATE = 100 / 3600   # 100 guesses per hour
+DEFAULT_RATES = {
+    'md5': 10_000_000,
+    'sha1': 8_000_000,
+    'sha256': 5_000_000,
+    'pbkdf2_sha256': 100,
+    'scrypt': 50,
+}
+
+def _guess(i: int) -> bytes:
+    return b'password%d' % i
+
+def _run(algorithm: str, duration: float) -> float:
+    """Hash candidates for about `duration` seconds; returns guesses/second"""
+    count = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    
+    if algorithm in ('md5', 'sha1', 'sha256'):
+        new = getattr(hashlib, algorithm)
+        while time.perf_counter() < deadline:
+            for i in range(count, count + 2000):
+                new(_guess(i)).digest()
+            count += 2000
+    elif algorithm == 'pbkdf2_sha256':
+        # Time a tenth of the work factor and scale (cost is linear)
+        iterations = PBKDF2_ITERATIONS // 10
+        while time.perf_counter() < deadline:
+            hashlib.pbkdf2_hmac('sha256', _guess(count), b'saltsalt', iterations)
+            count += 1
+        return count / (time.perf_counter() - start) / 10
+    elif algorithm == 'scrypt':
+        while time.perf_counter() < deadline:
+            hashlib.scrypt(_guess(count), salt=b'saltsalt', maxmem=64 * 1024 * 1024, **SCRYPT_PARAMS)
+            count += 1
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    
+    return count / (time.perf_counter() - start)
+
+def calibrate(duration: float = 1.0, workers: int = 0) -> Dict:
+    """Benchmark every algorithm on all cores at once and cache the result"""
+    workers = workers or os.cpu_count() or 1
+    algorithms = [a for names in ATTACK_MODELS.values() for a in names]
+    rates = {}
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for algorithm in algorithms:
+            print(f"[*] Benchmarking {algorithm} on {workers} core(s)...")
+            per_core = list(pool.map(_run, [algorithm] * workers, [duration] * workers))
+            rates[algorithm] = sum(per_core)
+            print(f"    {rates[algorithm]:>16,.1f} guesses/second")
+    
+    calibration = {
+        'created': datetime.now().isoformat(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cores': workers,
+        'python': platform.python_version(),
+        'pbkdf2_iterations': PBKDF2_ITERATIONS,
+        'scrypt_params': SCRYPT_PARAMS,
+        'rates': rates,
+    }
+    
+    CALIBRATION_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(CALIBRATION_FILE, 'w') as f:
+        json.dump(calibration, f, indent=4)
+    print(f"[✓] Calibration saved to: {CALIBRATION_FILE}")
+    
+    return calibration
+
+def load_calibration() -> Optional[Dict]:
+    """Cached calibration, or None if calibrate() has not been run"""
+    try:
+        with open(CALIBRATION_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_hash_rates() -> Dict[str, float]:
+    """Guesses/second per algorithm: measured if available, else defaults"""
+    rates = dict(DEFAULT_RATES)
+    calibration = load_calibration()
+    if calibration:
+        rates.update(calibration.get('rates', {}))
+    return rates
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║       HASH THROUGHPUT CALIBRATION - Competition Tool      ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    calibrate(duration)
+
+if __name__ == "__main__":
+    main()
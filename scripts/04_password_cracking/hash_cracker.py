@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Hash Cracker
+Multi-core dictionary attack on MD5/SHA-1/SHA-256/SHA-512 (plain or
+salted) and PBKDF2 hashes using hashlib
+"""
+
+import os
+import sys
+import time
+import base64
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from password_analyzer import iter_chunks, iter_passwords
+from rule_engine import RuleSet
+from crack_session import WordlistCursor, add_session_arguments, open_session
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+UTILITIES_DIR = REPO_ROOT / "scripts" / "06_utilities"
+
+# Raw digest algorithms by hex length
+FAST_ALGORITHMS = {
+    32: 'md5',
+    40: 'sha1',
+    64: 'sha256',
+    128: 'sha512',
+}
+PBKDF2_PREFIXES = {
+    # Django: pbkdf2_sha256$iterations$salt$b64(hash)
+    'pbkdf2_sha256': 'sha256',
+    'pbkdf2_sha1': 'sha1',
+    # passlib: $pbkdf2-sha256$iterations$ab64(salt)$ab64(hash)
+    'pbkdf2': 'sha1',
+    'pbkdf2-sha256': 'sha256',
+    'pbkdf2-sha512': 'sha512',
+}
+
+BENCH_PBKDF2_ITERATIONS = 10_000
+
+class HashFormatError(ValueError):
+    """Raised for hash lines that cannot be parsed"""
+
+def _ab64_decode(data: str) -> bytes:
+    """passlib's adapted base64 ('.' for '+', no padding)"""
+    data = data.replace('.', '+')
+    return base64.b64decode(data + '=' * (-len(data) % 4))
+
+def parse_hash(line: str, algorithm: Optional[str] = None, salt_position: str = 'append') -> Tuple:
+    """Group key and digest for one target line
+    
+    Keys are ('fast', algorithm, salt, position) or
+    ('pbkdf2', hash_name, salt, iterations, length); targets sharing a key
+    are checked together with one hash per candidate.
+    """
+    if line.startswith('pbkdf2') or line.startswith('$pbkdf2'):
+        parts = line.lstrip('$').split('$')
+        if len(parts) != 4 or parts[0] not in PBKDF2_PREFIXES:
+            raise HashFormatError(f"Unsupported PBKDF2 format: {line}")
+        scheme, iterations, salt, digest = parts
+        if line.startswith('$'):
+            salt, digest = _ab64_decode(salt), _ab64_decode(digest)
+        else:
+            salt, digest = salt.encode('utf-8'), base64.b64decode(digest)
+        return ('pbkdf2', PBKDF2_PREFIXES[scheme], salt, int(iterations), len(digest)), digest
+    
+    hex_digest, _, salt = line.partition(':')
+    name = algorithm or FAST_ALGORITHMS.get(len(hex_digest))
+    if name is None:
+        raise HashFormatError(f"Cannot detect algorithm of: {line}")
+    try:
+        digest = bytes.fromhex(hex_digest)
+    except ValueError:
+        raise HashFormatError(f"Not a hex digest: {line}") from None
+    if len(digest) != hashlib.new(name).digest_size:
+        raise HashFormatError(f"Wrong digest length for {name}: {line}")
+    return ('fast', name, salt.encode('utf-8'), salt_position if salt else None), digest
+
+def load_targets(path: str, algorithm: Optional[str] = None,
+                 salt_position: str = 'append') -> Dict[Tuple, Dict[bytes, List[str]]]:
+    """Target lines grouped by key, then digest -> original lines"""
+    groups = {}
+    for line in iter_passwords(path):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        key, digest = parse_hash(line, algorithm, salt_position)
+        groups.setdefault(key, {}).setdefault(digest, []).append(line)
+    return groups
+
+# Worker state, set once per process so batches carry only candidates
+_worker_groups = None
+_worker_rules = None
+
+def _init_worker(groups: List[Tuple[Tuple, frozenset]], rule_files: Optional[List[str]] = None):
+    global _worker_groups, _worker_rules
+    _worker_groups = groups
+    _worker_rules = RuleSet.from_files(*rule_files, quiet=True) if rule_files else None
+
+def _crack_batch(words: List[str]) -> Tuple[List[Tuple[int, bytes, str]], int]:
+    """Hash a batch against every target group; returns (finds, hashes computed)"""
+    candidates = list(_worker_rules.apply_stream(words)) if _worker_rules else words
+    encoded = [candidate.encode('utf-8', 'replace') for candidate in candidates]
+    found = []
+    
+    for index, (key, digests) in enumerate(_worker_groups):
+        if key[0] == 'pbkdf2':
+            _, name, salt, iterations, length = key
+            pbkdf2 = hashlib.pbkdf2_hmac
+            for i, data in enumerate(encoded):
+                digest = pbkdf2(name, data, salt, iterations, length)
+                if digest in digests:
+                    found.append((index, digest, candidates[i]))
+            continue
+        
+        _, name, salt, position = key
+        new = getattr(hashlib, name)
+        if position is None:
+            for i, data in enumerate(encoded):
+                digest = new(data).digest()
+                if digest in digests:
+                    found.append((index, digest, candidates[i]))
+        elif position == 'append':
+            for i, data in enumerate(encoded):
+                digest = new(data + salt).digest()
+                if digest in digests:
+                    found.append((index, digest, candidates[i]))
+        else:
+            for i, data in enumerate(encoded):
+                digest = new(salt + data).digest()
+                if digest in digests:
+                    found.append((index, digest, candidates[i]))
+    
+    return found, len(encoded) * len(_worker_groups)
+
+def open_competition_logger(log_file: str):
+    """CompetitionLogger from scripts/06_utilities"""
+    if str(UTILITIES_DIR) not in sys.path:
+        sys.path.insert(0, str(UTILITIES_DIR))
+    from logger import CompetitionLogger
+    return CompetitionLogger(log_file)
+
+def crack(targets: Dict[Tuple, Dict[bytes, List[str]]],
+          words: Iterable[str],
+          workers: int = 0,
+          batch_size: int = 20000,
+          rule_files: Optional[List[str]] = None,
+          on_found=None,
+          progress: bool = True,
+          on_checkpoint=None) -> Dict:
+    """Dictionary attack over a word stream; returns run statistics
+    
+    Batches fan out to a process pool with at most 2 per worker in flight,
+    so memory stays flat for any wordlist. Targets live in per-key sets,
+    making each check O(1) however many hashes are loaded. on_found(line,
+    password) is called in the parent as each target falls, and the run
+    stops early once every target is cracked. When words is a
+    WordlistCursor, on_checkpoint(position, stats) is called after each
+    batch is checked with the cursor position just past that batch.
+    """
+    workers = workers or os.cpu_count() or 1
+    keys = list(targets)
+    groups = [(key, frozenset(targets[key])) for key in keys]
+    remaining = {key: dict(digests) for key, digests in targets.items()}
+    total_targets = sum(len(lines) for digests in targets.values() for lines in digests.values())
+    stats = {'hashes': 0, 'cracked': 0, 'targets': total_targets, 'seconds': 0.0}
+    start = time.perf_counter()
+    last_report = start
+    
+    def consume(result, position=None):
+        nonlocal last_report
+        found, hashes = result
+        stats['hashes'] += hashes
+        for index, digest, password in found:
+            lines = remaining[keys[index]].pop(digest, None)
+            for line in lines or ():
+                stats['cracked'] += 1
+                if on_found:
+                    on_found(line, password)
+        now = time.perf_counter()
+        if progress and now - last_report >= 5:
+            last_report = now
+            print(f"[*] {stats['hashes']:,} hashes, {stats['hashes'] / (now - start):,.0f}/s, "
+                  f"{stats['cracked']}/{total_targets} cracked", file=sys.stderr)
+        if on_checkpoint and position is not None:
+            on_checkpoint(position, stats)
+    
+    def done():
+        return stats['cracked'] >= total_targets
+    
+    batches = iter_chunks(iter(words), batch_size)
+    if workers == 1:
+        _init_worker(groups, rule_files)
+        for batch in batches:
+            consume(_crack_batch(batch), getattr(words, 'position', None))
+            if done():
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(groups, rule_files)) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append((pool.submit(_crack_batch, batch), getattr(words, 'position', None)))
+                if len(pending) >= workers * 2:
+                    future, position = pending.popleft()
+                    consume(future.result(), position)
+                    if done():
+                        break
+            while pending:
+                future, position = pending.popleft()
+                if done():
+                    future.cancel()
+                else:
+                    consume(future.result(), position)
+    
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+def benchmark(algorithms: Iterable[str], seconds: float = 2.0, workers: int = 0,
+              batch_size: int = 20000) -> Dict[str, float]:
+    """Engine throughput (hashes/second on all workers) per algorithm"""
+    workers = workers or os.cpu_count() or 1
+    rates = {}
+    for name in algorithms:
+        if name.startswith('pbkdf2'):
+            key = ('pbkdf2', name.split('_', 1)[1], b'saltsalt', BENCH_PBKDF2_ITERATIONS, 32)
+            size = max(1, batch_size // BENCH_PBKDF2_ITERATIONS)
+        else:
+            key = ('fast', name, b'', None)
+            size = batch_size
+        groups = [(key, frozenset([b'\0' * 8]))]
+        hashes = 0
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(groups,)) as pool:
+            pending = deque()
+            batch = 0
+            while time.perf_counter() - start < seconds or pending:
+                if time.perf_counter() - start < seconds and len(pending) < workers * 2:
+                    words = [f"bench{batch}-{i}" for i in range(size)]
+                    pending.append(pool.submit(_crack_batch, words))
+                    batch += 1
+                else:
+                    hashes += pending.popleft().result()[1]
+        rates[name] = hashes / (time.perf_counter() - start)
+        label = f"{name} ({BENCH_PBKDF2_ITERATIONS:,} it)" if name.startswith('pbkdf2') else name
+        print(f"    {label:<28} {rates[name]:>16,.0f} hashes/second")
+    return rates
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║         HASH DICTIONARY ATTACK - Competition Tool         ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    parser = argparse.ArgumentParser(description="Multi-core dictionary attack on offline hashes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    run = sub.add_parser("crack", help="run a dictionary attack")
+    run.add_argument("hashes", help="file of target hashes: hex[:salt], pbkdf2_sha256$... or $pbkdf2-sha256$...")
+    run.add_argument("wordlist", help="wordlist (.gz/.xz/.bz2 or '-' for a generator on stdin)")
+    run.add_argument("--algorithm", choices=sorted(set(FAST_ALGORITHMS.values())),
+                     help="force the raw hash algorithm (default: detect by length)")
+    run.add_argument("--salt-position", choices=("append", "prepend"), default="append",
+                     help="salted hashes are hash(password + salt) or hash(salt + password)")
+    run.add_argument("--rules", nargs="+", metavar="RULES", help="apply rule files in the workers")
+    run.add_argument("--workers", type=int, default=0, help="worker processes (default: all cores)")
+    run.add_argument("--batch-size", type=int, default=20000, help="candidates per worker batch")
+    run.add_argument("--output", metavar="FILE", help="append cracked hash:password lines here")
+    run.add_argument("--log", default="competition_log.json", help="competition log file")
+    run.add_argument("--no-log", action="store_true", help="do not record finds in the competition log")
+    
+    bench = sub.add_parser("benchmark", help="measure hashes/second")
+    bench.add_argument("--algorithms", nargs="+",
+                       default=['md5', 'sha1', 'sha256', 'sha512', 'pbkdf2_sha256'])
+    bench.add_argument("--seconds", type=float, default=2.0)
+    bench.add_argument("--workers", type=int, default=0, help="worker processes (default: all cores)")
+    
+    add_session_arguments(run)
+    
+    args, session = open_session(parser)
+    
+    if args.command == "benchmark":
+        print(f"[*] Benchmarking on {args.workers or os.cpu_count() or 1} worker(s)...")
+        benchmark(args.algorithms, args.seconds, args.workers)
+        return
+    
+    try:
+        targets = load_targets(args.hashes, args.algorithm, args.salt_position)
+    except HashFormatError as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+    if session:
+        for line, password in session.state['cracked'].items():
+            print(f"[✓] CRACKED (restored): {line} -> {password}")
+            for digests in targets.values():
+                for digest, lines in list(digests.items()):
+                    if line in lines:
+                        lines.remove(line)
+                        if not lines:
+                            del digests[digest]
+        targets = {key: digests for key, digests in targets.items() if digests}
+        if not targets:
+            print("[✓] Every target was already cracked in this session")
+            session.finish()
+            return
+    
+    count = sum(len(lines) for digests in targets.values() for lines in digests.values())
+    print(f"[*] Loaded {count} target hash(es) in {len(targets)} group(s)")
+    print(f"[*] Wordlist: {args.wordlist}")
+    if args.rules:
+        # Loaded here once so unsupported rules are reported before the workers start
+        print(f"[*] Rules:    {len(RuleSet.from_files(*args.rules)):,} rule(s)")
+    
+    logger = None if args.no_log else open_competition_logger(args.log)
+    output = open(args.output, 'a') if args.output else None
+    
+    def on_found(line, password):
+        print(f"[✓] CRACKED: {line} -> {password}")
+        if output:
+            output.write(f"{line}:{password}\n")
+            output.flush()
+        if logger:
+            logger.log_password_crack(line, password, "Dictionary attack (hash_cracker.py)")
+        if session:
+            session.add_cracked(line, password)
+    
+    if session:
+        words = WordlistCursor(args.wordlist, session.state['position'])
+        tried = session.state['tried']
+        if words.position:
+            print(f"[*] Resuming at {'byte' if words.seekable else 'line'} {words.position:,}")
+        
+        def on_checkpoint(position, stats):
+            session.update(position=position, tried=tried + stats['hashes'])
+    else:
+        words = iter_passwords(args.wordlist)
+        on_checkpoint = None
+    
+    try:
+        stats = crack(targets, words, args.workers, args.batch_size, args.rules,
+                      on_found, on_checkpoint=on_checkpoint)
+    except KeyboardInterrupt:
+        if session:
+            session.save()
+            print(f"\n[!] Interrupted; resume with --restore {session.name}")
+        sys.exit(130)
+    finally:
+        if output:
+            output.close()
+    if session:
+        session.finish()
+    
+    print(f"\n[✓] Cracked {stats['cracked']}/{stats['targets']} in {stats['seconds']:.1f}s "
+          f"({stats['hashes'] / stats['seconds'] if stats['seconds'] else 0:,.0f} hashes/second)")
+
+if __name__ == "__main__":
+    main()
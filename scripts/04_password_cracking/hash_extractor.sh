@@ -1,22 +1,29 @@
 #!/bin/bash
-# Hash Extractor for 7z Files
+# Hash Extractor for 7z and ZIP Files
 # Extracts password hashes from encrypted archives
+# Uses archive_hash_extractor.py (no John install needed), falling back to 7z2john
 
 echo "═══════════════════════════════════════════════"
-echo "  Hash Extractor for 7z Files"
+echo "  Hash Extractor for 7z and ZIP Files"
 echo "═══════════════════════════════════════════════"
 echo ""
 
-# Check if 7z2john is installed
-if ! command -v 7z2john &> /dev/null; then
-    echo "[!] 7z2john not found!"
+EXTRACTOR="$(dirname "$0")/archive_hash_extractor.py"
+
+# Prefer the bundled extractor; 7z2john only if Python is unavailable
+if command -v python3 &> /dev/null && [ -f "$EXTRACTOR" ]; then
+    EXTRACT_CMD=(python3 "$EXTRACTOR" --workers 1)
+elif command -v 7z2john &> /dev/null; then
+    EXTRACT_CMD=(7z2john)
+else
+    echo "[!] Neither python3 nor 7z2john found!"
     echo "[*] Install with: brew install john-jumbo"
     exit 1
 fi
 
 # Check if input file provided
 if [ $# -eq 0 ]; then
-    echo "Usage: $0 <7z_file> [output_file]"
+    echo "Usage: $0 <7z_or_zip_file> [output_file]"
     echo ""
     echo "Example:"
     echo "  $0 Security.7z"
@@ -38,8 +45,8 @@ echo "[*] Output file: $OUTPUT_FILE"
 echo ""
 
 # Extract hash
-echo "[*] Extracting hash from 7z file..."
-if 7z2john "$INPUT_FILE" > "$OUTPUT_FILE" 2>&1; then
+echo "[*] Extracting hash from archive..."
+if "${EXTRACT_CMD[@]}" "$INPUT_FILE" > "$OUTPUT_FILE" && [ -s "$OUTPUT_FILE" ]; then
     echo "[✓] Hash extracted successfully!"
     echo ""
     
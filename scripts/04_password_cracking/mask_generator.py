@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Mask Generator
+Hashcat-style mask attack candidates with exact keyspace arithmetic and
+index-addressable slicing for splitting work across processes or machines
+"""
+
+import os
+import sys
+import string
+import argparse
+import itertools
+from typing import Dict, Iterator, List, Optional
+
+from wordlist_io import is_compressed, open_wordlist
+from crack_session import add_session_arguments, open_session
+
+# Built-in charsets (same contents and order as hashcat)
+BUILTIN_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    'h': string.digits + 'abcdef',
+    'H': string.digits + 'ABCDEF',
+    's': ' ' + string.punctuation,
+}
+BUILTIN_CHARSETS['a'] = (BUILTIN_CHARSETS['l'] + BUILTIN_CHARSETS['u'] +
+                         BUILTIN_CHARSETS['d'] + BUILTIN_CHARSETS['s'])
+
+CUSTOM_SLOTS = '1234'
+SUFFIX_BLOCK = 1 << 16   # most candidates precomputed for the last positions
+WRITE_BLOCK = 1 << 16    # candidates per output write (and checkpoint)
+
+class MaskError(ValueError):
+    """Raised for masks or charsets that cannot be parsed"""
+
+def expand_charset(spec: str, custom: Optional[Dict[str, str]] = None) -> str:
+    """Charset definition (may reference ?l, ?d, ... or ?1-?4) as a string"""
+    chars = []
+    i = 0
+    while i < len(spec):
+        ch = spec[i]
+        if ch == '?':
+            if i + 1 >= len(spec):
+                raise MaskError(f"Dangling '?' in {spec!r}")
+            key = spec[i + 1]
+            if key == '?':
+                chars.append('?')
+            elif key in BUILTIN_CHARSETS:
+                chars.extend(BUILTIN_CHARSETS[key])
+            elif custom and key in custom:
+                chars.extend(custom[key])
+            else:
+                raise MaskError(f"Unknown charset ?{key} in {spec!r}")
+            i += 2
+        else:
+            chars.append(ch)
+            i += 1
+    return ''.join(dict.fromkeys(chars))
+
+def parse_mask(mask: str, custom: Optional[Dict[str, str]] = None) -> List[str]:
+    """One charset string per position; literal characters are 1-char charsets"""
+    positions = []
+    i = 0
+    while i < len(mask):
+        if mask[i] == '?':
+            if i + 1 >= len(mask):
+                raise MaskError(f"Dangling '?' in mask {mask!r}")
+            positions.append(expand_charset(mask[i:i + 2], custom))
+            i += 2
+        else:
+            positions.append(mask[i])
+            i += 1
+    if any(not charset for charset in positions):
+        raise MaskError(f"Empty charset in mask {mask!r}")
+    return positions
+
+class Mask:
+    """A single mask: keyspace size and index <-> candidate mapping
+    
+    Candidates are numbered like itertools.product, with the last position
+    changing fastest. candidate(i) decodes i as a mixed-radix number in
+    O(length), so any slice of the keyspace can be started directly.
+    """
+    
+    def __init__(self, charsets: List[str]):
+        self.charsets = charsets
+        self.keyspace = 1
+        for charset in charsets:
+            self.keyspace *= len(charset)
+    
+    def __len__(self):
+        return len(self.charsets)
+    
+    def candidate(self, index: int) -> str:
+        if not 0 <= index < self.keyspace:
+            raise IndexError(f"Index {index} outside keyspace of {self.keyspace}")
+        chars = []
+        for charset in reversed(self.charsets):
+            index, digit = divmod(index, len(charset))
+            chars.append(charset[digit])
+        return ''.join(reversed(chars))
+    
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """Candidates with index in [start, stop)
+        
+        The last positions are expanded once into a block of suffixes; each
+        prefix is decoded from its index, so the inner loop is a single
+        string concatenation per candidate.
+        """
+        stop = self.keyspace if stop is None else min(stop, self.keyspace)
+        if start >= stop:
+            return
+        
+        split = len(self.charsets)
+        block = 1
+        while split and block * len(self.charsets[split - 1]) <= SUFFIX_BLOCK:
+            split -= 1
+            block *= len(self.charsets[split])
+        suffixes = [''.join(chars) for chars in itertools.product(*self.charsets[split:])]
+        prefix_mask = Mask(self.charsets[:split])
+        
+        for prefix_index in range(start // block, (stop - 1) // block + 1):
+            prefix = prefix_mask.candidate(prefix_index)
+            base = prefix_index * block
+            lo = max(start - base, 0)
+            hi = min(stop - base, block)
+            if lo == 0 and hi == block:
+                for suffix in suffixes:
+                    yield prefix + suffix
+            else:
+                for suffix in suffixes[lo:hi]:
+                    yield prefix + suffix
+
+class MaskGenerator:
+    """One or more masks (increment mode) addressed as a single keyspace"""
+    
+    def __init__(self, mask: str,
+                 custom_charsets: Optional[Dict[str, str]] = None,
+                 increment: bool = False,
+                 increment_min: int = 1,
+                 increment_max: int = 0):
+        custom = {}
+        for slot in CUSTOM_SLOTS:
+            if custom_charsets and custom_charsets.get(slot):
+                custom[slot] = expand_charset(custom_charsets[slot], custom)
+        
+        charsets = parse_mask(mask, custom)
+        if increment:
+            longest = min(increment_max or len(charsets), len(charsets))
+            lengths = range(max(increment_min, 1), longest + 1)
+        else:
+            lengths = [len(charsets)]
+        
+        self.masks = [Mask(charsets[:length]) for length in lengths]
+        self.keyspace = sum(m.keyspace for m in self.masks)
+    
+    def candidate(self, index: int) -> str:
+        for mask in self.masks:
+            if index < mask.keyspace:
+                return mask.candidate(index)
+            index -= mask.keyspace
+        raise IndexError("Index outside keyspace")
+    
+    def iter_range(self, skip: int = 0, limit: int = 0) -> Iterator[str]:
+        """Candidates skip .. skip + limit - 1 across all masks (limit 0 = all)"""
+        stop = skip + limit if limit else self.keyspace
+        offset = 0
+        for mask in self.masks:
+            if skip < offset + mask.keyspace and stop > offset:
+                yield from mask.iter_range(max(skip - offset, 0), stop - offset)
+            offset += mask.keyspace
+            if offset >= stop:
+                return
+    
+    def slice_bounds(self, part: int, parts: int):
+        """(skip, limit) of part `part` (0-based) when split into `parts` even slices"""
+        start = self.keyspace * part // parts
+        stop = self.keyspace * (part + 1) // parts
+        return start, stop - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate mask attack candidates (hashcat syntax)")
+    parser.add_argument("mask", help="e.g. ?u?l?l?l?d?d or Suffolk?d?d?d?d")
+    for slot in CUSTOM_SLOTS:
+        parser.add_argument(f"-{slot}", f"--custom-charset{slot}", dest=f"charset{slot}",
+                            metavar="CHARS", help=f"custom charset for ?{slot}")
+    parser.add_argument("-i", "--increment", action="store_true", help="also emit shorter prefixes of the mask")
+    parser.add_argument("--increment-min", type=int, default=1)
+    parser.add_argument("--increment-max", type=int, default=0)
+    parser.add_argument("-s", "--skip", type=int, default=0, help="start at this keyspace index")
+    parser.add_argument("-l", "--limit", type=int, default=0, help="emit at most this many candidates")
+    parser.add_argument("--part", help="emit slice N/M of the keyspace (1-based), e.g. 2/8")
+    parser.add_argument("--keyspace", action="store_true", help="print the keyspace size and exit")
+    parser.add_argument("-o", "--output", default="-", help="output file, .gz/.xz/.bz2 compressed (default: stdout)")
+    add_session_arguments(parser)
+    args, session = open_session(parser)
+    
+    try:
+        generator = MaskGenerator(args.mask,
+                                  {slot: getattr(args, f"charset{slot}") for slot in CUSTOM_SLOTS},
+                                  args.increment, args.increment_min, args.increment_max)
+    except MaskError as e:
+        print(f"[!] {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.keyspace:
+        print(generator.keyspace)
+        return
+    
+    skip, limit = args.skip, args.limit
+    if args.part:
+        part, parts = (int(n) for n in args.part.split('/'))
+        skip, limit = generator.slice_bounds(part - 1, parts)
+    
+    # A restored session continues from its last checkpoint: a plain output
+    # file is cut back to the matching offset, compressed output is appended
+    # to (as a new stream, so candidates after the checkpoint may repeat)
+    seekable = args.output != '-' and not is_compressed(args.output)
+    mode = 'w'
+    first = skip
+    if session and session.state['mask_index'] > skip:
+        done = session.state['mask_index'] - skip
+        if limit and done >= limit:
+            print("[✓] Session already complete", file=sys.stderr)
+            session.finish()
+            return
+        skip, limit = skip + done, limit - done if limit else 0
+        if args.output != '-':
+            mode = 'a'
+            if seekable and session.state['output_offset'] is not None:
+                os.truncate(args.output, session.state['output_offset'])
+        print(f"[*] Resuming at index {skip:,}", file=sys.stderr)
+    
+    out = open_wordlist(args.output, mode)
+    
+    count = 0
+    candidates = generator.iter_range(skip, limit)
+    try:
+        with out:
+            while True:
+                block = list(itertools.islice(candidates, WRITE_BLOCK))
+                if not block:
+                    break
+                block.append('')
+                out.write('\n'.join(block))
+                count += len(block) - 1
+                if session:
+                    out.flush()
+                    session.update(mask_index=skip + count,
+                                   output_offset=out.buffer.tell() if seekable else None)
+    except KeyboardInterrupt:
+        if session:
+            session.save()
+            print(f"\n[!] Interrupted; resume with --restore {session.name}", file=sys.stderr)
+        sys.exit(130)
+    if session:
+        session.finish()
+    print(f"[✓] {count:,} of {generator.keyspace:,} candidate(s) "
+          f"(indices {first:,}-{skip + count - 1:,})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
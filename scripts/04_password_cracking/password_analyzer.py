@@ -4,38 +4,112 @@ Password Strength Analyzer
 Analyzes password strength and provides security recommendations
 """
 
+import os
 import re
 import sys
 import math
-from typing import Dict, List
+import json
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from breach_blocklist import Blocklist
+from wordlist_dawg import Dawg
+from pattern_estimator import PatternEstimator
+from hash_calibration import ATTACK_MODELS, ONLINE_THROTTLED_RATE, calibrate, load_hash_rates
+from wordlist_io import iter_passwords, open_wordlist
+
+# Character classes as bit flags; a password's class mask is the OR of
+# the flags of its characters
+LOWERCASE = 1
+UPPERCASE = 2
+DIGITS = 4
+SPECIAL = 8
+
+SPECIAL_CHARS = '!@#$%^&*(),.?":{}|<>'
+
+CHAR_CLASS_TABLE = {}
+for _ch in 'abcdefghijklmnopqrstuvwxyz':
+    CHAR_CLASS_TABLE[_ch] = LOWERCASE
+for _ch in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+    CHAR_CLASS_TABLE[_ch] = UPPERCASE
+for _ch in '0123456789':
+    CHAR_CLASS_TABLE[_ch] = DIGITS
+for _ch in SPECIAL_CHARS:
+    CHAR_CLASS_TABLE[_ch] = SPECIAL
+
+# Charset size and log2(charset size) for each of the 16 class masks
+CHARSET_SIZE_BY_MASK = [
+    (26 if mask & LOWERCASE else 0) + (26 if mask & UPPERCASE else 0) +
+    (10 if mask & DIGITS else 0) + (32 if mask & SPECIAL else 0)
+    for mask in range(16)
+]
+LOG2_CHARSET_BY_MASK = [math.log2(size) if size else 0.0 for size in CHARSET_SIZE_BY_MASK]
+
+# Keyboard/alphabet runs plus every ascending and descending 3-digit run
+_DIGIT_RUNS = [''.join(str(d + k) for k in range(3)) for d in range(8)]
+SEQUENCE_RE = re.compile(
+    '|'.join(['abc', 'qwe', 'asd', 'zxc'] + _DIGIT_RUNS + [run[::-1] for run in _DIGIT_RUNS]),
+    re.IGNORECASE | re.ASCII
+)
+REPETITION_RE = re.compile(r'(.)\1\1', re.DOTALL)
+
+def classify_chars(password: str) -> int:
+    """Return the character class mask of password in one scan"""
+    mask = 0
+    get = CHAR_CLASS_TABLE.get
+    for ch in password:
+        mask |= get(ch, 0)
+    return mask
 
 class PasswordAnalyzer:
-    def __init__(self):
+    def __init__(self, blocklist: Optional[Blocklist] = None, dictionary: Optional[Dawg] = None):
         self.common_passwords = {
             'password', '123456', '12345678', 'qwerty', 'abc123',
             'monkey', 'letmein', 'trustno1', 'dragon', 'baseball',
             'iloveyou', 'master', 'sunshine', 'ashley', 'bailey',
             'shadow', 'superman', 'password1', 'password123'
         }
+        
+        # Compiled breached-password blocklist (see breach_blocklist.py);
+        # the built-in set above is still checked first
+        self.blocklist = blocklist if blocklist is not None else Blocklist.open_default()
+        
+        # Compiled dictionary (see wordlist_dawg.py), queried from an mmap
+        self.dictionary = dictionary if dictionary is not None else Dawg.open_default()
+        
+        # Dictionary/keyboard/date pattern matcher used for guess estimates
+        self.estimator = PatternEstimator()
+        
+        # Guesses/second per hash algorithm (see hash_calibration.py)
+        self.hash_rates = load_hash_rates()
     
     def analyze_password(self, password: str) -> Dict:
         """Comprehensive password analysis"""
         
+        analysis = self.score_password(password)
+        
+        # Guess estimate from dictionary/keyboard/date patterns
+        analysis.update(self.estimator.estimate(password))
+        
+        # Estimate crack time
+        analysis['crack_time'] = self.estimate_crack_time(analysis)
+        analysis['crack_times'] = self.estimate_crack_times(analysis)
+        
+        return analysis
+    
+    def score_password(self, password: str) -> Dict:
+        """Features, score and strength only
+        
+        Skips the pattern estimator and the crack-time estimates, which the
+        score does not depend on, for callers that aggregate large corpora.
+        """
         analysis = {
             'password': password,
             'length': len(password),
-            'has_lowercase': bool(re.search(r'[a-z]', password)),
-            'has_uppercase': bool(re.search(r'[A-Z]', password)),
-            'has_digits': bool(re.search(r'\\d', password)),
-            'has_special': bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password)),
-            'is_common': password.lower() in self.common_passwords,
-            'has_sequence': self.has_sequence(password),
-            'has_repetition': self.has_repetition(password),
-            'entropy': self.calculate_entropy(password),
-            'charset_size': self.get_charset_size(password),
-            'crack_time': None,
-            'strength': None,
-            'score': 0
+            **self.features(password),
+            'is_common': self.is_common(password),
         }
         
         # Calculate score
@@ -44,61 +118,52 @@ class PasswordAnalyzer:
         # Determine strength
         analysis['strength'] = self.determine_strength(analysis['score'])
         
-        # Estimate crack time
-        analysis['crack_time'] = self.estimate_crack_time(analysis)
-        
         return analysis
     
+    def features(self, password: str) -> Dict:
+        """Character classes, sequence/repetition flags, entropy and charset
+        size, from a single pass over the password"""
+        mask = classify_chars(password)
+        charset_size = CHARSET_SIZE_BY_MASK[mask]
+        return {
+            'has_lowercase': bool(mask & LOWERCASE),
+            'has_uppercase': bool(mask & UPPERCASE),
+            'has_digits': bool(mask & DIGITS),
+            'has_special': bool(mask & SPECIAL),
+            'has_sequence': self.has_sequence(password),
+            'has_repetition': self.has_repetition(password),
+            'entropy': round(len(password) * LOG2_CHARSET_BY_MASK[mask], 2) if charset_size else 0,
+            'charset_size': charset_size,
+        }
+    
+    def is_common(self, password: str) -> bool:
+        """Check the built-in common passwords, the breached blocklist and the dictionary"""
+        lowered = password.lower()
+        if lowered in self.common_passwords:
+            return True
+        if self.blocklist is not None and lowered in self.blocklist:
+            return True
+        return self.dictionary is not None and (password in self.dictionary or lowered in self.dictionary)
+    
     def has_sequence(self, password: str) -> bool:
-        """Check for sequential characters"""
-        sequences = ['abc', '123', 'qwe', 'asd', 'zxc']
-        password_lower = password.lower()
-        
-        for seq in sequences:
-            if seq in password_lower:
-                return True
-        
-        # Check for ascending/descending numbers
-        for i in range(len(password) - 2):
-            if password[i:i+3].isdigit():
-                nums = [int(password[i]), int(password[i+1]), int(password[i+2])]
-                if nums[1] - nums[0] == 1 and nums[2] - nums[1] == 1:
-                    return True
-                if nums[0] - nums[1] == 1 and nums[1] - nums[2] == 1:
-                    return True
-        
-        return False
+        """Check for sequential characters (abc, qwe, 123, 987, ...)"""
+        return SEQUENCE_RE.search(password) is not None
     
     def has_repetition(self, password: str) -> bool:
         """Check for repeated characters"""
-        for i in range(len(password) - 2):
-            if password[i] == password[i+1] == password[i+2]:
-                return True
-        return False
+        return REPETITION_RE.search(password) is not None
     
     def get_charset_size(self, password: str) -> int:
         """Calculate character set size"""
-        charset = 0
-        
-        if re.search(r'[a-z]', password):
-            charset += 26
-        if re.search(r'[A-Z]', password):
-            charset += 26
-        if re.search(r'\\d', password):
-            charset += 10
-        if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            charset += 32
-        
-        return charset
+        return CHARSET_SIZE_BY_MASK[classify_chars(password)]
     
     def calculate_entropy(self, password: str) -> float:
         """Calculate password entropy (bits)"""
-        charset_size = self.get_charset_size(password)
-        if charset_size == 0:
+        mask = classify_chars(password)
+        if not CHARSET_SIZE_BY_MASK[mask]:
             return 0
         
-        entropy = len(password) * math.log2(charset_size)
-        return round(entropy, 2)
+        return round(len(password) * LOG2_CHARSET_BY_MASK[mask], 2)
     
     def calculate_score(self, analysis: Dict) -> int:
         """Calculate password strength score (0-100)"""
@@ -162,38 +227,38 @@ class PasswordAnalyzer:
         else:
             return "VERY WEAK"
     
+    def guesses_needed(self, analysis: Dict):
+        """Guesses to find the password: pattern-based, capped by brute force"""
+        charset = analysis['charset_size']
+        guesses = analysis.get('guesses')
+        if charset:
+            combinations = charset ** analysis['length']
+            return combinations if guesses is None else min(guesses, combinations)
+        return guesses if guesses is not None else 0
+    
     def estimate_crack_time(self, analysis: Dict) -> str:
         """Estimate time to crack password"""
-        charset = analysis['charset_size']
-        length = analysis['length']
-        
-        if charset == 0:
+        guesses = self.guesses_needed(analysis)
+        if not guesses:
             return "Instant"
         
         # Assume 1 billion guesses per second
         guesses_per_second = 1_000_000_000
         
-        # Total possible combinations
-        combinations = charset ** length
-        
-        # Time in seconds
-        seconds = combinations / guesses_per_second
-        
-        # Convert to human-readable time
-        if seconds < 1:
-            return "Instant"
-        elif seconds < 60:
-            return f"{int(seconds)} seconds"
-        elif seconds < 3600:
-            return f"{int(seconds / 60)} minutes"
-        elif seconds < 86400:
-            return f"{int(seconds / 3600)} hours"
-        elif seconds < 31536000:
-            return f"{int(seconds / 86400)} days"
-        elif seconds < 31536000 * 1000:
-            return f"{int(seconds / 31536000)} years"
-        else:
-            return "Centuries"
+        return format_duration(guesses, guesses_per_second)
+    
+    def estimate_crack_times(self, analysis: Dict) -> Dict:
+        """Crack time per attack model and hash algorithm at measured rates"""
+        guesses = self.guesses_needed(analysis)
+        crack_times = {'online_throttled': format_duration(guesses, ONLINE_THROTTLED_RATE)}
+        
+        for model, algorithms in ATTACK_MODELS.items():
+            crack_times[model] = {
+                algorithm: format_duration(guesses, self.hash_rates[algorithm])
+                for algorithm in algorithms
+            }
+        
+        return crack_times
     
     def get_recommendations(self, analysis: Dict) -> List[str]:
         """Get recommendations for improving password"""
@@ -253,6 +318,8 @@ class PasswordAnalyzer:
         print(f"  Common:       {'Yes ⚠' if analysis['is_common'] else 'No ✓'}")
         print(f"  Sequence:     {'Yes ⚠' if analysis['has_sequence'] else 'No ✓'}")
         print(f"  Repetition:   {'Yes ⚠' if analysis['has_repetition'] else 'No ✓'}")
+        print(f"  Guesses:      10^{analysis['guesses_log10']}")
+        print(f"  Patterns:     {' + '.join(p['pattern'] for p in analysis['patterns']) or 'none'}")
         
         # Strength assessment
         print("\\n" + "-"*70)
@@ -261,6 +328,15 @@ class PasswordAnalyzer:
         print(f"CRACK TIME:  {analysis['crack_time']}")
         print("-"*70)
         
+        # Crack time by attack model and hash algorithm
+        crack_times = analysis['crack_times']
+        print("\nCrack Time by Attack Model:")
+        print(f"  Online (throttled):  {crack_times['online_throttled']}")
+        for model, label in (('offline_fast_hash', 'Offline fast hash'),
+                             ('offline_slow_hash', 'Offline slow hash')):
+            for algorithm, duration in crack_times[model].items():
+                print(f"  {label + ' (' + algorithm + '):':<34} {duration}")
+        
         # Recommendations
         print("\\nRECOMMENDATIONS:")
         recommendations = self.get_recommendations(analysis)
@@ -269,19 +345,248 @@ class PasswordAnalyzer:
         
         print("\\n" + "="*70 + "\\n")
 
+def format_duration(guesses, guesses_per_second: float) -> str:
+    """Human-readable time to make `guesses` guesses at the given rate"""
+    if not guesses or guesses > 10 ** 300:
+        return "Instant" if not guesses else "Centuries"
+    
+    # Time in seconds
+    seconds = guesses / guesses_per_second
+    
+    # Convert to human-readable time
+    if seconds < 1:
+        return "Instant"
+    elif seconds < 60:
+        return f"{int(seconds)} seconds"
+    elif seconds < 3600:
+        return f"{int(seconds / 60)} minutes"
+    elif seconds < 86400:
+        return f"{int(seconds / 3600)} hours"
+    elif seconds < 31536000:
+        return f"{int(seconds / 86400)} days"
+    elif seconds < 31536000 * 1000:
+        return f"{int(seconds / 31536000)} years"
+    else:
+        return "Centuries"
+
+# Bulk mode: worker processes keep one analyzer each so the per-chunk
+# payload is just the list of passwords
+_worker_analyzer = None
+
+def _init_worker(blocklist_path: Optional[str] = None, dictionary_path: Optional[str] = None):
+    global _worker_analyzer
+    _worker_analyzer = PasswordAnalyzer(Blocklist(blocklist_path) if blocklist_path else None,
+                                        Dawg(dictionary_path) if dictionary_path else None)
+
+def _analyze_chunk(passwords: List[str], emit_records: bool = True):
+    """Analyze a chunk of passwords, returning (ndjson_text, partial_stats)"""
+    analyzer = _worker_analyzer or PasswordAnalyzer()
+    stats = new_bulk_stats()
+    lines = []
+    
+    for password in passwords:
+        analysis = analyzer.analyze_password(password)
+        update_bulk_stats(stats, analysis)
+        if emit_records:
+            lines.append(json.dumps(analysis, ensure_ascii=False))
+    
+    text = '\n'.join(lines) + '\n' if lines else None
+    return text, stats
+
+def new_bulk_stats() -> Dict:
+    """Create an empty aggregate for bulk analysis"""
+    return {
+        'total': 0,
+        'score_sum': 0,
+        'strength': Counter(),
+        'length': Counter(),
+        'charset_size': Counter(),
+        'is_common': 0,
+        'has_sequence': 0,
+        'has_repetition': 0,
+    }
+
+def update_bulk_stats(stats: Dict, analysis: Dict):
+    """Fold a single password analysis into the aggregate"""
+    stats['total'] += 1
+    stats['score_sum'] += analysis['score']
+    stats['strength'][analysis['strength']] += 1
+    stats['length'][analysis['length']] += 1
+    stats['charset_size'][analysis['charset_size']] += 1
+    for flag in ('is_common', 'has_sequence', 'has_repetition'):
+        if analysis[flag]:
+            stats[flag] += 1
+
+def merge_bulk_stats(stats: Dict, other: Dict):
+    """Merge a partial aggregate (e.g. from a worker) into stats"""
+    for key, value in other.items():
+        stats[key] += value
+
+def iter_chunks(passwords: Iterator[str], chunk_size: int) -> Iterator[List[str]]:
+    """Group a password stream into fixed-size lists"""
+    chunk = []
+    for password in passwords:
+        chunk.append(password)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def analyze_bulk(source: str,
+                 output: Optional[TextIO] = None,
+                 workers: int = 0,
+                 chunk_size: int = 5000,
+                 progress: bool = True,
+                 blocklist_path: Optional[str] = None,
+                 dictionary_path: Optional[str] = None) -> Dict:
+    """Analyze every password in source, streaming NDJSON to output
+    
+    Results are written in input order. With output=None only the aggregate
+    is computed. At most 2 chunks per worker are in flight at any time, so
+    memory stays flat regardless of corpus size.
+    """
+    workers = workers or os.cpu_count() or 1
+    emit_records = output is not None
+    stats = new_bulk_stats()
+    chunks = iter_chunks(iter_passwords(source), chunk_size)
+    
+    def consume(result):
+        text, partial = result
+        if text:
+            output.write(text)
+        merge_bulk_stats(stats, partial)
+        if progress and stats['total'] % (chunk_size * 20) < chunk_size:
+            print(f"[*] Analyzed {stats['total']:,} passwords...", file=sys.stderr)
+    
+    if workers == 1:
+        _init_worker(blocklist_path, dictionary_path)
+        for chunk in chunks:
+            consume(_analyze_chunk(chunk, emit_records))
+        return stats
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(blocklist_path, dictionary_path)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_analyze_chunk, chunk, emit_records))
+            if len(pending) >= workers * 2:
+                consume(pending.popleft().result())
+        while pending:
+            consume(pending.popleft().result())
+    
+    return stats
+
+def format_percent(count: int, total: int) -> str:
+    return f"{count / total * 100:5.1f}%" if total else "  0.0%"
+
+def print_bulk_summary(stats: Dict, file: TextIO = sys.stdout,
+                       title: str = "BULK PASSWORD ANALYSIS", close: bool = True):
+    """Print the aggregate report for a bulk run
+    
+    With close=False the closing rule is left off, so callers can append
+    sections of their own.
+    """
+    total = stats['total']
+    
+    def pct(count: int) -> str:
+        return format_percent(count, total)
+    
+    print("\n" + "="*70, file=file)
+    print(f"  {title}", file=file)
+    print("="*70, file=file)
+    print(f"Passwords analyzed: {total:,}", file=file)
+    if total:
+        print(f"Average score:      {stats['score_sum'] / total:.1f}/100", file=file)
+    
+    print("\nStrength:", file=file)
+    for strength in ("VERY STRONG", "STRONG", "MODERATE", "WEAK", "VERY WEAK"):
+        count = stats['strength'][strength]
+        print(f"  {strength:<12} {count:>12,}  {pct(count)}", file=file)
+    
+    print("\nWeaknesses:", file=file)
+    print(f"  Common:       {stats['is_common']:>12,}  {pct(stats['is_common'])}", file=file)
+    print(f"  Sequence:     {stats['has_sequence']:>12,}  {pct(stats['has_sequence'])}", file=file)
+    print(f"  Repetition:   {stats['has_repetition']:>12,}  {pct(stats['has_repetition'])}", file=file)
+    
+    print("\nLength distribution:", file=file)
+    for length in sorted(stats['length']):
+        count = stats['length'][length]
+        print(f"  {length:>3} chars: {count:>12,}  {pct(count)}", file=file)
+    
+    if close:
+        print("="*70 + "\n", file=file)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Password strength analyzer")
+    parser.add_argument("password", nargs="?", help="password to analyze (prompted if omitted)")
+    parser.add_argument("--blocklist", metavar="PATH",
+                        help="breached-password blocklist prefix (default: configs/blocklist/breached if built)")
+    parser.add_argument("--dictionary", metavar="PATH",
+                        help="compiled DAWG dictionary (default: configs/blocklist/dictionary.dawg if built)")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="benchmark hash throughput on this machine and cache it")
+    parser.add_argument("--bulk", metavar="FILE",
+                        help="analyze a password dump (one per line; .gz/.xz/.bz2 or '-' for stdin)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="bulk: write per-password NDJSON here ('-' for stdout)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="bulk: worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=5000,
+                        help="bulk: passwords per worker batch (default: 5000)")
+    args = parser.parse_args(argv)
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be a positive integer")
+    return args
+
+def run_bulk(args: argparse.Namespace):
+    """Bulk mode entry point; keeps stdout clean when NDJSON goes there"""
+    to_stdout = args.output == '-'
+    report = sys.stderr if to_stdout else sys.stdout
+    
+    if args.output and not to_stdout:
+        output = open_wordlist(args.output, 'w')
+    elif to_stdout:
+        output = sys.stdout
+    else:
+        output = None
+    
+    print(f"[*] Streaming passwords from: {args.bulk}", file=sys.stderr)
+    try:
+        stats = analyze_bulk(args.bulk, output, args.workers, args.chunk_size,
+                             blocklist_path=args.blocklist, dictionary_path=args.dictionary)
+    finally:
+        if output is not None and not to_stdout:
+            output.close()
+    
+    print_bulk_summary(stats, report)
+    if args.output and not to_stdout:
+        print(f"[✓] Per-password results saved to: {args.output}", file=report)
+
 def main():
+    args = parse_args()
+    
+    if args.calibrate:
+        calibrate()
+        return
+    
+    if args.bulk:
+        run_bulk(args)
+        return
+    
     print("""
 ╔═══════════════════════════════════════════════════════════╗
 ║       PASSWORD STRENGTH ANALYZER - Competition Tool       ║
 ╚═══════════════════════════════════════════════════════════╝
     """)
     
-    if len(sys.argv) > 1:
-        password = sys.argv[1]
+    if args.password is not None:
+        password = args.password
     else:
         password = input("Enter password to analyze: ")
     
-    analyzer = PasswordAnalyzer()
+    analyzer = PasswordAnalyzer(Blocklist(args.blocklist) if args.blocklist else None,
+                                Dawg(args.dictionary) if args.dictionary else None)
     analysis = analyzer.analyze_password(password)
     analyzer.print_analysis(analysis)
 
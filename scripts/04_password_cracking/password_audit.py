@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Password Policy Audit
+Streams a password corpus once and reports population-level statistics
+using fixed-memory aggregates that can be merged across shards
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import heapq
+import base64
+import hashlib
+import argparse
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from password_analyzer import (
+    PasswordAnalyzer, classify_chars, format_percent, iter_passwords, print_bulk_summary,
+    LOWERCASE, UPPERCASE, DIGITS, SPECIAL,
+)
+from wordlist_io import is_compressed
+
+BASE_WORD_RE = re.compile(r'[a-z]{3,}')
+STRENGTHS = ("VERY STRONG", "STRONG", "MODERATE", "WEAK", "VERY WEAK")
+
+def _encode_array(values: array) -> str:
+    data = array(values.typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode('ascii')
+
+def _decode_array(typecode: str, text: str) -> array:
+    data = array(typecode)
+    data.frombytes(base64.b64decode(text))
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+class CountMinSketch:
+    """Approximate frequency counts in depth x width counters"""
+    
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('Q', bytes(8 * width)) for _ in range(depth)]
+    
+    def _indexes(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode('utf-8', 'replace'), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * d:4 * d + 4], 'little') % self.width for d in range(self.depth)]
+    
+    def add(self, item: str, count: int = 1) -> int:
+        """Add item and return its new estimated count"""
+        estimate = None
+        for row, i in zip(self.rows, self._indexes(item)):
+            row[i] += count
+            if estimate is None or row[i] < estimate:
+                estimate = row[i]
+        return estimate
+    
+    def estimate(self, item: str) -> int:
+        return min(row[i] for row, i in zip(self.rows, self._indexes(item)))
+    
+    def merge(self, other: 'CountMinSketch'):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge count-min sketches of different shapes")
+        for row, other_row in zip(self.rows, other.rows):
+            for i, value in enumerate(other_row):
+                if value:
+                    row[i] += value
+    
+    def to_dict(self) -> Dict:
+        return {'width': self.width, 'depth': self.depth,
+                'rows': [_encode_array(row) for row in self.rows]}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CountMinSketch':
+        sketch = cls(data['width'], data['depth'])
+        sketch.rows = [_decode_array('Q', row) for row in data['rows']]
+        return sketch
+
+class HyperLogLog:
+    """Approximate distinct count in 2^precision one-byte registers"""
+    
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+    
+    def add(self, item: str):
+        x = int.from_bytes(hashlib.blake2b(item.encode('utf-8', 'replace'), digest_size=8).digest(), 'little')
+        index = x >> (64 - self.precision)
+        rest = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+    
+    def merge(self, other: 'HyperLogLog'):
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+    
+    def to_dict(self) -> Dict:
+        return {'precision': self.precision,
+                'registers': base64.b64encode(bytes(self.registers)).decode('ascii')}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HyperLogLog':
+        hll = cls(data['precision'])
+        hll.registers = bytearray(base64.b64decode(data['registers']))
+        return hll
+
+def charset_label(mask: int) -> str:
+    names = [name for bit, name in ((LOWERCASE, 'lower'), (UPPERCASE, 'upper'),
+                                    (DIGITS, 'digits'), (SPECIAL, 'special')) if mask & bit]
+    return '+'.join(names) or 'other'
+
+class PasswordAudit:
+    """Fixed-memory aggregates over a password population
+    
+    Memory does not grow with the corpus: histograms are keyed by small
+    domains (length, charset class, strength), base-word frequencies live
+    in a count-min sketch with a top-K heap, and distinct passwords are
+    estimated with HyperLogLog. Audits of separate shards merge exactly
+    (histograms, sketch, HLL) or near-exactly (top-K).
+    """
+    
+    def __init__(self, top_k: int = 25, analyzer: Optional[PasswordAnalyzer] = None):
+        self.analyzer = analyzer
+        self.top_k = top_k
+        self.total = 0
+        self.score_sum = 0
+        self.length = Counter()
+        self.charset = Counter()
+        self.strength = Counter()
+        self.weaknesses = Counter()
+        self.base_words = CountMinSketch()
+        self.distinct = HyperLogLog()
+        self._top = {}
+        self._heap = []
+    
+    def add(self, password: str):
+        if self.analyzer is None:
+            self.analyzer = PasswordAnalyzer()
+        analysis = self.analyzer.score_password(password)
+        
+        self.total += 1
+        self.score_sum += analysis['score']
+        self.length[analysis['length']] += 1
+        self.charset[charset_label(classify_chars(password))] += 1
+        self.strength[analysis['strength']] += 1
+        for flag in ('is_common', 'has_sequence', 'has_repetition'):
+            if analysis[flag]:
+                self.weaknesses[flag] += 1
+        self.distinct.add(password)
+        
+        base = base_word(password)
+        if base:
+            self._offer(base, self.base_words.add(base))
+    
+    def _offer(self, word: str, count: int):
+        """Keep the top_k heaviest base words in a min-heap"""
+        if self.top_k <= 0:
+            return
+        top, heap = self._top, self._heap
+        if word in top:
+            top[word] = count
+            return
+        if len(top) < self.top_k:
+            top[word] = count
+            heapq.heappush(heap, (count, word))
+            return
+        # Heap entries go stale as counts grow; refresh the minimum first
+        while heap[0][0] != top[heap[0][1]]:
+            _, stale = heapq.heappop(heap)
+            heapq.heappush(heap, (top[stale], stale))
+        if count > heap[0][0]:
+            _, evicted = heapq.heapreplace(heap, (count, word))
+            del top[evicted]
+            top[word] = count
+    
+    def top_base_words(self) -> List[Tuple[str, int]]:
+        return sorted(self._top.items(), key=lambda item: (-item[1], item[0]))
+    
+    def merge(self, other: 'PasswordAudit'):
+        """Fold another shard's audit into this one"""
+        self.total += other.total
+        self.score_sum += other.score_sum
+        self.length.update(other.length)
+        self.charset.update(other.charset)
+        self.strength.update(other.strength)
+        self.weaknesses.update(other.weaknesses)
+        self.base_words.merge(other.base_words)
+        self.distinct.merge(other.distinct)
+        
+        candidates = set(self._top) | set(other._top)
+        ranked = sorted(((self.base_words.estimate(w), w) for w in candidates), reverse=True)[:self.top_k]
+        self._top = {w: c for c, w in ranked}
+        self._heap = [(c, w) for c, w in ranked]
+        heapq.heapify(self._heap)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'top_k': self.top_k,
+            'total': self.total,
+            'score_sum': self.score_sum,
+            'length': {str(k): v for k, v in self.length.items()},
+            'charset': dict(self.charset),
+            'strength': dict(self.strength),
+            'weaknesses': dict(self.weaknesses),
+            'top_base_words': self.top_base_words(),
+            'base_words': self.base_words.to_dict(),
+            'distinct': self.distinct.to_dict(),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PasswordAudit':
+        audit = cls(data['top_k'])
+        audit.total = data['total']
+        audit.score_sum = data['score_sum']
+        audit.length = Counter({int(k): v for k, v in data['length'].items()})
+        audit.charset = Counter(data['charset'])
+        audit.strength = Counter(data['strength'])
+        audit.weaknesses = Counter(data['weaknesses'])
+        audit.base_words = CountMinSketch.from_dict(data['base_words'])
+        audit.distinct = HyperLogLog.from_dict(data['distinct'])
+        audit._top = {w: c for w, c in data['top_base_words']}
+        audit._heap = [(c, w) for w, c in data['top_base_words']]
+        heapq.heapify(audit._heap)
+        return audit
+    
+    def save(self, filename: str):
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f)
+        print(f"[✓] Audit shard saved to: {filename}")
+    
+    @classmethod
+    def load(cls, filename: str) -> 'PasswordAudit':
+        with open(filename, 'r') as f:
+            return cls.from_dict(json.load(f))
+    
+    def report(self) -> Dict:
+        """Plain summary (no sketches) suitable for JSON export"""
+        return {
+            'total': self.total,
+            'distinct_estimate': self.distinct.count(),
+            'average_score': round(self.score_sum / self.total, 2) if self.total else 0,
+            'strength': {s: self.strength[s] for s in STRENGTHS},
+            'weaknesses': dict(self.weaknesses),
+            'length': {k: self.length[k] for k in sorted(self.length)},
+            'charset': dict(self.charset.most_common()),
+            'top_base_words': self.top_base_words(),
+        }
+    
+    def print_report(self):
+        report = self.report()
+        total = report['total']
+        stats = {
+            'total': total,
+            'score_sum': self.score_sum,
+            'strength': self.strength,
+            'length': self.length,
+            **{flag: self.weaknesses[flag] for flag in ('is_common', 'has_sequence', 'has_repetition')},
+        }
+        print_bulk_summary(stats, title="PASSWORD POLICY AUDIT", close=False)
+        
+        print(f"\nDistinct (approx):  {report['distinct_estimate']:,}")
+        
+        print("\nCharacter classes:")
+        for label, count in report['charset'].items():
+            print(f"  {label:<26} {count:>12,}  {format_percent(count, total)}")
+        
+        if self.top_k > 0:
+            print(f"\nTop {self.top_k} base words (approx counts):")
+            for word, count in report['top_base_words']:
+                print(f"  {word:<24} {count:>12,}")
+        
+        print("="*70 + "\n")
+
+def base_word(password: str) -> Optional[str]:
+    """Longest run of 3+ letters, lowercased ("Summer2024!" -> "summer")"""
+    runs = BASE_WORD_RE.findall(password.lower())
+    return max(runs, key=len) if runs else None
+
+def iter_byte_range(path: str, start: int, end: int) -> Iterator[str]:
+    """Passwords whose line starts in [start, end) of an uncompressed file"""
+    with open(path, 'rb', buffering=1 << 20) as f:
+        position = start
+        if start:
+            f.seek(start - 1)
+            position = start - 1 + len(f.readline())
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode('utf-8', 'replace').rstrip('\r\n')
+
+def _audit_range(path: str, start: int, end: int, top_k: int) -> Dict:
+    audit = PasswordAudit(top_k)
+    for password in iter_byte_range(path, start, end):
+        audit.add(password)
+    return audit.to_dict()
+
+def audit_source(source: str, workers: int = 0, top_k: int = 25) -> PasswordAudit:
+    """Audit a corpus in one pass
+    
+    Plain files are split into byte ranges aligned to line boundaries and
+    audited in parallel, one shard per worker, then merged. Compressed
+    files and stdin are streamed in a single process.
+    """
+    workers = workers or os.cpu_count() or 1
+    splittable = source != '-' and not is_compressed(source) and os.path.isfile(source)
+    
+    if workers == 1 or not splittable:
+        audit = PasswordAudit(top_k)
+        for password in iter_passwords(source):
+            audit.add(password)
+        return audit
+    
+    size = os.path.getsize(source)
+    bounds = [size * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(_audit_range, [source] * workers, bounds[:-1], bounds[1:], [top_k] * workers))
+    
+    audit = PasswordAudit.from_dict(shards[0])
+    for shard in shards[1:]:
+        audit.merge(PasswordAudit.from_dict(shard))
+    return audit
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║       PASSWORD POLICY AUDIT - Competition Tool            ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    parser = argparse.ArgumentParser(description="One-pass password population audit")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    run = sub.add_parser("audit", help="audit a password corpus")
+    run.add_argument("source", help="password file (.gz/.xz/.bz2 or '-' for stdin)")
+    run.add_argument("--workers", type=int, default=0, help="worker processes (default: all cores)")
+    run.add_argument("--top", type=int, default=25,
+                     help="number of top base words to keep (0 to skip)")
+    run.add_argument("--save-shard", metavar="FILE", help="save the mergeable audit state")
+    run.add_argument("--json", metavar="FILE", help="write the report as JSON")
+    
+    merge = sub.add_parser("merge", help="merge saved audit shards")
+    merge.add_argument("shards", nargs="+")
+    merge.add_argument("--save-shard", metavar="FILE", help="save the merged audit state")
+    merge.add_argument("--json", metavar="FILE", help="write the report as JSON")
+    
+    args = parser.parse_args()
+    if args.command == "audit" and args.top < 0:
+        parser.error("--top must be 0 or more")
+    
+    if args.command == "audit":
+        print(f"[*] Auditing: {args.source}")
+        audit = audit_source(args.source, args.workers, args.top)
+    else:
+        audit = PasswordAudit.load(args.shards[0])
+        for shard in args.shards[1:]:
+            audit.merge(PasswordAudit.load(shard))
+        print(f"[✓] Merged {len(args.shards)} shard(s)")
+    
+    audit.print_report()
+    
+    if args.save_shard:
+        audit.save(args.save_shard)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(audit.report(), f, indent=4)
+        print(f"[✓] Report saved to: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Password Model
+Trains a probabilistic context-free grammar (PCFG) on wordlists and emits
+candidates in descending probability order
+"""
+
+import re
+import sys
+import json
+import gzip
+import math
+import heapq
+import argparse
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from wordlist_io import iter_words, open_wordlist
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_SOURCES = sorted((REPO_ROOT / "configs" / "wordlists").glob("*.txt"))
+DEFAULT_MODEL = REPO_ROOT / "configs" / "cache" / "pcfg_model.json.gz"
+
+MODEL_VERSION = 1
+
+# Letter, digit and symbol runs; a password's structure is its run sequence
+SEGMENT_RE = re.compile(r'[A-Za-z]+|[0-9]+|[^A-Za-z0-9]+')
+
+def segment(password: str) -> List[Tuple[str, str]]:
+    """Split into (label, run) pairs, e.g. Summer2024! -> L6 D4 S1"""
+    segments = []
+    for match in SEGMENT_RE.finditer(password):
+        run = match.group()
+        ch = run[0]
+        kind = 'L' if ch.isalpha() and ch.isascii() else 'D' if ch.isdigit() and ch.isascii() else 'S'
+        segments.append((f"{kind}{len(run)}", run))
+    return segments
+
+class PCFGModel:
+    """Weir-style PCFG: structure probabilities times terminal probabilities
+    
+    A structure is the sequence of letter/digit/symbol run labels (L6 D4 S1)
+    and each label has its own terminal distribution, so "summer" and "2024"
+    learned from different passwords combine into new guesses. Terminals
+    keep their case. The saved model holds counts only (gzipped JSON) and
+    can be pruned to the most frequent terminals per label.
+    """
+    
+    def __init__(self, structures: Optional[Dict[str, int]] = None,
+                 terminals: Optional[Dict[str, List[Tuple[str, int]]]] = None):
+        self.structures = dict(structures or {})
+        self.terminals = {label: list(entries) for label, entries in (terminals or {}).items()}
+        self._prepare()
+    
+    def _prepare(self):
+        """Sort tables by count and precompute log probabilities"""
+        for entries in self.terminals.values():
+            entries.sort(key=lambda entry: (-entry[1], entry[0]))
+        
+        self._terminal_logp = {}
+        self._terminal_index = {}
+        for label, entries in self.terminals.items():
+            total = sum(count for _, count in entries)
+            self._terminal_logp[label] = [math.log(count / total) for _, count in entries]
+            self._terminal_index[label] = {terminal: i for i, (terminal, _) in enumerate(entries)}
+        
+        total = sum(self.structures.values())
+        self._structure_logp = {structure: math.log(count / total)
+                                for structure, count in self.structures.items()} if total else {}
+    
+    @classmethod
+    def train(cls, passwords: Iterable[str], max_terminals: int = 0, min_count: int = 1) -> 'PCFGModel':
+        """Count structures and terminals over a password stream"""
+        structures = Counter()
+        terminals = defaultdict(Counter)
+        for password in passwords:
+            if not password:
+                continue
+            segments = segment(password)
+            structures[' '.join(label for label, _ in segments)] += 1
+            for label, run in segments:
+                terminals[label][run] += 1
+        
+        pruned = {}
+        for label, counts in terminals.items():
+            common = counts.most_common(max_terminals or None)
+            pruned[label] = [(terminal, count) for terminal, count in common if count >= min_count]
+        
+        # Structures that lost a terminal table to pruning cannot be generated
+        structures = {structure: count for structure, count in structures.items()
+                      if all(pruned.get(label) for label in structure.split(' '))}
+        return cls(structures, pruned)
+    
+    def save(self, path=DEFAULT_MODEL):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        model = {
+            'version': MODEL_VERSION,
+            'type': 'pcfg',
+            'structures': self.structures,
+            'terminals': self.terminals,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(model, f, separators=(',', ':'))
+    
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL) -> 'PCFGModel':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            model = json.load(f)
+        if model.get('version') != MODEL_VERSION or model.get('type') != 'pcfg':
+            raise ValueError(f"Unsupported model file: {path}")
+        return cls(model['structures'], {label: [tuple(entry) for entry in entries]
+                                         for label, entries in model['terminals'].items()})
+    
+    def log_probability(self, password: str) -> float:
+        """Natural log of the model probability (-inf if it cannot produce it)"""
+        segments = segment(password)
+        structure = ' '.join(label for label, _ in segments)
+        if structure not in self._structure_logp:
+            return -math.inf
+        
+        logp = self._structure_logp[structure]
+        for label, run in segments:
+            i = self._terminal_index[label].get(run)
+            if i is None:
+                return -math.inf
+            logp += self._terminal_logp[label][i]
+        return logp
+    
+    def generate(self, limit: int = 0) -> Iterator[Tuple[str, float]]:
+        """(candidate, probability) in descending probability order
+        
+        Each structure starts at its most likely terminals (index 0 in every
+        slot). The priority queue pops the most probable index tuple, and
+        its children advance one slot at or after the slot that produced it
+        (the "pivot"), so every combination is reached exactly once without
+        a visited set. Memory grows with the number of guesses emitted, so
+        set a limit for large models.
+        """
+        heap = []
+        for structure, logp in self._structure_logp.items():
+            labels = structure.split(' ')
+            tables = [self.terminals[label] for label in labels]
+            logps = [self._terminal_logp[label] for label in labels]
+            indices = (0,) * len(labels)
+            total = logp + sum(table[0] for table in logps)
+            heap.append((-total, structure, indices, 0, tables, logps))
+        heapq.heapify(heap)
+        
+        emitted = 0
+        while heap:
+            neg_logp, structure, indices, pivot, tables, logps = heapq.heappop(heap)
+            yield ''.join(tables[slot][i][0] for slot, i in enumerate(indices)), math.exp(-neg_logp)
+            emitted += 1
+            if emitted == limit:
+                return
+            
+            for slot in range(pivot, len(indices)):
+                i = indices[slot] + 1
+                if i < len(tables[slot]):
+                    child = indices[:slot] + (i,) + indices[slot + 1:]
+                    child_neg_logp = neg_logp + logps[slot][i - 1] - logps[slot][i]
+                    heapq.heappush(heap, (child_neg_logp, structure, child, slot, tables, logps))
+    
+    def summary(self) -> Dict:
+        return {
+            'structures': len(self.structures),
+            'labels': len(self.terminals),
+            'terminals': sum(len(entries) for entries in self.terminals.values()),
+            'trained_on': sum(self.structures.values()),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a PCFG password model and generate ordered guesses")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    train = sub.add_parser("train", help="learn a model from wordlists")
+    train.add_argument("sources", nargs="*", help="wordlists (.gz/.xz/.bz2 or '-' for stdin; "
+                       "default: configs/wordlists/*.txt)")
+    train.add_argument("-m", "--model", default=str(DEFAULT_MODEL), help="model file to write")
+    train.add_argument("--max-terminals", type=int, default=0,
+                       help="keep only the N most frequent terminals per label")
+    train.add_argument("--min-count", type=int, default=1, help="drop terminals seen fewer times")
+    
+    generate = sub.add_parser("generate", help="emit candidates most likely first")
+    generate.add_argument("-m", "--model", default=str(DEFAULT_MODEL), help="model file to read")
+    generate.add_argument("-n", "--limit", type=int, default=1_000_000, help="number of guesses (0 = all)")
+    generate.add_argument("-o", "--output", default="-", help="output file, .gz/.xz/.bz2 compressed (default: stdout)")
+    generate.add_argument("--probabilities", action="store_true", help="write probability<TAB>guess")
+    
+    args = parser.parse_args()
+    
+    if args.command == "train":
+        sources = args.sources or [str(path) for path in DEFAULT_SOURCES]
+        passwords = (password for source in sources for password in iter_words(source))
+        model = PCFGModel.train(passwords, args.max_terminals, args.min_count)
+        model.save(args.model)
+        stats = model.summary()
+        print(f"[✓] Trained on {stats['trained_on']:,} password(s): {stats['structures']:,} structure(s), "
+              f"{stats['terminals']:,} terminal(s) in {stats['labels']} label(s)")
+        print(f"[✓] Model saved to: {args.model} ({Path(args.model).stat().st_size:,} bytes)")
+    else:
+        model = PCFGModel.load(args.model)
+        out = open_wordlist(args.output, 'w')
+        
+        count = 0
+        with out:
+            for guess, probability in model.generate(args.limit):
+                out.write(f"{probability:.6e}\t{guess}\n" if args.probabilities else guess + '\n')
+                count += 1
+        print(f"[✓] {count:,} guess(es) written in descending probability order", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
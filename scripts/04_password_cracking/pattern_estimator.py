@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+"""
+Pattern-Matching Strength Estimator
+Estimates guesses needed for a password the way a smart cracker would:
+dictionary words (with l33t and case variants), keyboard walks, dates,
+years, repeats and sequences, combined by a minimum-guess decomposition
+"""
+
+import re
+import sys
+import math
+import time
+import marshal
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from wordlist_io import iter_words
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_DICTIONARIES = sorted((REPO_ROOT / "configs" / "wordlists").glob("*.txt"))
+CACHE_FILE = REPO_ROOT / "configs" / "cache" / "pattern_tables.marshal"
+CACHE_VERSION = 2
+
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+MAX_PASSWORD_LENGTH = 100   # longer input is truncated, as zxcvbn does
+
+# Per-length constants of the search objective, l! * prod(guesses) + D^(l-1)
+FACTORIALS = [math.factorial(l) for l in range(MAX_PASSWORD_LENGTH + 1)]
+SEQUENCE_GROWTH = [0] + [MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1) for l in range(1, MAX_PASSWORD_LENGTH + 1)]
+BRUTEFORCE_GUESSES = [BRUTEFORCE_CARDINALITY ** length for length in range(MAX_PASSWORD_LENGTH + 1)]
+REFERENCE_YEAR = datetime.now().year
+
+# Keyboard layouts: one string per row, keys separated by spaces, each key
+# written as "<unshifted><shifted>". Row offsets give the slant of a real
+# keyboard (each row starts half a key to the right of the one above).
+KEYBOARD_LAYOUTS = {
+    'qwerty': (True, [
+        (0, "`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+"),
+        (1, "qQ wW eE rR tT yY uU iI oO pP [{ ]} \\|"),
+        (1, "aA sS dD fF gG hH jJ kK lL ;: '\""),
+        (1, "zZ xX cC vV bB nN mM ,< .> /?"),
+    ]),
+    'keypad': (False, [
+        (1, "/ * -"),
+        (0, "7 8 9 +"),
+        (0, "4 5 6"),
+        (0, "1 2 3"),
+        (1, "0 ."),
+    ]),
+}
+
+# Common character substitutions: letter -> characters that stand for it
+L33T_TABLE = {
+    'a': '4@', 'b': '8', 'c': '({[<', 'e': '3', 'g': '69', 'i': '1!|',
+    'l': '1|7', 'o': '0', 's': '$5', 't': '+7', 'x': '%', 'z': '2',
+}
+
+# Digit splits tried for separator-less dates, by token length
+DATE_SPLITS = {
+    4: [(1, 2), (2, 3)],
+    5: [(1, 3), (2, 3)],
+    6: [(1, 2), (2, 4), (4, 5)],
+    7: [(1, 3), (2, 3), (4, 5), (4, 6)],
+    8: [(2, 4), (4, 6)],
+}
+
+YEAR_RE = re.compile(r'19\d\d|20\d\d', re.ASCII)
+DATE_WITH_SEPARATOR_RE = re.compile(r'(?=(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4}))', re.ASCII)
+DIGITS_RE = re.compile(r'\d{4,8}', re.ASCII)
+REPEAT_GREEDY_RE = re.compile(r'(.+)\1+', re.DOTALL)
+REPEAT_LAZY_RE = re.compile(r'(.+?)\1+', re.DOTALL)
+REPEAT_ANCHORED_RE = re.compile(r'^(.+?)\1+$', re.DOTALL)
+REPEAT_CACHE_SIZE = 4096
+
+# ---------------------------------------------------------------------------
+# Precomputed tables
+# ---------------------------------------------------------------------------
+
+def build_keyboard_graph(slanted: bool, rows) -> Dict[str, Dict[str, int]]:
+    """Map every character to {neighbouring character: direction index}"""
+    positions = {}
+    for r, (offset, row) in enumerate(rows):
+        for c, key in enumerate(row.split()):
+            positions[(r, offset + c)] = key
+    
+    if slanted:
+        directions = [(0, -1), (-1, 0), (-1, 1), (0, 1), (1, 0), (1, -1)]
+    else:
+        directions = [(0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1)]
+    
+    graph = {}
+    for (r, c), key in positions.items():
+        neighbors = {}
+        for direction, (dr, dc) in enumerate(directions):
+            for neighbor in positions.get((r + dr, c + dc), ''):
+                neighbors[neighbor] = direction
+        for ch in key:
+            graph[ch] = neighbors
+    return graph
+
+def load_dictionary(path: Path) -> List[str]:
+    """Words from a wordlist in rank order (first line = most common)"""
+    words = []
+    seen = set()
+    for line in iter_words(path, comments=True):
+        word = line.strip().lower()
+        if word and word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+def build_tables(dictionaries: Sequence[Path]) -> Dict:
+    """Compile dictionaries and keyboard graphs into marshal-able tables
+    
+    Dictionary words are stored as a flattened trie: every prefix of every
+    word is a key, mapped to the word's rank if the prefix is itself a word
+    and to 0 otherwise. Walking the trie is then one dict lookup per
+    character, and the whole table loads in a single marshal call.
+    """
+    trie = {}
+    for path in dictionaries:
+        for rank, word in enumerate(load_dictionary(path), 1):
+            for end in range(1, len(word)):
+                trie.setdefault(word[:end], 0)
+            if not trie.get(word) or rank < trie[word]:
+                trie[word] = rank
+    
+    graphs = {}
+    for name, (slanted, rows) in KEYBOARD_LAYOUTS.items():
+        graph = build_keyboard_graph(slanted, rows)
+        degrees = [len(set(neighbors.values())) for neighbors in graph.values()]
+        shifted = ''.join(key[1] for _, row in rows for key in row.split() if len(key) > 1)
+        graphs[name] = {
+            'graph': graph,
+            'starts': sum(len(row.split()) for _, row in rows),
+            'degree': sum(degrees) / len(degrees),
+            'shifted': shifted,
+        }
+    
+    l33t_reverse = {}
+    for letter, subs in L33T_TABLE.items():
+        for sub in subs:
+            l33t_reverse[sub] = l33t_reverse.get(sub, '') + letter
+    
+    return {'trie': trie, 'graphs': graphs, 'l33t': l33t_reverse}
+
+def _signature(dictionaries: Sequence[Path]) -> List:
+    signature = [CACHE_VERSION]
+    for path in dictionaries:
+        stat = path.stat()
+        signature.append([str(path), stat.st_size, stat.st_mtime_ns])
+    return signature
+
+def load_tables(dictionaries: Optional[Sequence[Path]] = None,
+                cache_file: Path = CACHE_FILE) -> Dict:
+    """Load compiled tables from the cache, rebuilding if sources changed"""
+    dictionaries = [Path(p) for p in (dictionaries if dictionaries is not None else DEFAULT_DICTIONARIES)]
+    signature = _signature(dictionaries)
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = marshal.load(f)
+        if cached.get('signature') == signature:
+            return cached['tables']
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+    
+    tables = build_tables(dictionaries)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            marshal.dump({'signature': signature, 'tables': tables}, f)
+        tmp.replace(cache_file)
+    except OSError as e:
+        print(f"[!] Could not write pattern cache: {e}", file=sys.stderr)
+    return tables
+
+# ---------------------------------------------------------------------------
+# Guess arithmetic
+# ---------------------------------------------------------------------------
+
+def n_choose_k(n: int, k: int) -> int:
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+def case_variations(word: str) -> int:
+    """Extra guesses for the capitalization used in a dictionary match"""
+    if word.islower() or not any(ch.isalpha() for ch in word):
+        return 1
+    if word.isupper() or (word[0].isupper() and word[1:].islower()) or \
+       (word[-1].isupper() and word[:-1].islower()):
+        return 2
+    upper = sum(1 for ch in word if ch.isupper())
+    lower = sum(1 for ch in word if ch.islower())
+    return sum(n_choose_k(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+def l33t_variations(token: str, subs: Dict[str, str]) -> int:
+    """Extra guesses for the substitutions used in a l33t match"""
+    variations = 1
+    lowered = token.lower()
+    for sub, letter in subs.items():
+        subbed = lowered.count(sub)
+        unsubbed = lowered.count(letter)
+        if subbed == 0 or unsubbed == 0:
+            variations *= 2
+        else:
+            variations *= sum(n_choose_k(subbed + unsubbed, i)
+                              for i in range(1, min(subbed, unsubbed) + 1))
+    return variations
+
+def spatial_guesses(length: int, turns: int, shifted: int, starts: int, degree: float) -> float:
+    guesses = 0.0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += n_choose_k(i - 1, j - 1) * starts * degree ** j
+    if shifted:
+        unshifted = length - shifted
+        if unshifted == 0:
+            guesses *= 2
+        else:
+            guesses *= sum(n_choose_k(shifted + unshifted, i)
+                           for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+def year_space(year: int) -> int:
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+# ---------------------------------------------------------------------------
+# Estimator
+# ---------------------------------------------------------------------------
+
+class PatternEstimator:
+    """Finds the cheapest way to guess a password from known patterns
+    
+    Matches are (pattern, i, j, token, guesses, detail) tuples covering
+    password[i:j+1]. estimate() collects every match, then picks the
+    decomposition into matches and brute-force gaps that minimizes total
+    guesses (zxcvbn's l! * prod(guesses) + D^(l-1) objective).
+    """
+    
+    def __init__(self, tables: Optional[Dict] = None):
+        tables = tables or load_tables()
+        self.trie = tables['trie']
+        self.graphs = tables['graphs']
+        self.l33t = tables['l33t']
+        self.repeat_guesses = {}   # repeated base -> its own best guesses
+    
+    # -- matchers -----------------------------------------------------------
+    
+    def dictionary_matches(self, password: str, lowered: str) -> List:
+        matches = []
+        trie = self.trie
+        n = len(password)
+        
+        for i in range(n):
+            for j in range(i + 1, n + 1):
+                rank = trie.get(lowered[i:j])
+                if rank is None:
+                    break
+                if rank:
+                    token = password[i:j]
+                    matches.append(('dictionary', i, j - 1, token,
+                                    rank * case_variations(token), lowered[i:j]))
+        
+        reversed_lower = lowered[::-1]
+        for i in range(n):
+            for j in range(i + 1, n + 1):
+                rank = trie.get(reversed_lower[i:j])
+                if rank is None:
+                    break
+                if rank and j - i > 1:
+                    start, end = n - j, n - 1 - i
+                    token = password[start:end + 1]
+                    if token.lower() == reversed_lower[i:j]:
+                        continue  # palindrome, already matched forwards
+                    matches.append(('reversed', start, end, token,
+                                    rank * case_variations(token) * 2, reversed_lower[i:j]))
+        return matches
+    
+    def l33t_matches(self, password: str, lowered: str) -> List:
+        l33t = self.l33t
+        last = max((j for j, ch in enumerate(lowered) if ch in l33t), default=-1)
+        if last < 0:
+            return []
+        
+        trie = self.trie
+        n = len(password)
+        matches = []
+        
+        def walk(i, j, prefix, subs):
+            # Past the last substitutable character, an unsubstituted
+            # prefix can only extend into plain dictionary matches
+            if j == n or (j > last and not subs):
+                return
+            ch = lowered[j]
+            for candidate in ch + l33t.get(ch, ''):
+                word = prefix + candidate
+                rank = trie.get(word)
+                if rank is None:
+                    continue
+                new_subs = subs
+                if candidate != ch:
+                    if subs.get(ch, candidate) != candidate:
+                        continue  # one meaning per substitution character
+                    new_subs = dict(subs)
+                    new_subs[ch] = candidate
+                if rank and new_subs and j > i:
+                    token = password[i:j + 1]
+                    guesses = rank * case_variations(token) * l33t_variations(token, new_subs)
+                    matches.append(('l33t', i, j, token, guesses, word))
+                walk(i, j + 1, word, new_subs)
+        
+        for i in range(last + 1):
+            walk(i, i, '', {})
+        return matches
+    
+    def spatial_matches(self, password: str) -> List:
+        matches = []
+        n = len(password)
+        
+        for name, info in self.graphs.items():
+            graph = info['graph']
+            shifted_chars = info['shifted']
+            i = 0
+            while i < n - 2:
+                j = i + 1
+                last_direction = None
+                turns = 0
+                shifted = 1 if password[i] in shifted_chars else 0
+                
+                while j < n:
+                    neighbors = graph.get(password[j - 1])
+                    if not neighbors:
+                        break
+                    ch = password[j]
+                    direction = neighbors.get(ch)
+                    if direction is None:
+                        break
+                    if direction != last_direction:
+                        turns += 1
+                        last_direction = direction
+                    if ch in shifted_chars:
+                        shifted += 1
+                    j += 1
+                
+                if j - i > 2:
+                    guesses = spatial_guesses(j - i, turns, shifted, info['starts'], info['degree'])
+                    matches.append(('spatial', i, j - 1, password[i:j], guesses, name))
+                i = j
+        return matches
+    
+    def sequence_matches(self, password: str) -> List:
+        matches = []
+        n = len(password)
+        if n < 3:
+            return matches
+        
+        def emit(i, j, delta):
+            if j - i < 2 or abs(delta) != 1:
+                return
+            token = password[i:j + 1]
+            first = token[0]
+            if first in 'aAzZ019':
+                base = 4
+            elif first.isdigit():
+                base = 10
+            else:
+                base = 26
+            if delta < 0:
+                base *= 2
+            matches.append(('sequence', i, j, token, base * len(token), 'ascending' if delta > 0 else 'descending'))
+        
+        i = 0
+        last_delta = None
+        for k in range(1, n):
+            delta = ord(password[k]) - ord(password[k - 1])
+            if last_delta is None:
+                last_delta = delta
+                continue
+            if delta == last_delta:
+                continue
+            emit(i, k - 1, last_delta)
+            i = k - 1
+            last_delta = delta
+        emit(i, n - 1, last_delta)
+        return matches
+    
+    def repeat_matches(self, password: str) -> List:
+        matches = []
+        pos = 0
+        
+        while pos < len(password):
+            g = REPEAT_GREEDY_RE.search(password, pos)
+            if not g:
+                break
+            l = REPEAT_LAZY_RE.search(password, pos)
+            if len(g.group(0)) > len(l.group(0)):
+                match = g
+                base = REPEAT_ANCHORED_RE.match(g.group(0)).group(1)
+            else:
+                match = l
+                base = l.group(1)
+            start, end = match.span()
+            base_guesses = self.repeat_guesses.get(base)
+            if base_guesses is None:
+                if len(self.repeat_guesses) >= REPEAT_CACHE_SIZE:
+                    self.repeat_guesses.clear()
+                base_guesses = self.repeat_guesses[base] = self.most_guessable(base)['guesses']
+            repeats = (end - start) // len(base)
+            matches.append(('repeat', start, end - 1, match.group(0), base_guesses * repeats, base))
+            pos = end
+        return matches
+    
+    def date_matches(self, password: str) -> List:
+        matches = []
+        
+        for m in YEAR_RE.finditer(password):
+            matches.append(('year', m.start(), m.end() - 1, m.group(0), year_space(int(m.group(0))), ''))
+        
+        for m in DIGITS_RE.finditer(password):
+            run_start, run = m.start(), m.group(0)
+            for length in range(4, min(len(run), 8) + 1):
+                for offset in range(len(run) - length + 1):
+                    token = run[offset:offset + length]
+                    best = None
+                    for k, l in DATE_SPLITS[length]:
+                        dmy = map_ints_to_dmy((int(token[:k]), int(token[k:l]), int(token[l:])))
+                        if dmy and (best is None or abs(dmy[2] - REFERENCE_YEAR) < abs(best[2] - REFERENCE_YEAR)):
+                            best = dmy
+                    if best:
+                        start = run_start + offset
+                        matches.append(('date', start, start + length - 1, token,
+                                        year_space(best[2]) * 365, '%02d-%02d-%04d' % best))
+        
+        # One scan finds the longest d/m/y split at each start; shorter
+        # endings would sit inside the longest valid one and be dropped
+        for m in DATE_WITH_SEPARATOR_RE.finditer(password):
+            i, first, middle = m.start(), int(m.group(1)), int(m.group(3))
+            tail_start, tail = m.start(4), m.group(4)
+            for length in range(len(tail), 0, -1):
+                j = tail_start + length - 1
+                if not 5 <= j - i <= 9:
+                    continue
+                dmy = map_ints_to_dmy((first, middle, int(tail[:length])))
+                if dmy:
+                    matches.append(('date', i, j, password[i:j + 1], year_space(dmy[2]) * 365 * 4, '%02d-%02d-%04d' % dmy))
+                    break
+        
+        return self._drop_contained_dates(matches)
+    
+    @staticmethod
+    def _drop_contained_dates(matches: List) -> List:
+        """Drop dates that sit inside a longer date match"""
+        dates = [m for m in matches if m[0] == 'date']
+        return [m for m in matches if m[0] != 'date' or not any(
+            o is not m and o[1] <= m[1] and o[2] >= m[2] and (o[2] - o[1]) > (m[2] - m[1]) for o in dates)]
+    
+    def omnimatch(self, password: str) -> List:
+        lowered = password.lower()
+        if len(lowered) != len(password):
+            lowered = ''.join(ch.lower() if len(ch.lower()) == 1 else ch for ch in password)
+        return (self.dictionary_matches(password, lowered) +
+                self.l33t_matches(password, lowered) +
+                self.spatial_matches(password) +
+                self.sequence_matches(password) +
+                self.repeat_matches(password) +
+                self.date_matches(password))
+    
+    # -- search -------------------------------------------------------------
+    
+    def most_guessable(self, password: str, matches: Optional[List] = None) -> Dict:
+        """Minimum-guess decomposition of password into matches"""
+        password = password[:MAX_PASSWORD_LENGTH]
+        n = len(password)
+        if n == 0:
+            return {'guesses': 1, 'sequence': []}
+        if matches is None:
+            matches = self.omnimatch(password)
+        
+        by_end = [[] for _ in range(n)]
+        for match in matches:
+            if match[2] < n:
+                by_end[match[2]].append(match)
+        
+        # best[k][l] = (g, pi, match): cheapest way to cover password[:k+1]
+        # with l matches, its guess product and its last match. Brute-force
+        # gaps are stored as bare start indexes and only become match
+        # tuples if they end up in the chosen sequence.
+        best = [{} for _ in range(n)]
+        
+        def update(k, i, pi, match, l):
+            if l > 1:
+                pi *= best[i - 1][l - 1][1]
+            g = FACTORIALS[l] * pi + SEQUENCE_GROWTH[l]
+            best_k = best[k]
+            for other_l, entry in best_k.items():
+                if other_l <= l and entry[0] <= g:
+                    return
+            best_k[l] = (g, pi, match)
+        
+        # (i, lengths): a brute-force gap may start at i after a sequence of
+        # one of these lengths whose last match ends at i - 1 and is not
+        # brute force (two brute-force gaps in a row are never useful)
+        anchors = []
+        
+        for k in range(n):
+            for match in by_end[k]:
+                i, guesses = match[1], match[4]
+                if k - i + 1 < n:
+                    floor = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if i == k else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+                    guesses = max(guesses, floor)
+                guesses = max(guesses, 1)
+                if i > 0:
+                    for l in list(best[i - 1]):
+                        update(k, i, guesses, match, l + 1)
+                else:
+                    update(k, 0, guesses, match, 1)
+            
+            # Brute-force guesses (10^length) are always above the floors
+            update(k, 0, BRUTEFORCE_GUESSES[k + 1], 0, 1)
+            for i, lengths in anchors:
+                guesses = BRUTEFORCE_GUESSES[k - i + 1]
+                for l in lengths:
+                    update(k, i, guesses, i, l + 1)
+            
+            lengths = [l for l, entry in best[k].items() if entry[2].__class__ is tuple]
+            if lengths:
+                anchors.append((k + 1, lengths))
+        
+        k = n - 1
+        l = min(best[k], key=lambda l: best[k][l][0])
+        guesses = best[k][l][0]
+        sequence = []
+        while k >= 0:
+            match = best[k][l][2]
+            if match.__class__ is int:
+                token = password[match:k + 1]
+                match = ('bruteforce', match, k, token, BRUTEFORCE_GUESSES[len(token)], '')
+            sequence.append(match)
+            k = match[1] - 1
+            l -= 1
+        sequence.reverse()
+        
+        return {'guesses': guesses, 'sequence': sequence}
+    
+    def estimate(self, password: str) -> Dict:
+        """Guesses, log10(guesses) and the chosen decomposition of the first
+        MAX_PASSWORD_LENGTH characters"""
+        result = self.most_guessable(password)
+        guesses = result['guesses']
+        return {
+            'guesses': guesses,
+            'guesses_log10': round(math.log10(guesses), 2),
+            'patterns': [
+                {'pattern': m[0], 'token': m[3], 'guesses': m[4], 'detail': m[5]}
+                for m in result['sequence']
+            ],
+        }
+
+def map_ints_to_dmy(ints):
+    """Interpret three integers as (day, month, year), or None"""
+    if ints[1] > 31 or ints[1] <= 0:
+        return None
+    over_12 = over_31 = under_1 = 0
+    for value in ints:
+        if 99 < value < 1000 or value > 2050:
+            return None
+        if value > 31:
+            over_31 += 1
+        if value > 12:
+            over_12 += 1
+        if value <= 0:
+            under_1 += 1
+    if over_31 >= 2 or over_12 == 3 or under_1 >= 2:
+        return None
+    
+    for year, rest in ((ints[2], ints[:2]), (ints[0], ints[1:])):
+        if 1000 <= year <= 2050:
+            dm = map_ints_to_dm(rest)
+            return (dm[0], dm[1], year) if dm else None
+    
+    for year, rest in ((ints[2], ints[:2]), (ints[0], ints[1:])):
+        dm = map_ints_to_dm(rest)
+        if dm:
+            year = year + 1900 if year > 50 else year + 2000 if year < 100 else year
+            return (dm[0], dm[1], year)
+    return None
+
+def map_ints_to_dm(ints):
+    for day, month in (ints, ints[::-1]):
+        if 1 <= day <= 31 and 1 <= month <= 12:
+            return (day, month)
+    return None
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║       PATTERN STRENGTH ESTIMATOR - Competition Tool       ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    start = time.perf_counter()
+    estimator = PatternEstimator()
+    print(f"[*] Tables loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+    
+    passwords = sys.argv[1:] or [input("Enter password to analyze: ")]
+    for password in passwords:
+        result = estimator.estimate(password)
+        print(f"\n{'*' * len(password)}  ~10^{result['guesses_log10']} guesses")
+        for p in result['patterns']:
+            detail = f" ({p['detail']})" if p['detail'] else ""
+            print(f"  {p['pattern']:<11} {p['token']!r:<20} {p['guesses']:>14.4g}{detail}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Rule Engine
+Parses John the Ripper / Hashcat mangling rules, compiles each rule once
+into a closure pipeline and applies rule sets to a stream of base words
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from wordlist_io import open_wordlist
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+RULES_DIR = REPO_ROOT / "configs" / "rules"
+
+Transform = Callable[[str], Optional[str]]
+
+# John the Ripper config section headers, e.g. [List.Rules:Wordlist]
+SECTION_HEADER_RE = re.compile(r'^\[(List\.[^\]]*|[A-Za-z]\w*:[^\]]*)\]\s*$')
+
+class RuleError(ValueError):
+    """Raised for rules that cannot be parsed"""
+
+def position(ch: str) -> int:
+    """Rule position argument: 0-9 then A-Z for 10-35"""
+    if ch.isdigit():
+        return int(ch)
+    if 'A' <= ch <= 'Z':
+        return ord(ch) - ord('A') + 10
+    raise RuleError(f"Invalid position: {ch!r}")
+
+def _toggle(ch: str) -> str:
+    return ch.lower() if ch.isupper() else ch.upper()
+
+def _byte_op(fn: Callable[[int], int]) -> Callable[[str], str]:
+    """Hashcat's byte arithmetic on one character (wraps at 256)"""
+    def apply(ch):
+        code = ord(ch)
+        return chr(fn(code) & 0xFF) if code < 0x100 else ch
+    return apply
+
+def _at(n: int, fn: Callable[[str], str]) -> Transform:
+    """Apply fn to the character at position n, if there is one"""
+    return lambda w: w[:n] + fn(w[n]) + w[n + 1:] if n < len(w) else w
+
+# Functions without arguments
+SIMPLE_OPS = {
+    ':': lambda w: w,
+    'l': str.lower,
+    'u': str.upper,
+    'c': str.capitalize,
+    'C': lambda w: w[:1].lower() + w[1:].upper(),
+    't': str.swapcase,
+    'r': lambda w: w[::-1],
+    'd': lambda w: w + w,
+    'f': lambda w: w + w[::-1],
+    '{': lambda w: w[1:] + w[:1],
+    '}': lambda w: w[-1:] + w[:-1],
+    '[': lambda w: w[1:],
+    ']': lambda w: w[:-1],
+    'q': lambda w: ''.join(ch + ch for ch in w),
+    'k': lambda w: w[1:2] + w[:1] + w[2:] if len(w) > 1 else w,
+    'K': lambda w: w[:-2] + w[-1] + w[-2] if len(w) > 1 else w,
+    'E': lambda w: ' '.join(part.capitalize() for part in w.lower().split(' ')),
+}
+
+# Functions taking one position argument
+def _op_toggle_at(n):
+    return _at(n, _toggle)
+
+def _op_delete_at(n):
+    return lambda w: w[:n] + w[n + 1:]
+
+def _op_duplicate_times(n):
+    return lambda w: w * (n + 1)
+
+def _op_duplicate_first(n):
+    return lambda w: w[:1] * n + w
+
+def _op_duplicate_last(n):
+    return lambda w: w + w[-1:] * n
+
+def _op_truncate(n):
+    return lambda w: w[:n]
+
+def _op_duplicate_prefix(n):
+    return lambda w: w[:n] + w if n <= len(w) else w
+
+def _op_duplicate_suffix(n):
+    return lambda w: w + w[len(w) - n:] if n <= len(w) else w
+
+def _op_increment_at(n):
+    return _at(n, _byte_op(lambda code: code + 1))
+
+def _op_decrement_at(n):
+    return _at(n, _byte_op(lambda code: code - 1))
+
+def _op_shift_left_at(n):
+    return _at(n, _byte_op(lambda code: code << 1))
+
+def _op_shift_right_at(n):
+    return _at(n, _byte_op(lambda code: code >> 1))
+
+def _op_copy_next(n):
+    return lambda w: w[:n] + w[n + 1] + w[n + 1:] if n + 1 < len(w) else w
+
+def _op_copy_previous(n):
+    return lambda w: w[:n] + w[n - 1] + w[n + 1:] if 0 < n < len(w) else w
+
+def _reject_longer(n):
+    return lambda w: w if len(w) < n else None
+
+def _reject_shorter(n):
+    return lambda w: w if len(w) > n else None
+
+def _reject_length_not(n):
+    return lambda w: w if len(w) == n else None
+
+POSITION_OPS = {
+    'T': _op_toggle_at,
+    'D': _op_delete_at,
+    'p': _op_duplicate_times,
+    'z': _op_duplicate_first,
+    'Z': _op_duplicate_last,
+    "'": _op_truncate,
+    'y': _op_duplicate_prefix,
+    'Y': _op_duplicate_suffix,
+    '+': _op_increment_at,
+    '-': _op_decrement_at,
+    'L': _op_shift_left_at,
+    'R': _op_shift_right_at,
+    '.': _op_copy_next,
+    ',': _op_copy_previous,
+    '<': _reject_longer,
+    '>': _reject_shorter,
+    '_': _reject_length_not,
+}
+
+def _op_title_with(x):
+    return lambda w: x.join(part[:1].upper() + part[1:] for part in w.lower().split(x))
+
+# Functions taking one character argument
+CHAR_OPS = {
+    'e': _op_title_with,
+    '$': lambda x: lambda w: w + x,
+    '^': lambda x: lambda w: x + w,
+    '@': lambda x: lambda w: w.replace(x, ''),
+    '!': lambda x: lambda w: None if x in w else w,
+    '/': lambda x: lambda w: w if x in w else None,
+    '(': lambda x: lambda w: w if w[:1] == x else None,
+    ')': lambda x: lambda w: w if w[-1:] == x else None,
+}
+
+def _op_extract(n, m):
+    return lambda w: w[n:n + m] if n < len(w) else w
+
+def _op_omit(n, m):
+    return lambda w: w[:n] + w[n + m:] if n < len(w) else w
+
+def _op_swap(n, m):
+    def swap(w):
+        if n >= len(w) or m >= len(w):
+            return w
+        chars = list(w)
+        chars[n], chars[m] = chars[m], chars[n]
+        return ''.join(chars)
+    return swap
+
+def _op_insert(n, x):
+    return lambda w: w[:n] + x + w[n:] if n <= len(w) else w
+
+def _op_overwrite(n, x):
+    return lambda w: w[:n] + x + w[n + 1:] if n < len(w) else w
+
+def _op_replace(x, y):
+    return lambda w: w.replace(x, y)
+
+def _op_toggle_after(n, x):
+    """Toggle the character after the (n+1)th occurrence of x"""
+    def toggle(w):
+        i = -1
+        for _ in range(n + 1):
+            i = w.find(x, i + 1)
+            if i < 0:
+                return w
+        return w[:i + 1] + _toggle(w[i + 1]) + w[i + 2:] if i + 1 < len(w) else w
+    return toggle
+
+def _reject_char_not_at(n, x):
+    return lambda w: w if w[n:n + 1] == x else None
+
+def _reject_fewer(n, x):
+    return lambda w: w if w.count(x) >= n else None
+
+# Functions taking two arguments: (kinds, factory)
+PAIR_OPS = {
+    'x': ('pp', _op_extract),
+    'O': ('pp', _op_omit),
+    '*': ('pp', _op_swap),
+    'i': ('pc', _op_insert),
+    'o': ('pc', _op_overwrite),
+    's': ('cc', _op_replace),
+    '3': ('pc', _op_toggle_after),
+    '=': ('pc', _reject_char_not_at),
+    '%': ('pc', _reject_fewer),
+}
+
+# Functions using the memory buffer: (kinds, factory(memory, *args)).
+# memory[0] holds the input word until M memorizes the current one.
+def _op_memorize(memory):
+    def memorize(w):
+        memory[0] = w
+        return w
+    return memorize
+
+def _op_append_memory(memory):
+    return lambda w: w + memory[0]
+
+def _op_prepend_memory(memory):
+    return lambda w: memory[0] + w
+
+def _reject_unchanged(memory):
+    return lambda w: None if w == memory[0] else w
+
+def _op_insert_memory(memory, n, m, i):
+    def insert(w):
+        saved = memory[0]
+        if n + m > len(saved) or i > len(w):
+            return w
+        return w[:i] + saved[n:n + m] + w[i:]
+    return insert
+
+MEMORY_OPS = {
+    'M': ('', _op_memorize),
+    '4': ('', _op_append_memory),
+    '6': ('', _op_prepend_memory),
+    'Q': ('', _reject_unchanged),
+    'X': ('ppp', _op_insert_memory),
+}
+
+def tokenize_rule(rule: str) -> List[tuple]:
+    """Split one rule line into (function, args) tokens"""
+    tokens = []
+    i = 0
+    n = len(rule)
+    
+    def take(count):
+        nonlocal i
+        if i + count > n:
+            raise RuleError(f"Missing argument in rule {rule!r}")
+        args = rule[i:i + count]
+        i += count
+        return args
+    
+    while i < n:
+        op = rule[i]
+        i += 1
+        if op in ' \t':
+            continue
+        if op in SIMPLE_OPS:
+            tokens.append((op, ''))
+        elif op in POSITION_OPS or op in CHAR_OPS:
+            tokens.append((op, take(1)))
+        elif op in PAIR_OPS:
+            tokens.append((op, take(2)))
+        elif op in MEMORY_OPS:
+            tokens.append((op, take(len(MEMORY_OPS[op][0]))))
+        else:
+            raise RuleError(f"Unsupported rule function {op!r} in {rule!r}")
+    
+    return tokens
+
+def parse_rule(rule: str, memory: Optional[List[str]] = None) -> List[Transform]:
+    """Parse one rule line into its list of transforms
+    
+    Runs of appends ($1$9$0$0) or prepends are fused into a single
+    concatenation, since they are the most common functions in rule sets.
+    Memory functions share the one-item list memory, which the caller
+    resets to each input word.
+    """
+    fused = []
+    for op, args in tokenize_rule(rule):
+        if fused and op == fused[-1][0] and op == '$':
+            fused[-1] = (op, fused[-1][1] + args)
+        elif fused and op == fused[-1][0] and op == '^':
+            fused[-1] = (op, args + fused[-1][1])
+        else:
+            fused.append((op, args))
+    
+    transforms = []
+    for op, args in fused:
+        if op in SIMPLE_OPS:
+            transforms.append(SIMPLE_OPS[op])
+        elif op in POSITION_OPS:
+            transforms.append(POSITION_OPS[op](position(args)))
+        elif op in CHAR_OPS:
+            transforms.append(CHAR_OPS[op](args))
+        elif op in MEMORY_OPS:
+            kinds, factory = MEMORY_OPS[op]
+            if memory is None:
+                memory = ['']
+            transforms.append(factory(memory, *(position(v) for v in args)))
+        else:
+            kinds, factory = PAIR_OPS[op]
+            values = [position(v) if kind == 'p' else v for kind, v in zip(kinds, args)]
+            transforms.append(factory(*values))
+    
+    return transforms
+
+def compile_rule(rule: str) -> Transform:
+    """Compile a rule line into a single closure (None = word rejected)"""
+    memory = ['']
+    transforms = parse_rule(rule, memory)
+    if any(op in MEMORY_OPS for op, _ in tokenize_rule(rule)):
+        def apply_with_memory(word, transforms=tuple(transforms)):
+            memory[0] = word
+            for transform in transforms:
+                word = transform(word)
+                if word is None:
+                    return None
+            return word
+        return apply_with_memory
+    if not transforms:
+        return SIMPLE_OPS[':']
+    if len(transforms) == 1:
+        return transforms[0]
+    
+    def apply(word, transforms=tuple(transforms)):
+        for transform in transforms:
+            word = transform(word)
+            if word is None:
+                return None
+        return word
+    return apply
+
+def read_rules(path) -> List[str]:
+    """Rule lines from a rule file, skipping comments, blank lines and
+    John the Ripper section headers ([List.Rules:...])"""
+    rules = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if line.strip() and not line.startswith(('#', ';')) and not SECTION_HEADER_RE.match(line):
+                rules.append(line)
+    return rules
+
+def resolve_rule_file(name) -> Path:
+    """A rule file path, or the name of a built-in set in configs/rules"""
+    path = Path(name)
+    if path.exists():
+        return path
+    builtin = RULES_DIR / (name if str(name).endswith('.rule') else f"{name}.rule")
+    if builtin.exists():
+        return builtin
+    raise FileNotFoundError(f"Rule file not found: {name}")
+
+class RuleSet:
+    """An ordered set of compiled rules
+    
+    Rules using functions this engine does not implement (John the
+    Ripper's character classes and preprocessor, for instance) are
+    skipped; .skipped lists them and, unless quiet, a warning is printed.
+    """
+    
+    def __init__(self, rules: Iterable[str], quiet: bool = False):
+        self.rules = []
+        self.compiled = []
+        self.skipped = []
+        for rule in rules:
+            try:
+                self.compiled.append(compile_rule(rule))
+            except RuleError as e:
+                self.skipped.append((rule, str(e)))
+                continue
+            self.rules.append(rule)
+        
+        if self.skipped and not quiet:
+            print(f"[!] Skipped {len(self.skipped):,} unsupported rule(s):", file=sys.stderr)
+            for rule, _ in self.skipped[:5]:
+                print(f"    {rule}", file=sys.stderr)
+            if len(self.skipped) > 5:
+                print(f"    ... and {len(self.skipped) - 5:,} more", file=sys.stderr)
+    
+    @classmethod
+    def from_files(cls, *names, quiet: bool = False) -> 'RuleSet':
+        rules = []
+        for name in names:
+            rules.extend(read_rules(resolve_rule_file(name)))
+        return cls(rules, quiet)
+    
+    def __len__(self):
+        return len(self.compiled)
+    
+    def apply(self, word: str) -> Iterator[str]:
+        """Every candidate the rules produce for one word"""
+        for rule in self.compiled:
+            candidate = rule(word)
+            if candidate is not None:
+                yield candidate
+    
+    def apply_stream(self, words: Iterable[str]) -> Iterator[str]:
+        """Rules applied to each word of a base-word stream"""
+        compiled = self.compiled
+        for word in words:
+            for rule in compiled:
+                candidate = rule(word)
+                if candidate is not None:
+                    yield candidate
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 rule_engine.py <rule_file|builtin> [wordlist|-]")
+        print("\nApplies rules to every word and writes candidates to stdout,")
+        print("like hashcat --stdout. Built-in rule sets live in configs/rules/.")
+        print("Wordlists may be .gz/.xz/.bz2 compressed.")
+        print("\nExample:")
+        print("  python3 rule_engine.py numbers words.txt | john --stdin hash.txt")
+        sys.exit(1)
+    
+    ruleset = RuleSet.from_files(sys.argv[1])
+    source = open_wordlist(sys.argv[2] if len(sys.argv) > 2 else '-')
+    
+    start = time.perf_counter()
+    count = 0
+    out = sys.stdout
+    with source:
+        for candidate in ruleset.apply_stream(line.rstrip('\r\n') for line in source):
+            out.write(candidate + '\n')
+            count += 1
+    
+    elapsed = time.perf_counter() - start
+    print(f"[✓] {count:,} candidates from {len(ruleset)} rule(s) "
+          f"({count / elapsed if elapsed else 0:,.0f}/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
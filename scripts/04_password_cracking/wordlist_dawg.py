@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Wordlist DAWG
+Compiles sorted wordlists into a minimal acyclic automaton (DAWG) that is
+queried for membership and prefixes straight from an mmap
+"""
+
+import os
+import sys
+import mmap
+import struct
+import argparse
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from wordlist_merger import iter_sources, merge_sorted
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_SOURCES = sorted((REPO_ROOT / "configs" / "wordlists").glob("*.txt"))
+DEFAULT_DAWG = REPO_ROOT / "configs" / "blocklist" / "dictionary.dawg"
+
+DAWG_MAGIC = b'CTFDAWG1'
+DAWG_HEADER = struct.Struct('<8sIIQ')   # magic, nodes, edges, words
+FINAL_FLAG = 0x8000                     # node_info: final bit | edge count
+COUNT_MASK = 0x01FF
+
+_BYTES = [bytes((i,)) for i in range(256)]
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+def build_automaton(words: Iterable[bytes]) -> Tuple[List[tuple], int]:
+    """Minimal automaton of a sorted byte-string stream (Daciuk et al.)
+    
+    Only the path of the previous word is kept mutable; when the next word
+    diverges, the nodes below the common prefix are final and replaced by
+    an equivalent registered node if one exists. Memory therefore grows
+    with the size of the minimized automaton, not of the wordlist.
+    Returns (nodes, word count); each node is (final, ((label, child), ...))
+    and children always precede their parents, so the root is last.
+    """
+    register = {}
+    nodes = []
+    stack = [[False, []]]
+    prev = b''
+    count = 0
+    
+    def freeze(depth):
+        while len(stack) > depth + 1:
+            final, edges = stack.pop()
+            signature = (final, tuple(edges))
+            node = register.get(signature)
+            if node is None:
+                node = len(nodes)
+                register[signature] = node
+                nodes.append(signature)
+            stack[-1][1].append((prev[len(stack) - 1], node))
+    
+    for word in words:
+        if not word or word == prev:
+            continue
+        if word < prev:
+            raise ValueError("DAWG input must be sorted")
+        common = len(os.path.commonprefix([prev, word]))
+        freeze(common)
+        stack.extend([False, []] for _ in range(len(word) - common))
+        stack[-1][0] = True
+        prev = word
+        count += 1
+    
+    freeze(0)
+    final, edges = stack[0]
+    nodes.append((final, tuple(edges)))
+    return nodes, count
+
+def write_dawg(nodes: List[tuple], words: int, path) -> None:
+    """Serialize: header, first edge per node, edge targets, node info, labels"""
+    first = array('I')
+    info = array('H')
+    targets = array('I')
+    labels = bytearray()
+    for final, edges in nodes:
+        first.append(len(targets))
+        info.append(len(edges) | (FINAL_FLAG if final else 0))
+        for label, child in edges:
+            labels.append(label)
+            targets.append(child)
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(DAWG_HEADER.pack(DAWG_MAGIC, len(nodes), len(targets), words))
+        _little_endian(first).tofile(f)
+        _little_endian(targets).tofile(f)
+        _little_endian(info).tofile(f)
+        f.write(labels)
+    os.replace(tmp, path)
+
+class Dawg:
+    """Read-only DAWG backed by an mmap
+    
+    A lookup walks one edge per byte of the UTF-8 word; a node's edge labels
+    are contiguous and sorted, so each step is a short scan in C
+    (mmap.find). Nothing is loaded up front and processes share the pages.
+    """
+    
+    def __init__(self, path=DEFAULT_DAWG):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, self.nodes, self.edges, self.words = DAWG_HEADER.unpack_from(self._mm)
+        if magic != DAWG_MAGIC:
+            raise ValueError(f"Not a DAWG file: {self.path}")
+        
+        offset = DAWG_HEADER.size
+        view = self._view = memoryview(self._mm)
+        sections = []
+        for typecode, length in (('I', self.nodes), ('I', self.edges), ('H', self.nodes)):
+            size = length * array(typecode).itemsize
+            section = view[offset:offset + size]
+            if sys.byteorder == 'little':
+                sections.append(section.cast(typecode))
+            else:
+                values = array(typecode, section.tobytes())
+                values.byteswap()
+                sections.append(values)
+            offset += size
+        self._first, self._targets, self._info = sections
+        self._labels = offset
+        self.root = self.nodes - 1
+    
+    @classmethod
+    def open_default(cls) -> Optional['Dawg']:
+        """Open the default artifact if it has been built, else None"""
+        if DEFAULT_DAWG.exists():
+            return cls(DEFAULT_DAWG)
+        return None
+    
+    def _walk(self, data: bytes) -> int:
+        """Node reached by data from the root, or -1"""
+        node = self.root
+        first = self._first
+        info = self._info
+        labels = self._labels
+        find = self._mm.find
+        for byte in data:
+            start = labels + first[node]
+            i = find(_BYTES[byte], start, start + (info[node] & COUNT_MASK))
+            if i < 0:
+                return -1
+            node = self._targets[i - labels]
+        return node
+    
+    def __contains__(self, word: str) -> bool:
+        node = self._walk(word.encode('utf-8', 'replace'))
+        return node >= 0 and bool(self._info[node] & FINAL_FLAG)
+    
+    def has_prefix(self, prefix: str) -> bool:
+        return self._walk(prefix.encode('utf-8', 'replace')) >= 0
+    
+    def iter_prefix(self, prefix: str = '', limit: int = 0) -> Iterator[str]:
+        """Words starting with prefix, in sorted order"""
+        data = prefix.encode('utf-8', 'replace')
+        node = self._walk(data)
+        if node < 0:
+            return
+        
+        emitted = 0
+        stack = [(node, data)]
+        while stack:
+            node, word = stack.pop()
+            if self._info[node] & FINAL_FLAG:
+                yield word.decode('utf-8', 'replace')
+                emitted += 1
+                if emitted == limit:
+                    return
+            start = self._first[node]
+            for edge in range(start + (self._info[node] & COUNT_MASK) - 1, start - 1, -1):
+                stack.append((self._targets[edge], word + _BYTES[self._mm[self._labels + edge]]))
+    
+    def __len__(self):
+        return self.words
+    
+    def close(self):
+        for section in (self._first, self._targets, self._info):
+            if isinstance(section, memoryview):
+                section.release()
+        self._view.release()
+        self._mm.close()
+
+def build_dawg(sources: Iterable[str], output=DEFAULT_DAWG, lowercase: bool = False) -> int:
+    """Compile wordlists into a DAWG file; returns the number of words
+    
+    Input order does not matter: words are sorted and deduplicated by an
+    external merge first (see wordlist_merger.py).
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    words = iter_sources(sources)
+    if lowercase:
+        words = (word.lower() for word in words)
+    
+    with tempfile.TemporaryDirectory(dir=output.parent) as tmpdir:
+        encoded = (word.encode('utf-8') for word in merge_sorted(words, tmpdir))
+        nodes, count = build_automaton(encoded)
+    
+    write_dawg(nodes, count, output)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query a compiled wordlist DAWG")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    build = sub.add_parser("build", help="compile wordlists into a DAWG")
+    build.add_argument("sources", nargs="*", help="wordlists (.gz/.xz/.bz2 or '-' for stdin; "
+                       "default: configs/wordlists/*.txt)")
+    build.add_argument("-o", "--output", default=str(DEFAULT_DAWG), help="DAWG file to write")
+    build.add_argument("--lowercase", action="store_true", help="store words lowercased")
+    
+    check = sub.add_parser("check", help="test words for membership")
+    check.add_argument("words", nargs="+")
+    check.add_argument("-d", "--dawg", default=str(DEFAULT_DAWG), help="DAWG file")
+    
+    prefix = sub.add_parser("prefix", help="list words starting with a prefix")
+    prefix.add_argument("prefix")
+    prefix.add_argument("-d", "--dawg", default=str(DEFAULT_DAWG), help="DAWG file")
+    prefix.add_argument("-n", "--limit", type=int, default=50, help="maximum words (0 = all)")
+    
+    args = parser.parse_args()
+    
+    if args.command == "build":
+        sources = args.sources or [str(path) for path in DEFAULT_SOURCES]
+        count = build_dawg(sources, args.output, args.lowercase)
+        print(f"[✓] DAWG built: {count:,} unique word(s)")
+        print(f"[✓] Saved to: {args.output} ({Path(args.output).stat().st_size:,} bytes)")
+    elif args.command == "check":
+        dawg = Dawg(args.dawg)
+        for word in args.words:
+            print(f"  {word:<30} {'found' if word in dawg else 'not found'}")
+    else:
+        dawg = Dawg(args.dawg)
+        for word in dawg.iter_prefix(args.prefix, args.limit):
+            print(word)
+
+if __name__ == "__main__":
+    main()
@@ -4,73 +4,57 @@ Custom Wordlist Generator
 Generates context-specific wordlists for password cracking
 """
 
+import os
 import sys
+import time
+import argparse
 import itertools
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from rule_engine import RuleSet
+from mask_generator import MaskGenerator
+from wordlist_io import is_compressed, open_wordlist
+
+# Built-in rule sets (configs/rules) that reproduce the original base,
+# number, special-character and leet mutation stages
+DEFAULT_RULES = ['base', 'numbers', 'special', 'leet']
+
+# Leet alternatives per letter, most common substitution first
+LEET_MAP = {
+    'a': ['4', '@'],
+    'e': ['3'],
+    'i': ['1', '!'],
+    'o': ['0'],
+    's': ['5', '$'],
+    't': ['7'],
+    'l': ['1'],
+    'g': ['9']
+}
 
 class WordlistGenerator:
-    def __init__(self):
-        self.wordlist = set()
+    """Builds wordlists from composable generator stages
     
-    def add_base_words(self, words: List[str]):
-        """Add base words to wordlist"""
-        for word in words:
-            self.wordlist.add(word)
-            self.wordlist.add(word.lower())
-            self.wordlist.add(word.upper())
-            self.wordlist.add(word.capitalize())
-    
-    def add_with_numbers(self, word: str, number_range: range = range(0, 10000)):
-        """Add word with number variations"""
-        # Common patterns
-        self.wordlist.add(word)
-        
-        # Add single digits
-        for i in range(10):
-            self.wordlist.add(f"{word}{i}")
-            self.wordlist.add(f"{i}{word}")
-        
-        # Add common years
-        for year in [1900, 1906, 1950, 2000, 2020, 2021, 2022, 2023, 2024, 2025]:
-            self.wordlist.add(f"{word}{year}")
-            self.wordlist.add(f"{word}-{year}")
-            self.wordlist.add(f"{word}_{year}")
-        
-        # Add three-digit patterns
-        for i in range(100, 1000, 111):  # 111, 222, 333, etc.
-            self.wordlist.add(f"{word}{i}")
+    Base words are mutated by a John/Hashcat rule set (DEFAULT_RULES unless
+    other rule files are given). Each stage yields candidates for one base
+    word; nothing is collected in memory. Candidates stream straight to the
+    output file, so memory does not grow with the size of the wordlist and
+    a cracker can start on the file while it is still being written.
+    Duplicates are removed within a base word's expansion only; use a
+    wordlist_merger.py pass for global uniqueness.
+    """
     
-    def add_with_special_chars(self, word: str):
-        """Add word with special character variations"""
-        special_chars = ['!', '@', '#', '$', '%', '&', '*', '-', '_']
-        
-        for char in special_chars:
-            self.wordlist.add(f"{word}{char}")
-            self.wordlist.add(f"{char}{word}")
-            self.wordlist.add(f"{word}{char}{word}")
-    
-    def add_leet_speak(self, word: str):
-        """Add leet speak variations"""
-        leet_map = {
-            'a': ['a', '4', '@'],
-            'e': ['e', '3'],
-            'i': ['i', '1', '!'],
-            'o': ['o', '0'],
-            's': ['s', '5', '$'],
-            't': ['t', '7'],
-            'l': ['l', '1'],
-            'g': ['g', '9']
-        }
-        
-        # Simple leet variations
-        leet_word = word.lower()
-        for original, replacements in leet_map.items():
-            for replacement in replacements[1:]:  # Skip the original letter
-                self.wordlist.add(leet_word.replace(original, replacement))
-    
-    def add_keyboard_patterns(self):
-        """Add common keyboard patterns"""
-        patterns = [
+    def __init__(self, rule_files: Optional[List[str]] = None, max_leet_variants: int = 0,
+                 quiet: bool = False):
+        self.rules = RuleSet.from_files(*(rule_files or DEFAULT_RULES), quiet=quiet)
+        self.max_leet_variants = max_leet_variants
+        self.total = 0
+        self.lengths = {}
+    
+    def keyboard_patterns(self) -> Iterator[str]:
+        """Common keyboard patterns"""
+        yield from [
             'qwerty', 'asdfgh', 'zxcvbn',
             'qwertyuiop', 'asdfghjkl', 'zxcvbnm',
             '123456', '1234567890',
@@ -78,13 +62,10 @@ class WordlistGenerator:
             'admin', 'Admin', 'ADMIN',
             'root', 'Root', 'ROOT'
         ]
-        
-        for pattern in patterns:
-            self.wordlist.add(pattern)
     
-    def add_common_passwords(self):
-        """Add commonly used passwords"""
-        common = [
+    def common_passwords(self) -> Iterator[str]:
+        """Commonly used passwords"""
+        yield from [
             'password', 'Password', 'PASSWORD', 'password123',
             '123456', '12345678', '1234567890',
             'qwerty', 'abc123', 'password1',
@@ -93,17 +74,46 @@ class WordlistGenerator:
             'sunshine', 'princess', 'login',
             'passw0rd', 'P@ssw0rd', 'P@ssword'
         ]
+    
+    def leet_expansions(self, word: str, max_variants: int) -> Iterator[str]:
+        """Combinatorial leet variants of the lowercased word
         
-        for pwd in common:
-            self.wordlist.add(pwd)
-    
-    def generate_competition_wordlist(self, 
-                                     institution: str = "suffolk",
-                                     team_name: str = "",
-                                     year: int = 1906):
-        """Generate wordlist specific to competition"""
+        Unlike the one-substitution-at-a-time leet rules, several letters
+        are substituted at once ("security" -> "$3cur1ty"). Variants come
+        in order of how many letters are substituted, and within that the
+        most common alternatives come first, so the max_variants budget
+        keeps the likeliest ones. Everything is generated lazily from
+        itertools.combinations/product.
+        """
+        word = word.lower()
+        positions = [i for i, ch in enumerate(word) if ch in LEET_MAP]
+        produced = 0
         
-        print("[*] Generating competition-specific wordlist...")
+        for count in range(1, len(positions) + 1):
+            for chosen in itertools.combinations(positions, count):
+                for subs in itertools.product(*(LEET_MAP[word[i]] for i in chosen)):
+                    chars = list(word)
+                    for i, sub in zip(chosen, subs):
+                        chars[i] = sub
+                    yield ''.join(chars)
+                    produced += 1
+                    if produced >= max_variants:
+                        return
+    
+    def expand_word(self, word: str) -> Iterator[str]:
+        """All rule outputs for one base word, without repeats"""
+        candidates = self.rules.apply(word)
+        if self.max_leet_variants:
+            candidates = itertools.chain(candidates, self.leet_expansions(word, self.max_leet_variants))
+        return unique(candidates)
+    
+    def expand_words(self, words: Iterable[str]) -> Iterator[str]:
+        """Rule outputs for every word of a base-word stream"""
+        for word in words:
+            yield from self.expand_word(word)
+    
+    def competition_base_words(self, institution: str = "suffolk", team_name: str = "") -> List[str]:
+        """Base words for the competition wordlist"""
         
         # Institution-based words
         base_words = [
@@ -120,95 +130,280 @@ class WordlistGenerator:
         if team_name:
             base_words.extend([team_name, team_name.lower(), team_name.upper()])
         
-        # Add base words and variations
-        for word in base_words:
-            self.add_base_words([word])
-            self.add_with_numbers(word)
-            self.add_with_special_chars(word)
-            self.add_leet_speak(word)
-        
-        # Add keyboard patterns
-        self.add_keyboard_patterns()
+        return base_words
+    
+    def generate_competition_wordlist(self,
+                                      institution: str = "suffolk",
+                                      team_name: str = "",
+                                      year: int = 1906) -> Iterator[str]:
+        """Generate wordlist specific to competition (lazily)"""
         
-        # Add common passwords
-        self.add_common_passwords()
+        # Base words and variations
+        yield from self.expand_words(self.competition_base_words(institution, team_name))
         
-        # Add institution + year combinations
-        self.wordlist.add(f"{institution}{year}")
-        self.wordlist.add(f"{institution}-{year}")
-        self.wordlist.add(f"{institution}_{year}")
-        self.wordlist.add(f"{institution.capitalize()}{year}")
+        # Keyboard patterns and common passwords
+        yield from unique(itertools.chain(self.keyboard_patterns(), self.common_passwords()))
         
-        print(f"[✓] Generated {len(self.wordlist)} passwords")
+        # Institution + year combinations
+        yield f"{institution}{year}"
+        yield f"{institution}-{year}"
+        yield f"{institution}_{year}"
+        yield f"{institution.capitalize()}{year}"
+    
+    def write_wordlist(self, candidates: Iterable[str], out: TextIO):
+        """Stream candidates to an open file, tracking statistics"""
+        lengths = self.lengths
+        for word in candidates:
+            out.write(word + '\n')
+            self.total += 1
+            lengths[len(word)] = lengths.get(len(word), 0) + 1
     
-    def save_wordlist(self, filename: str = "custom_wordlist.txt"):
-        """Save wordlist to file"""
-        sorted_list = sorted(self.wordlist)
+    def save_wordlist(self, candidates: Iterable[str], filename: str = "custom_wordlist.txt"):
+        """Save wordlist to file ('-' for stdout; .gz/.xz/.bz2 are compressed)"""
+        if filename == '-':
+            self.write_wordlist(candidates, sys.stdout)
+            sys.stdout.flush()
+            return
         
-        with open(filename, 'w') as f:
-            for word in sorted_list:
-                f.write(word + '\\n')
+        with open_wordlist(filename, 'w') as f:
+            self.write_wordlist(candidates, f)
         
         print(f"[✓] Wordlist saved to: {filename}")
-        print(f"[✓] Total passwords: {len(sorted_list)}")
+        print(f"[✓] Total passwords: {self.total}")
     
-    def print_statistics(self):
+    def print_statistics(self, file: TextIO = sys.stdout):
         """Print wordlist statistics"""
-        print("\\n" + "="*60)
-        print("  WORDLIST STATISTICS")
-        print("="*60)
-        print(f"Total passwords:     {len(self.wordlist)}")
+        print("\n" + "="*60, file=file)
+        print("  WORDLIST STATISTICS", file=file)
+        print("="*60, file=file)
+        print(f"Total passwords:     {self.total}", file=file)
         
-        # Length distribution
-        lengths = {}
-        for word in self.wordlist:
-            length = len(word)
-            lengths[length] = lengths.get(length, 0) + 1
+        print("\nLength distribution:", file=file)
+        for length in sorted(self.lengths.keys())[:10]:  # Show first 10
+            print(f"  {length} chars: {self.lengths[length]} passwords", file=file)
         
-        print("\\nLength distribution:")
-        for length in sorted(lengths.keys())[:10]:  # Show first 10
-            print(f"  {length} chars: {lengths[length]} passwords")
+        print("="*60 + "\n", file=file)
+
+def unique(candidates: Iterable[str]) -> Iterator[str]:
+    """Drop repeats within a bounded stream (e.g. one word's expansion)"""
+    seen = set()
+    for word in candidates:
+        if word not in seen:
+            seen.add(word)
+            yield word
+
+def shard_path(output: str, index: int) -> str:
+    path = Path(output)
+    return str(path.with_name(f"{path.stem}.{index:03d}{path.suffix}"))
+
+def plan_shards(output: str,
+                shards: int,
+                rule_count: int,
+                base_file: Optional[str] = None,
+                masks: Iterable[str] = ()) -> List[Dict]:
+    """Deterministic shard boundaries for a parallel run
+    
+    Boundaries depend only on the inputs and the shard count, never on the
+    number of workers or on timing, so a run is reproducible. With a
+    plain base-word file every shard gets a line-aligned byte range of it
+    and all rules; otherwise (no file, or a compressed one that cannot be
+    split) the rule list is split into contiguous ranges.
+    Mask keyspaces are split into even index slices. Shard 0 also carries
+    everything that is not split (the competition words and fixed extras,
+    and their leet variants when the rules are split).
+    """
+    plan = []
+    split_words = bool(base_file) and not is_compressed(base_file)
+    size = os.path.getsize(base_file) if split_words else 0
+    for i in range(shards):
+        if split_words:
+            rule_range = (0, rule_count)
+            byte_range = (size * i // shards, size * (i + 1) // shards)
+        else:
+            rule_range = (rule_count * i // shards, rule_count * (i + 1) // shards)
+            byte_range = None
+        plan.append({
+            'index': i,
+            'path': shard_path(output, i),
+            'rule_range': rule_range,
+            'byte_range': byte_range,
+            'masks': [(mask, i, shards) for mask in masks],
+            'first': i == 0,
+        })
+    return plan
+
+def _generate_shard(shard: Dict, rule_files: Optional[List[str]], max_leet_variants: int,
+                    competition: Tuple[str, str, int], base_file: Optional[str]) -> Dict:
+    """Worker: write one shard file and return its statistics"""
+    from password_analyzer import iter_passwords
+    from password_audit import iter_byte_range
+    
+    start = time.perf_counter()
+    split_words = shard['byte_range'] is not None
+    
+    # Leet variants are per word: split words keep them, split rules leave them to shard 0
+    leet = max_leet_variants if split_words or shard['first'] else 0
+    generator = WordlistGenerator(rule_files, leet, quiet=True)
+    rule_start, rule_end = shard['rule_range']
+    generator.rules = RuleSet(generator.rules.rules[rule_start:rule_end])
+    
+    stages = []
+    if shard['first']:
+        stages.append(generator.generate_competition_wordlist(*competition))
+    elif not split_words:
+        stages.append(generator.expand_words(generator.competition_base_words(*competition[:2])))
+    if base_file:
+        words = iter_byte_range(base_file, *shard['byte_range']) if split_words else iter_passwords(base_file)
+        stages.append(generator.expand_words(words))
+    
+    for mask, part, parts in shard['masks']:
+        masks = MaskGenerator(mask)
+        stages.append(masks.iter_range(*masks.slice_bounds(part, parts)))
+    
+    with open_wordlist(shard['path'], 'w') as f:
+        generator.write_wordlist(itertools.chain(*stages), f)
+    
+    return {
+        'index': shard['index'],
+        'path': shard['path'],
+        'total': generator.total,
+        'lengths': generator.lengths,
+        'seconds': time.perf_counter() - start,
+    }
+
+def generate_parallel(generator: WordlistGenerator,
+                      output: str,
+                      competition: Tuple[str, str, int],
+                      rule_files: Optional[List[str]] = None,
+                      base_file: Optional[str] = None,
+                      masks: Iterable[str] = (),
+                      shards: int = 16,
+                      workers: int = 0,
+                      merge: bool = False,
+                      console: TextIO = sys.stdout) -> List[str]:
+    """Generate shard files on a process pool; returns the shard paths
+    
+    Each worker writes its own shard file, so nothing is funneled through
+    the parent. With merge=True the shards are merged and deduplicated
+    into output (see wordlist_merger.py) and then removed.
+    """
+    workers = workers or os.cpu_count() or 1
+    plan = plan_shards(output, shards, len(generator.rules), base_file, masks)
+    start = time.perf_counter()
+    done = 0
+    
+    print(f"[*] {len(plan)} shard(s) on {workers} worker(s)", file=console)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_generate_shard, shard, rule_files, generator.max_leet_variants,
+                               competition, base_file) for shard in plan]
+        for future in as_completed(futures):
+            result = future.result()
+            done += 1
+            generator.total += result['total']
+            for length, count in result['lengths'].items():
+                generator.lengths[length] = generator.lengths.get(length, 0) + count
+            elapsed = time.perf_counter() - start
+            print(f"    [{done}/{len(plan)}] shard {result['index']:03d}: {result['total']:,} candidates "
+                  f"in {result['seconds']:.1f}s ({generator.total / elapsed:,.0f}/s overall)", file=console)
+    
+    paths = [shard['path'] for shard in plan]
+    if merge:
+        from wordlist_merger import merge_wordlists
         
-        print("="*60 + "\\n")
+        print(f"[*] Merging shards into: {output}", file=console)
+        with open_wordlist(output, 'w') as out:
+            _, unique_count = merge_wordlists(paths, out, tmpdir=str(Path(output).resolve().parent))
+        for path in paths:
+            os.remove(path)
+        print(f"[✓] {unique_count:,} unique candidates after merge", file=console)
+        return [output]
+    
+    print(f"[✓] Shards written: {paths[0]} .. {paths[-1]}", file=console)
+    return paths
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Competition wordlist generator")
+    parser.add_argument("institution", nargs="?", help="institution name (prompted if omitted)")
+    parser.add_argument("team_name", nargs="?", help="team name (prompted if omitted)")
+    parser.add_argument("year", nargs="?", type=int, help="year (prompted if omitted)")
+    parser.add_argument("output", nargs="?", help="output file, '-' for stdout (default: <institution>_wordlist.txt)")
+    parser.add_argument("rules", nargs="*", help="rule files or built-in rule names (default: %s)" % ' '.join(DEFAULT_RULES))
+    parser.add_argument("--full-leet", type=int, nargs="?", const=256, default=0, metavar="MAX",
+                        help="add combinatorial leet variants, up to MAX per word (default: 256)")
+    parser.add_argument("--mask", action="append", default=[],
+                        help="append a mask attack keyspace, e.g. ?d?d?d?d?d?d (repeatable)")
+    parser.add_argument("--base-words", metavar="FILE",
+                        help="also expand every word of FILE with the rules")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="generate in parallel shards on N processes (0 = serial)")
+    parser.add_argument("--shards", type=int, default=16,
+                        help="number of shard files in parallel mode (fixed for reproducible output)")
+    parser.add_argument("--merge", action="store_true",
+                        help="merge and deduplicate the shards into the output file")
+    return parser.parse_args(argv)
 
 def main():
+    args = parse_args()
+    
+    # With '-' as output the wordlist goes to stdout (e.g. john --stdin),
+    # so everything else goes to stderr
+    to_stdout = args.output == '-'
+    console = sys.stderr if to_stdout else sys.stdout
+    
     print("""
 ╔═══════════════════════════════════════════════════════════╗
 ║      CUSTOM WORDLIST GENERATOR - Competition Tool         ║
 ╚═══════════════════════════════════════════════════════════╝
-    """)
+    """, file=console)
     
-    generator = WordlistGenerator()
+    generator = WordlistGenerator(args.rules or None, args.full_leet)
     
     # Get parameters
-    if len(sys.argv) > 1:
-        institution = sys.argv[1]
+    if args.institution is not None:
+        institution = args.institution
     else:
         institution = input("Enter institution name (default: suffolk): ").strip() or "suffolk"
     
-    if len(sys.argv) > 2:
-        team_name = sys.argv[2]
+    if args.team_name is not None:
+        team_name = args.team_name
     else:
         team_name = input("Enter team name (optional): ").strip()
     
-    if len(sys.argv) > 3:
-        year = int(sys.argv[3])
+    if args.year is not None:
+        year = args.year
     else:
         year_input = input("Enter year (default: 1906): ").strip()
         year = int(year_input) if year_input else 1906
     
-    # Generate wordlist
-    generator.generate_competition_wordlist(institution, team_name, year)
+    output_file = args.output or f"{institution}_wordlist.txt"
     
-    # Print statistics
-    generator.print_statistics()
+    print("[*] Generating competition-specific wordlist...", file=console)
+    
+    # Parallel: one shard file per worker task
+    if args.workers:
+        if to_stdout:
+            print("[!] Parallel mode needs an output file", file=sys.stderr)
+            sys.exit(1)
+        generate_parallel(generator, output_file, (institution, team_name, year), args.rules or None,
+                          args.base_words, args.mask, args.shards, args.workers, args.merge, console)
+        generator.print_statistics(console)
+        return
     
-    # Save to file
-    output_file = f"{institution}_wordlist.txt"
-    generator.save_wordlist(output_file)
+    # Generate and stream to file
+    candidates = generator.generate_competition_wordlist(institution, team_name, year)
+    if args.base_words:
+        from password_analyzer import iter_passwords
+        candidates = itertools.chain(candidates, generator.expand_words(iter_passwords(args.base_words)))
+    if args.mask:
+        candidates = itertools.chain(candidates, *(MaskGenerator(mask).iter_range() for mask in args.mask))
+    generator.save_wordlist(candidates, output_file)
+    
+    # Print statistics
+    generator.print_statistics(console)
     
-    print(f"\\n[✓] Use this wordlist with John the Ripper:")
-    print(f"    john --wordlist={output_file} hash.txt")
+    if not to_stdout:
+        print(f"[✓] Use this wordlist with John the Ripper:")
+        print(f"    john --wordlist={output_file} hash.txt")
 
 if __name__ == "__main__":
     main()
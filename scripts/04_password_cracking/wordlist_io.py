@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Wordlist I/O
+Opens wordlists for streaming by path: plain text, gzip, xz or bzip2 chosen
+from the file extension, or '-' for stdin/stdout
+"""
+
+import bz2
+import sys
+import gzip
+import lzma
+from pathlib import Path
+from typing import Iterator, Optional, TextIO
+
+BUFFER_SIZE = 1 << 20
+
+# Shipped wordlists, which carry '#' comment lines
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+WORDLIST_DIR = REPO_ROOT / "configs" / "wordlists"
+
+# Extension -> text-mode opener for transparently compressed wordlists
+COMPRESSORS = {
+    '.gz': lambda path, mode, **text: gzip.open(path, mode, compresslevel=6, **text),
+    '.xz': lambda path, mode, **text: lzma.open(path, mode, **text),
+    '.bz2': lambda path, mode, **text: bz2.open(path, mode, **text),
+}
+
+def is_compressed(path) -> bool:
+    return str(path).endswith(tuple(COMPRESSORS))
+
+def open_wordlist(path, mode: str = 'r') -> TextIO:
+    """Text stream over a wordlist for reading ('r') or writing ('w'/'a')
+    
+    Reads replace undecodable bytes and keep line terminators, so callers
+    strip only '\\r\\n'. '-' wraps stdin or stdout without closing it.
+    """
+    path = str(path)
+    if mode not in ('r', 'w', 'a'):
+        raise ValueError(f"Unsupported mode: {mode}")
+    text = {'encoding': 'utf-8', 'errors': 'replace' if mode == 'r' else 'strict', 'newline': ''}
+    
+    if path == '-':
+        fd = sys.stdin.fileno() if mode == 'r' else sys.stdout.fileno()
+        return open(fd, mode, buffering=BUFFER_SIZE, closefd=False, **text)
+    
+    for suffix, opener in COMPRESSORS.items():
+        if path.endswith(suffix):
+            return opener(path, mode + 't', **text)
+    
+    return open(path, mode, buffering=BUFFER_SIZE, **text)
+
+def iter_passwords(source) -> Iterator[str]:
+    """Stream passwords one per line, stripping only the line terminator"""
+    with open_wordlist(source, 'r') as f:
+        for line in f:
+            yield line.rstrip('\r\n')
+
+def is_shipped_wordlist(path) -> bool:
+    return str(path) != '-' and Path(path).resolve().parent == WORDLIST_DIR
+
+def iter_words(source, comments: Optional[bool] = None) -> Iterator[str]:
+    """Non-empty lines of a wordlist, stripping only the line terminator
+    
+    Lines starting with '#' are skipped as comments when comments is True.
+    By default that applies to the shipped wordlists in configs/wordlists
+    only: password dumps contain real passwords starting with '#'.
+    """
+    if comments is None:
+        comments = is_shipped_wordlist(source)
+    for word in iter_passwords(source):
+        if word and not (comments and word.startswith('#')):
+            yield word
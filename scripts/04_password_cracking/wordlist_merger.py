@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Wordlist Merger
+Merges and deduplicates wordlists of any size in bounded memory using
+external sorting, optionally keeping first-seen (priority) order
+"""
+
+import os
+import sys
+import heapq
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from wordlist_io import iter_words, open_wordlist
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_SOURCES = sorted((REPO_ROOT / "configs" / "wordlists").glob("*.txt"))
+
+RUN_SIZE = 2_000_000          # words sorted in memory per run
+MAX_FAN_IN = 128              # run files open at once during a merge
+BUCKET_BYTES = 256 << 20      # ordered mode: largest bucket deduped in memory
+MAX_BUCKET_DEPTH = 4          # ordered mode: re-partitioning passes per bucket
+
+def _open_run(path: str, mode: str) -> TextIO:
+    return open(path, mode, encoding='utf-8', newline='', buffering=1 << 20)
+
+def _read_run(path: str) -> Iterator[str]:
+    with _open_run(path, 'r') as f:
+        for line in f:
+            yield line[:-1]
+
+def _write_run(lines: Iterable[str], tmpdir: str) -> str:
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmpdir)
+    os.close(fd)
+    with _open_run(path, 'w') as f:
+        for line in lines:
+            f.write(line + '\n')
+    return path
+
+def _merge_runs(runs: List[str], tmpdir: str, key=None) -> Iterator[str]:
+    """k-way merge of sorted run files
+    
+    When there are more runs than MAX_FAN_IN, groups are first merged into
+    intermediate runs so the number of open files stays bounded.
+    """
+    while len(runs) > MAX_FAN_IN:
+        merged = []
+        for i in range(0, len(runs), MAX_FAN_IN):
+            group = runs[i:i + MAX_FAN_IN]
+            merged.append(_write_run(heapq.merge(*(_read_run(run) for run in group), key=key), tmpdir))
+            for run in group:
+                os.remove(run)
+        runs = merged
+    return heapq.merge(*(_read_run(run) for run in runs), key=key)
+
+def iter_sources(sources: Iterable[str]) -> Iterator[str]:
+    """Non-empty words from every source, in order (shipped wordlists
+    without their '#' comment lines)"""
+    for source in sources:
+        yield from iter_words(source)
+
+def merge_sorted(words: Iterable[str], tmpdir: str, run_size: int = RUN_SIZE) -> Iterator[str]:
+    """Unique words in sorted (code point / byte) order
+    
+    Words are deduplicated and sorted in runs of run_size, spilled to
+    temporary files, then k-way merged with adjacent duplicates dropped.
+    Memory is bounded by run_size regardless of input size; the output is
+    the same as `LC_ALL=C sort -u`.
+    """
+    runs = []
+    pending = set()
+    for word in words:
+        pending.add(word)
+        if len(pending) >= run_size:
+            runs.append(_write_run(sorted(pending), tmpdir))
+            pending = set()
+    if pending or not runs:
+        runs.append(_write_run(sorted(pending), tmpdir))
+    
+    last = None
+    for word in _merge_runs(runs, tmpdir):
+        if word != last:
+            yield word
+            last = word
+
+def _sequence_key(line: str) -> int:
+    return int(line[:line.index('\t')])
+
+def _partition(lines: Iterable[Tuple[int, str]], tmpdir: str, buckets: int, salt: int) -> List[str]:
+    """Spread (sequence, word) pairs over bucket files by hash of the word"""
+    paths = []
+    files = []
+    for _ in range(buckets):
+        fd, path = tempfile.mkstemp(suffix='.bucket', dir=tmpdir)
+        os.close(fd)
+        paths.append(path)
+        files.append(_open_run(path, 'w'))
+    
+    try:
+        for seq, word in lines:
+            files[hash((salt, word)) % buckets].write(f"{seq}\t{word}\n")
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+def _read_bucket(path: str) -> Iterator[Tuple[int, str]]:
+    for line in _read_run(path):
+        seq, word = line.split('\t', 1)
+        yield int(seq), word
+
+def _dedup_bucket(path: str, tmpdir: str, buckets: int, depth: int = 0) -> str:
+    """Keep the first occurrence of each word in a bucket
+    
+    Every copy of a word hashes to the same bucket, so a bucket can be
+    deduplicated on its own. Buckets too large for memory are partitioned
+    again with a different hash salt. Returns a run sorted by sequence.
+    """
+    if os.path.getsize(path) > BUCKET_BYTES and depth < MAX_BUCKET_DEPTH:
+        parts = _partition(_read_bucket(path), tmpdir, buckets, depth + 1)
+        os.remove(path)
+        runs = [_dedup_bucket(part, tmpdir, buckets, depth + 1) for part in parts]
+        return _write_run(_merge_runs(runs, tmpdir, key=_sequence_key), tmpdir)
+    
+    first = {}
+    for seq, word in _read_bucket(path):
+        if word not in first:
+            first[word] = seq
+    os.remove(path)
+    
+    return _write_run((f"{seq}\t{word}" for seq, word in
+                       sorted((seq, word) for word, seq in first.items())), tmpdir)
+
+def merge_ordered(words: Iterable[str], tmpdir: str, buckets: int = 64) -> Iterator[str]:
+    """Unique words in first-seen order
+    
+    A disk-backed hash set: every word is tagged with its position and
+    hash-partitioned into bucket files, each bucket is deduplicated in
+    memory keeping the earliest position, and the buckets are merged back
+    by position. Earlier sources therefore keep priority over later ones.
+    """
+    parts = _partition(enumerate(words), tmpdir, buckets, 0)
+    runs = [_dedup_bucket(part, tmpdir, buckets) for part in parts]
+    for line in _merge_runs(runs, tmpdir, key=_sequence_key):
+        yield line[line.index('\t') + 1:]
+
+def merge_wordlists(sources: Iterable[str],
+                    out: TextIO,
+                    ordered: bool = False,
+                    tmpdir: Optional[str] = None,
+                    run_size: int = RUN_SIZE) -> Tuple[int, int]:
+    """Merge sources into out without duplicates; returns (words in, words out)"""
+    counter = {'in': 0}
+    
+    def counted(words):
+        for word in words:
+            counter['in'] += 1
+            yield word
+    
+    written = 0
+    with tempfile.TemporaryDirectory(dir=tmpdir) as workdir:
+        words = counted(iter_sources(sources))
+        merged = merge_ordered(words, workdir) if ordered else merge_sorted(words, workdir, run_size)
+        for word in merged:
+            out.write(word + '\n')
+            written += 1
+    return counter['in'], written
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge and deduplicate wordlists in bounded memory")
+    parser.add_argument("sources", nargs="*", help="wordlists (.gz/.xz/.bz2 or '-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file, .gz/.xz/.bz2 compressed (default: stdout)")
+    parser.add_argument("--with-defaults", action="store_true",
+                        help="merge configs/wordlists/*.txt ahead of the given sources")
+    parser.add_argument("--ordered", action="store_true",
+                        help="keep first-seen order instead of sorting")
+    parser.add_argument("--run-size", type=int, default=RUN_SIZE, help="words sorted in memory per run")
+    parser.add_argument("--tmpdir", help="directory for temporary run files")
+    args = parser.parse_args()
+    
+    sources = [str(path) for path in DEFAULT_SOURCES] if args.with_defaults or not args.sources else []
+    sources += args.sources
+    
+    # Messages go to stderr so the wordlist can be piped from stdout
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║          WORDLIST MERGER - Competition Tool               ║
+╚═══════════════════════════════════════════════════════════╝
+    """, file=sys.stderr)
+    for source in sources:
+        print(f"[*] Source: {source}", file=sys.stderr)
+    
+    out = open_wordlist(args.output, 'w')
+    tmpdir = args.tmpdir
+    if args.output != '-' and not tmpdir:
+        tmpdir = str(Path(args.output).resolve().parent)
+    
+    with out:
+        total, unique = merge_wordlists(sources, out, args.ordered, tmpdir, args.run_size)
+    
+    print(f"[✓] {total:,} words read, {unique:,} unique, "
+          f"{total - unique:,} duplicates removed", file=sys.stderr)
+    if args.output != '-':
+        print(f"[✓] Wordlist saved to: {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+ZIP Password Cracker
+Multi-core dictionary attack on encrypted ZIP archives (ZipCrypto and
+WinZip AES) with cheap header checks before full verification
+"""
+
+import os
+import sys
+import hmac
+import time
+import struct
+import hashlib
+import zipfile
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from password_analyzer import iter_chunks, iter_passwords
+from hash_cracker import open_competition_logger
+from rule_engine import RuleSet
+from crack_session import WordlistCursor, add_session_arguments, open_session
+
+LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+LOCAL_HEADER_SIGNATURE = 0x04034b50
+FLAG_ENCRYPTED = 0x01
+FLAG_DATA_DESCRIPTOR = 0x08
+AES_METHOD = 99
+AES_EXTRA_ID = 0x9901
+AES_SALT_LENGTH = {1: 8, 2: 12, 3: 16}
+AES_KEY_LENGTH = {1: 16, 2: 24, 3: 32}
+AES_ITERATIONS = 1000
+AES_AUTH_LENGTH = 10
+
+def _crc_table() -> List[int]:
+    table = []
+    for n in range(256):
+        c = n
+        for _ in range(8):
+            c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+        table.append(c)
+    return table
+
+CRC_TABLE = _crc_table()
+
+class ZipTargetError(ValueError):
+    """Raised for archives with nothing to crack"""
+
+def _aes_extra(extra: bytes) -> Optional[int]:
+    """AES strength (1-3) from a WinZip AES extra field, or None"""
+    i = 0
+    while i + 4 <= len(extra):
+        header_id, size = struct.unpack_from('<HH', extra, i)
+        if header_id == AES_EXTRA_ID and size >= 7:
+            return extra[i + 8]
+        i += 4 + size
+    return None
+
+def load_zip_target(path: str) -> Dict:
+    """Encrypted entries of an archive with the bytes needed for the checks
+    
+    Only the central directory and the few bytes at the start of each
+    encrypted entry are read. ZipCrypto entries keep their 12-byte
+    encryption header and check byte; AES entries keep their salt and
+    password verification value plus the offsets needed for the HMAC.
+    """
+    entries = []
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if not info.flag_bits & FLAG_ENCRYPTED:
+                continue
+            f.seek(info.header_offset)
+            fields = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+            if fields[0] != LOCAL_HEADER_SIGNATURE:
+                raise ZipTargetError(f"Bad local header for {info.filename}")
+            flags, mod_time, name_length, extra_length = fields[2], fields[4], fields[9], fields[10]
+            f.seek(name_length, os.SEEK_CUR)
+            local_extra = f.read(extra_length)
+            data_offset = f.tell()
+            
+            if info.compress_type == AES_METHOD:
+                strength = _aes_extra(local_extra) or _aes_extra(info.extra)
+                if strength not in AES_SALT_LENGTH:
+                    raise ZipTargetError(f"Unsupported AES strength for {info.filename}")
+                salt_length = AES_SALT_LENGTH[strength]
+                head = f.read(salt_length + 2)
+                entries.append({
+                    'type': 'aes',
+                    'name': info.filename,
+                    'size': info.compress_size,
+                    'strength': strength,
+                    'salt': head[:salt_length],
+                    'verifier': head[salt_length:],
+                    'data_offset': data_offset + salt_length + 2,
+                    'data_length': info.compress_size - salt_length - 2 - AES_AUTH_LENGTH,
+                })
+            else:
+                check = (mod_time >> 8) & 0xFF if flags & FLAG_DATA_DESCRIPTOR else info.CRC >> 24
+                entries.append({
+                    'type': 'zipcrypto',
+                    'name': info.filename,
+                    'size': info.compress_size,
+                    'header': f.read(12),
+                    'check': check,
+                })
+    
+    if not entries:
+        raise ZipTargetError(f"No encrypted entries in {path}")
+    
+    # Verify against the cheapest kind, smallest entry first
+    zipcrypto = sorted((e for e in entries if e['type'] == 'zipcrypto'), key=lambda e: e['size'])
+    aes = sorted((e for e in entries if e['type'] == 'aes'), key=lambda e: e['size'])
+    return {'path': str(path), 'zipcrypto': zipcrypto, 'aes': aes}
+
+def zipcrypto_header_ok(password: bytes, header: bytes, check: int) -> bool:
+    """Decrypt the 12-byte encryption header; True if its last byte matches
+    
+    Passes for the right password and for about 1 in 256 wrong ones.
+    """
+    crc = CRC_TABLE
+    k0, k1, k2 = 0x12345678, 0x23456789, 0x34567890
+    for c in password:
+        k0 = (k0 >> 8) ^ crc[(k0 ^ c) & 0xFF]
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = (k2 >> 8) ^ crc[(k2 ^ (k1 >> 24)) & 0xFF]
+    for b in header[:11]:
+        t = k2 | 2
+        c = b ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+        k0 = (k0 >> 8) ^ crc[(k0 ^ c) & 0xFF]
+        k1 = ((k1 + (k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        k2 = (k2 >> 8) ^ crc[(k2 ^ (k1 >> 24)) & 0xFF]
+    t = k2 | 2
+    return header[11] ^ (((t * (t ^ 1)) >> 8) & 0xFF) == check
+
+def aes_keys(password: bytes, entry: Dict) -> Tuple[bytes, bytes, bytes]:
+    """(encryption key, authentication key, verifier) for a WinZip AES entry"""
+    key_length = AES_KEY_LENGTH[entry['strength']]
+    derived = hashlib.pbkdf2_hmac('sha1', password, entry['salt'], AES_ITERATIONS, 2 * key_length + 2)
+    return derived[:key_length], derived[key_length:2 * key_length], derived[2 * key_length:]
+
+def verify_zipcrypto(path: str, entry: Dict, password: bytes) -> bool:
+    """Full check: decrypt and decompress the entry and compare its CRC"""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            archive.open(entry['name'], pwd=password).read()
+        return True
+    except Exception:
+        # Bad CRC (BadZipFile), or zlib/bz2/lzma errors from decompressing garbage
+        return False
+
+def verify_aes(path: str, entry: Dict, auth_key: bytes) -> bool:
+    """Full check: HMAC-SHA1 of the encrypted data against the stored code"""
+    mac = hmac.new(auth_key, digestmod=hashlib.sha1)
+    with open(path, 'rb') as f:
+        f.seek(entry['data_offset'])
+        remaining = entry['data_length']
+        while remaining > 0:
+            block = f.read(min(remaining, 1 << 20))
+            if not block:
+                return False
+            mac.update(block)
+            remaining -= len(block)
+        stored = f.read(AES_AUTH_LENGTH)
+    return hmac.compare_digest(mac.digest()[:AES_AUTH_LENGTH], stored)
+
+# Worker state, set once per process
+_worker_target = None
+_worker_rules = None
+
+def _init_worker(target: Dict, rule_files: Optional[List[str]] = None):
+    global _worker_target, _worker_rules
+    _worker_target = target
+    _worker_rules = RuleSet.from_files(*rule_files, quiet=True) if rule_files else None
+
+def _crack_batch(words: List[str]) -> Tuple[Optional[str], int]:
+    """Try a batch of passwords; returns (password or None, candidates tried)"""
+    target = _worker_target
+    candidates = _worker_rules.apply_stream(words) if _worker_rules else words
+    tried = 0
+    
+    if target['zipcrypto']:
+        entries = target['zipcrypto']
+        first = entries[0]
+        header, check = first['header'], first['check']
+        others = [(e['header'], e['check']) for e in entries[1:]]
+        for candidate in candidates:
+            tried += 1
+            password = candidate.encode('utf-8', 'replace')
+            if not zipcrypto_header_ok(password, header, check):
+                continue
+            if all(zipcrypto_header_ok(password, h, c) for h, c in others) and \
+                    verify_zipcrypto(target['path'], first, password):
+                return candidate, tried
+        return None, tried
+    
+    entry = target['aes'][0]
+    verifier = entry['verifier']
+    for candidate in candidates:
+        tried += 1
+        password = candidate.encode('utf-8', 'replace')
+        _, auth_key, value = aes_keys(password, entry)
+        if value == verifier and verify_aes(target['path'], entry, auth_key):
+            return candidate, tried
+    return None, tried
+
+def crack_zip(target: Dict,
+              words: Iterable[str],
+              workers: int = 0,
+              batch_size: int = 5000,
+              rule_files: Optional[List[str]] = None,
+              progress: bool = True,
+              on_checkpoint=None) -> Dict:
+    """Dictionary attack on one archive; stops at the first verified password
+    
+    When words is a WordlistCursor, on_checkpoint(position, stats) is called
+    after each batch is checked, as in hash_cracker.crack.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {'password': None, 'tried': 0, 'seconds': 0.0}
+    start = time.perf_counter()
+    last_report = start
+    
+    def consume(result, position=None):
+        nonlocal last_report
+        password, tried = result
+        stats['tried'] += tried
+        if password is not None and stats['password'] is None:
+            stats['password'] = password
+        now = time.perf_counter()
+        if progress and now - last_report >= 5:
+            last_report = now
+            print(f"[*] {stats['tried']:,} passwords tried, "
+                  f"{stats['tried'] / (now - start):,.0f}/s", file=sys.stderr)
+        if on_checkpoint and position is not None:
+            on_checkpoint(position, stats)
+    
+    batches = iter_chunks(iter(words), batch_size)
+    if workers == 1:
+        _init_worker(target, rule_files)
+        for batch in batches:
+            consume(_crack_batch(batch), getattr(words, 'position', None))
+            if stats['password'] is not None:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(target, rule_files)) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append((pool.submit(_crack_batch, batch), getattr(words, 'position', None)))
+                if len(pending) >= workers * 2:
+                    future, position = pending.popleft()
+                    consume(future.result(), position)
+                    if stats['password'] is not None:
+                        break
+            while pending:
+                future, position = pending.popleft()
+                if stats['password'] is not None:
+                    future.cancel()
+                else:
+                    consume(future.result(), position)
+    
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║          ZIP PASSWORD CRACKER - Competition Tool          ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    parser = argparse.ArgumentParser(description="Dictionary attack on encrypted ZIP archives")
+    parser.add_argument("archive", help="encrypted .zip file (ZipCrypto or WinZip AES)")
+    parser.add_argument("wordlist", help="wordlist (.gz/.xz/.bz2 or '-' for a generator on stdin)")
+    parser.add_argument("--rules", nargs="+", metavar="RULES", help="apply rule files in the workers")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="passwords per worker batch")
+    parser.add_argument("--log", default="competition_log.json", help="competition log file")
+    parser.add_argument("--no-log", action="store_true", help="do not record the find in the competition log")
+    add_session_arguments(parser)
+    args, session = open_session(parser)
+    
+    try:
+        target = load_zip_target(args.archive)
+    except (ZipTargetError, zipfile.BadZipFile) as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+    
+    method = "ZipCrypto" if target['zipcrypto'] else f"AES-{AES_KEY_LENGTH[target['aes'][0]['strength']] * 8}"
+    print(f"[*] Archive:  {args.archive}")
+    print(f"[*] Entries:  {len(target['zipcrypto'])} ZipCrypto, {len(target['aes'])} AES (attacking {method})")
+    print(f"[*] Wordlist: {args.wordlist}")
+    if args.rules:
+        # Loaded here once so unsupported rules are reported before the workers start
+        print(f"[*] Rules:    {len(RuleSet.from_files(*args.rules)):,} rule(s)")
+    
+    if session:
+        words = WordlistCursor(args.wordlist, session.state['position'])
+        tried = session.state['tried']
+        if words.position:
+            print(f"[*] Resuming at {'byte' if words.seekable else 'line'} {words.position:,}")
+        
+        def on_checkpoint(position, stats):
+            session.update(position=position, tried=tried + stats['tried'])
+    else:
+        words = iter_passwords(args.wordlist)
+        on_checkpoint = None
+    
+    try:
+        stats = crack_zip(target, words, args.workers, args.batch_size, args.rules,
+                          on_checkpoint=on_checkpoint)
+    except KeyboardInterrupt:
+        if session:
+            session.save()
+            print(f"\n[!] Interrupted; resume with --restore {session.name}")
+        sys.exit(130)
+    if session:
+        session.finish()
+    rate = stats['tried'] / stats['seconds'] if stats['seconds'] else 0
+    
+    if stats['password'] is None:
+        print(f"\n[✗] Password not found ({stats['tried']:,} tried in {stats['seconds']:.1f}s, {rate:,.0f}/s)")
+        sys.exit(1)
+    
+    print(f"\n[✓] PASSWORD FOUND: {stats['password']}")
+    print(f"[✓] {stats['tried']:,} tried in {stats['seconds']:.1f}s ({rate:,.0f}/s)")
+    if not args.no_log:
+        logger = open_competition_logger(args.log)
+        logger.log_password_crack(Path(args.archive).name, stats['password'],
+                                  f"{method} dictionary attack (zip_cracker.py)")
+
+if __name__ == "__main__":
+    main()
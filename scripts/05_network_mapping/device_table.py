@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Device Table
+Columnar, array-backed storage for network_map.json devices
+"""
+
+import sys
+import json
+import struct
+import socket
+import argparse
+import ipaddress
+from array import array
+from datetime import datetime, timedelta
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+# Keys of a device record, in network_map.json order
+DEVICE_FIELDS = ("ip", "mac", "hostname", "os", "os_confidence", "os_hints",
+                 "status", "open_ports", "vendor", "scan_time")
+# Keys of a HostDiscovery record
+DISCOVERY_FIELDS = ("ip", "mac", "hostname", "timestamp")
+
+STRING_FIELDS = ("hostname", "os", "vendor", "status")
+TIME_FIELDS = ("scan_time", "timestamp")
+UNKNOWN = "Unknown"
+NO_MAC = 1 << 48   # outside the 48-bit range
+NO_TIME = -(1 << 63)
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+IPV4 = struct.Struct('!I')
+
+class StringPool:
+    """Each distinct string stored once; columns hold its index"""
+    
+    def __init__(self):
+        self.strings: List[str] = [UNKNOWN, ""]
+        self.index: Dict[str, int] = {UNKNOWN: 0, "": 1}
+    
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        index = self.index.get(value)
+        if index is None:
+            index = self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+    
+    def __getitem__(self, index: int) -> str:
+        return self.strings[index]
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+
+def parse_mac(mac: Optional[str]) -> int:
+    """48-bit integer of 'aa:bb:..', 'AA-BB-..' or '0:c:29:..'; NO_MAC if not a MAC"""
+    if not mac:
+        return NO_MAC
+    if len(mac) != 17 or mac[2::3] not in (':::::', '-----'):
+        parts = mac.replace('-', ':').split(':')
+        if len(parts) != 6 or not all(0 < len(part) <= 2 for part in parts):
+            return NO_MAC
+        mac = ':'.join(part.zfill(2) for part in parts)
+    try:
+        return int.from_bytes(bytes.fromhex(mac[0:2] + mac[3:5] + mac[6:8] + mac[9:11] + mac[12:14] + mac[15:17]), 'big')
+    except ValueError:
+        return NO_MAC
+
+def format_mac(value: int) -> str:
+    if value == NO_MAC:
+        return UNKNOWN
+    return value.to_bytes(6, 'big').hex(':')
+
+def parse_time(value: Optional[str]) -> int:
+    """Microseconds of an ISO timestamp as written (no zone conversion); NO_TIME if unset"""
+    try:
+        return (datetime.fromisoformat(value).replace(tzinfo=None) - EPOCH) // MICROSECOND
+    except (TypeError, ValueError):
+        return NO_TIME
+
+def format_time(value: int) -> Optional[str]:
+    return None if value == NO_TIME else (EPOCH + value * MICROSECOND).isoformat()
+
+class DeviceRow(MutableMapping):
+    """A dict-like view of one table row; fields are read on access
+    
+    Writes go straight to the columns. Nested values (os_hints,
+    open_ports) are built per access, so replace them rather than
+    mutating them in place. A view follows its row position, which
+    DeviceTable.sort() changes.
+    """
+    
+    __slots__ = ("table", "row")
+    
+    def __init__(self, table: 'DeviceTable', row: int):
+        self.table = table
+        self.row = row
+    
+    def __getitem__(self, key: str):
+        return self.table.get_field(self.row, key)
+    
+    def __setitem__(self, key: str, value):
+        self.table.set_field(self.row, key, value)
+    
+    def __delitem__(self, key: str):
+        raise TypeError("device fields cannot be removed")
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.row_keys(self.row))
+    
+    def __len__(self) -> int:
+        return len(self.table.row_keys(self.row))
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class DeviceTable:
+    """Devices as parallel typed arrays instead of a list of dicts
+    
+    IPv4 addresses are 32-bit integers (IPv6 tables use two 64-bit
+    halves), MACs 48-bit integers, and hostname/os/vendor/status, port
+    services and banners are indexes into one StringPool. Open ports live
+    in flat port arrays addressed by per-row start and count; os_hints
+    are small typed columns. A row costs about 50 bytes plus 10 per open
+    port, so a million devices fit in tens of MB, and sort() orders them
+    numerically by address without building per-row records.
+    
+    Rows read and write through DeviceRow views, and iteration yields
+    views, so code written against the list of dicts keeps working. Keys
+    outside the table's fields are kept in a sparse per-row dict.
+    """
+    
+    def __init__(self, rows: Iterable[Mapping] = (), fields: Iterable[str] = DEVICE_FIELDS,
+                 version: int = 4):
+        if version not in (4, 6):
+            raise ValueError(f"IP version must be 4 or 6, not {version}")
+        self.fields = tuple(fields)
+        self.version = version
+        self.pool = StringPool()
+        
+        self.ip = array('I') if version == 4 else array('Q')   # IPv6: high 64 bits
+        self.ip_low = array('Q')                                # IPv6: low 64 bits
+        self.mac = array('Q')
+        self.text = {field: array('I') for field in STRING_FIELDS}   # pool indexes
+        self.confidence = array('B')   # percent
+        self.time = array('q')         # microseconds, NO_TIME when unset
+        self.ttl = array('B')          # os_hints; 0 = not observed
+        self.window = array('I')       # 0 = not observed
+        self.wscale = array('b')       # -1 = not observed
+        self.timestamps = array('b')   # -1 = not observed
+        self.port_start = array('I')
+        self.port_count = array('H')
+        self.ports = array('H')
+        self.port_service = array('I')
+        self.port_banner = array('I')  # 1 (the empty string) = no banner
+        self.extras: Dict[int, Dict] = {}
+        
+        # One dict lookup per field instead of a chain of comparisons
+        self._getters = {
+            "ip": self._get_ip,
+            "mac": lambda row: format_mac(self.mac[row]),
+            "os_confidence": lambda row: self.confidence[row] / 100,
+            "os_hints": self._hints,
+            "open_ports": self._ports,
+        }
+        self._setters = {
+            "ip": self._set_ip,
+            "mac": lambda row, value: self.mac.__setitem__(row, parse_mac(value)),
+            "os_confidence": self._set_confidence,
+            "os_hints": self._set_hints,
+            "open_ports": self._set_ports,
+        }
+        for field, column in self.text.items():
+            self._getters[field] = lambda row, column=column: self.pool.strings[column[row]]
+            self._setters[field] = lambda row, value, column=column: column.__setitem__(
+                row, self.pool.add(None if value is None else str(value)))
+        for field in TIME_FIELDS:
+            self._getters[field] = lambda row: format_time(self.time[row])
+            self._setters[field] = lambda row, value: self.time.__setitem__(row, parse_time(value))
+        
+        self._defaults = [(self.ip, 0), (self.mac, NO_MAC), *((c, 0) for c in self.text.values()),
+                          (self.confidence, 0), (self.time, NO_TIME), (self.ttl, 0), (self.window, 0),
+                          (self.wscale, -1), (self.timestamps, -1), (self.port_count, 0)]
+        if version == 6:
+            self._defaults.append((self.ip_low, 0))
+        
+        self.extend(rows)
+    
+    # --- building ---
+    
+    def append(self, device: Mapping) -> int:
+        """Add one device record; returns its row"""
+        row = len(self.mac)
+        if device.get("ip") is None:
+            raise ValueError("device has no IP address")
+        for column, default in self._defaults:
+            column.append(default)
+        self.port_start.append(len(self.ports))
+        
+        setters = self._setters
+        try:
+            for key, value in device.items():
+                setter = setters.get(key)
+                if setter is None:
+                    self.extras.setdefault(row, {})[key] = value
+                else:
+                    setter(row, value)
+        except Exception:   # bad value: drop the partial row
+            self._truncate(row)
+            raise
+        return row
+    
+    def extend(self, devices: Iterable[Mapping]):
+        for device in devices:
+            self.append(device)
+    
+    def _truncate(self, rows: int):
+        for column in self._row_columns():
+            del column[rows:]
+        self.extras.pop(rows, None)
+    
+    def _row_columns(self) -> List[array]:
+        return [column for column, _ in self._defaults] + [self.port_start]
+    
+    # --- field access ---
+    
+    def get_field(self, row: int, key: str):
+        getter = self._getters.get(key)
+        if getter is not None:
+            return getter(row)
+        extras = self.extras.get(row)
+        if extras is None or key not in extras:
+            raise KeyError(key)
+        return extras[key]
+    
+    def set_field(self, row: int, key: str, value):
+        setter = self._setters.get(key)
+        if setter is None:
+            self.extras.setdefault(row, {})[key] = value
+        else:
+            setter(row, value)
+    
+    def _get_ip(self, row: int) -> str:
+        if self.version == 4:
+            return socket.inet_ntoa(IPV4.pack(self.ip[row]))
+        return str(ipaddress.IPv6Address(self.ip[row] << 64 | self.ip_low[row]))
+    
+    def _set_ip(self, row: int, value: str):
+        if self.version == 4:
+            try:
+                self.ip[row] = IPV4.unpack(socket.inet_pton(socket.AF_INET, value))[0]
+            except (OSError, TypeError):
+                raise ValueError(f"{value!r} is not an IPv4 address") from None
+            return
+        address = ipaddress.ip_address(value)
+        if address.version != 6:
+            raise ValueError(f"{value!r} is not an IPv6 address")
+        self.ip[row], self.ip_low[row] = int(address) >> 64, int(address) & (1 << 64) - 1
+    
+    def _set_confidence(self, row: int, value: Optional[float]):
+        self.confidence[row] = max(0, min(100, round((value or 0) * 100)))
+    
+    def _set_hints(self, row: int, hints: Optional[Dict]):
+        hints = hints or {}
+        self.ttl[row] = hints.get("ttl") or 0
+        self.window[row] = hints.get("window") or 0
+        self.wscale[row] = -1 if hints.get("wscale") is None else hints["wscale"]
+        self.timestamps[row] = -1 if hints.get("timestamps") is None else int(hints["timestamps"])
+    
+    def row_keys(self, row: int) -> List[str]:
+        extras = self.extras.get(row)
+        return list(self.fields) + [k for k in extras if k not in self.fields] if extras else list(self.fields)
+    
+    def _hints(self, row: int) -> Dict:
+        hints = {}
+        if self.ttl[row]:
+            hints["ttl"] = self.ttl[row]
+        if self.window[row]:
+            hints["window"] = self.window[row]
+        if self.wscale[row] >= 0:
+            hints["wscale"] = self.wscale[row]
+        if self.timestamps[row] >= 0:
+            hints["timestamps"] = bool(self.timestamps[row])
+        return hints
+    
+    def _ports(self, row: int) -> List:
+        start = self.port_start[row]
+        entries = []
+        for i in range(start, start + self.port_count[row]):
+            entry = {"port": self.ports[i], "service": self.pool[self.port_service[i]]}
+            if self.port_banner[i] != 1:
+                entry["banner"] = self.pool[self.port_banner[i]]
+            entries.append(entry)
+        return entries
+    
+    def _set_ports(self, row: int, open_ports: Optional[List]):
+        # Replacing appends a new run; the old one is left unused
+        open_ports = open_ports or []
+        self.port_start[row] = len(self.ports)
+        self.port_count[row] = len(open_ports)
+        for entry in open_ports:
+            if not isinstance(entry, Mapping):
+                entry = {"port": entry}
+            self.ports.append(int(entry["port"]))
+            self.port_service.append(self.pool.add(entry.get("service")))
+            banner = entry.get("banner")
+            self.port_banner.append(1 if banner is None else self.pool.add(banner))
+    
+    # --- list-like access ---
+    
+    def __len__(self) -> int:
+        return len(self.mac)
+    
+    def __iter__(self) -> Iterator[DeviceRow]:
+        return (DeviceRow(self, row) for row in range(len(self)))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [DeviceRow(self, row) for row in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("device table index out of range")
+        return DeviceRow(self, index)
+    
+    def to_dict(self, row: int) -> Dict:
+        if row in self.extras:
+            return {key: self.get_field(row, key) for key in self.row_keys(row)}
+        getters = self._getters
+        return {key: getters[key](row) for key in self.fields}
+    
+    def iter_dicts(self) -> Iterator[Dict]:
+        """Plain dict per row, built one at a time"""
+        return (self.to_dict(row) for row in range(len(self)))
+    
+    def to_dicts(self) -> List[Dict]:
+        return list(self.iter_dicts())
+    
+    # --- ordering ---
+    
+    def sort(self):
+        """Order rows numerically by IP address (stable)"""
+        if self.version == 4:
+            order = sorted(range(len(self)), key=self.ip.__getitem__)
+        else:
+            order = sorted(range(len(self)), key=lambda row: (self.ip[row], self.ip_low[row]))
+        for column in self._row_columns():
+            column[:] = array(column.typecode, map(column.__getitem__, order))
+        if self.extras:
+            new_row = {old: new for new, old in enumerate(order) if old in self.extras}
+            self.extras = {new_row[old]: extras for old, extras in self.extras.items()}
+    
+    def nbytes(self) -> int:
+        """Bytes held by the columns and the string pool"""
+        columns = self._row_columns() + [self.ports, self.port_service, self.port_banner]
+        pooled = sum(sys.getsizeof(s) for s in self.pool.strings)
+        return sum(c.itemsize * len(c) for c in columns) + pooled + sys.getsizeof(self.pool.index)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a network map into a device table and report its size")
+    parser.add_argument("map_file", nargs="?", default="network_map.json", help="network map to load")
+    args = parser.parse_args()
+    
+    try:
+        with open(args.map_file, 'r') as f:
+            table = DeviceTable(json.load(f).get("devices", []))
+    except (OSError, ValueError) as e:
+        print(f"[!] Could not load {args.map_file}: {e}")
+        sys.exit(1)
+    
+    table.sort()
+    print(f"[✓] {len(table)} device(s), {len(table.pool)} distinct string(s), "
+          f"{table.nbytes() / 1e6:.2f} MB in columns")
+
+if __name__ == "__main__":
+    main()
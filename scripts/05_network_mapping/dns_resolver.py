@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Reverse DNS Resolver
+Concurrent PTR lookups over UDP with a persistent, TTL-aware cache
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import struct
+import asyncio
+import argparse
+import ipaddress
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE = REPO_ROOT / "configs" / "cache" / "dns_cache.json"
+
+DNS_HEADER = struct.Struct('!HHHHHH')   # id, flags, qd, an, ns, ar counts
+DNS_RECORD = struct.Struct('!HHIH')     # type, class, ttl, rdata length
+TYPE_PTR = 12
+TYPE_SOA = 6
+CLASS_IN = 1
+FLAG_RD = 0x0100
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+DEFAULT_TIMEOUT = 2.0
+ATTEMPTS = 2                 # sends per server within the timeout
+RECEIVE_BUFFER = 4 << 20     # room for a burst of replies to every query
+DEFAULT_NEGATIVE_TTL = 300   # when the answer carries no SOA
+MAX_INFLIGHT = 1024
+
+def parse_server(server: str) -> Tuple[str, int]:
+    """(host, port) from '192.168.0.1', '127.0.0.1:5353' or '[::1]:5353'"""
+    if server.startswith('['):
+        host, _, port = server[1:].partition(']')
+        return host, int(port.lstrip(':') or 53)
+    if server.count(':') == 1:
+        host, port = server.split(':')
+        return host, int(port)
+    return server, 53
+
+def system_nameservers(path: str = "/etc/resolv.conf") -> List[str]:
+    try:
+        with open(path, 'r') as f:
+            return [line.split()[1] for line in f
+                    if line.startswith("nameserver") and len(line.split()) > 1]
+    except OSError:
+        return []
+
+def encode_name(name: str) -> bytes:
+    labels = [label.encode('ascii') for label in name.rstrip('.').split('.')]
+    return b''.join(bytes([len(label)]) + label for label in labels) + b'\0'
+
+def read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """(name, offset after it) following compression pointers"""
+    labels = []
+    end = None
+    for _ in range(128):   # bounds pointer loops in hostile packets
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        offset += 1
+        if not length:
+            return '.'.join(labels), end if end is not None else offset
+        labels.append(data[offset:offset + length].decode('ascii', 'replace'))
+        offset += length
+    raise ValueError("DNS name compression loop")
+
+def build_query(query_id: int, question: bytes) -> bytes:
+    return DNS_HEADER.pack(query_id, FLAG_RD, 1, 0, 0, 0) + question
+
+def parse_response(data: bytes, question: bytes) -> Tuple[int, Optional[str], Optional[int]]:
+    """(rcode, PTR name or None, TTL) of a response to question
+    
+    TTL is the PTR record's for an answer; for NXDOMAIN/NODATA it is the
+    negative TTL from the SOA in the authority section (RFC 2308), or None
+    if the server sent no SOA.
+    """
+    _, flags, _, answers, authorities, _ = DNS_HEADER.unpack_from(data)
+    rcode = flags & 0x000F
+    offset = DNS_HEADER.size + len(question)
+    negative_ttl = None
+    
+    for index in range(answers + authorities):
+        _, offset = read_name(data, offset)
+        rtype, rclass, ttl, length = DNS_RECORD.unpack_from(data, offset)
+        offset += DNS_RECORD.size
+        if index < answers and rtype == TYPE_PTR and rclass == CLASS_IN:
+            return rcode, read_name(data, offset)[0], ttl
+        if index >= answers and rtype == TYPE_SOA:
+            _, soa = read_name(data, offset)
+            _, soa = read_name(data, soa)
+            minimum = struct.unpack_from('!5I', data, soa)[4]
+            negative_ttl = min(ttl, minimum)
+        offset += length
+    return rcode, None, negative_ttl
+
+class _DNSProtocol(asyncio.DatagramProtocol):
+    """One UDP socket per server; responses are matched to queries by ID"""
+    
+    def __init__(self):
+        self.pending = {}
+    
+    def datagram_received(self, data, addr):
+        if len(data) < DNS_HEADER.size:
+            return
+        future = self.pending.get(struct.unpack_from('!H', data)[0])
+        if future and not future.done():
+            future.set_result(data)
+    
+    def error_received(self, exc):
+        pass   # ICMP errors surface as query timeouts
+
+class ReverseResolver:
+    """PTR lookups for many addresses at once
+    
+    Every query is in flight at the same time (up to max_inflight) on one
+    socket per server, so resolving N addresses costs about one timeout
+    rather than N. Servers are tried in order when one times out or fails.
+    Answers are cached for their TTL and NXDOMAIN/NODATA for the SOA's
+    negative TTL; the cache is saved to disk so later runs skip known
+    addresses. Timeouts are not cached.
+    """
+    
+    def __init__(self, servers: Optional[Iterable[str]] = None,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 cache_file=DEFAULT_CACHE,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+                 max_inflight: int = MAX_INFLIGHT):
+        self.servers = [parse_server(s) for s in (servers or system_nameservers())]
+        self.timeout = timeout
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.negative_ttl = negative_ttl
+        self.max_inflight = max_inflight
+        self.cache = self._load_cache()
+        self._endpoints = {}
+        self._inflight = {}
+        self._semaphore = None
+        self.stats = {'cached': 0, 'answered': 0, 'negative': 0, 'failed': 0}
+    
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {ip: entry for ip, entry in cache.items() if entry.get('expires', 0) > now}
+    
+    def save(self):
+        """Write unexpired cache entries atomically"""
+        if not self.cache_file:
+            return
+        now = time.time()
+        live = {ip: entry for ip, entry in self.cache.items() if entry['expires'] > now}
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(live, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.cache_file)
+    
+    def cached(self, ip: str) -> Tuple[bool, Optional[str]]:
+        entry = self.cache.get(ip)
+        if entry and entry['expires'] > time.time():
+            return True, entry['name']
+        return False, None
+    
+    async def _endpoint(self, server: Tuple[str, int]) -> Tuple[asyncio.DatagramTransport, _DNSProtocol]:
+        # Creation is shared so concurrent first queries open one socket
+        if server not in self._endpoints:
+            loop = asyncio.get_running_loop()
+            self._endpoints[server] = asyncio.ensure_future(self._open(loop, server))
+        return await self._endpoints[server]
+    
+    @staticmethod
+    async def _open(loop, server):
+        transport, protocol = await loop.create_datagram_endpoint(_DNSProtocol, remote_addr=server)
+        # The default buffer holds only a few hundred replies; the rest of a
+        # large batch would be dropped by the kernel and time out
+        sock = transport.get_extra_info('socket')
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER)
+        except OSError:
+            pass
+        return transport, protocol
+    
+    async def _query(self, server: Tuple[str, int], name: str):
+        transport, protocol = await self._endpoint(server)
+        question = encode_name(name) + struct.pack('!HH', TYPE_PTR, CLASS_IN)
+        query_id = random.getrandbits(16)
+        while query_id in protocol.pending:
+            query_id = random.getrandbits(16)
+        
+        loop = asyncio.get_running_loop()
+        query = build_query(query_id, question)
+        future = protocol.pending[query_id] = loop.create_future()
+        deadline = loop.time() + self.timeout
+        try:
+            for attempt in range(ATTEMPTS):
+                transport.sendto(query)
+                wait_until = loop.time() + self.timeout / ATTEMPTS if attempt < ATTEMPTS - 1 else deadline
+                while True:
+                    try:
+                        data = await asyncio.wait_for(asyncio.shield(future), max(wait_until - loop.time(), 0))
+                    except asyncio.TimeoutError:
+                        break
+                    # Ignore stray replies that reuse the ID for another question
+                    if data[DNS_HEADER.size:DNS_HEADER.size + len(question)].lower() == question.lower():
+                        return parse_response(data, question)
+                    future = protocol.pending[query_id] = loop.create_future()
+            raise asyncio.TimeoutError
+        finally:
+            protocol.pending.pop(query_id, None)
+            future.cancel()
+    
+    async def _lookup(self, ip: str) -> Optional[str]:
+        name = ipaddress.ip_address(ip).reverse_pointer
+        async with self._semaphore:
+            for server in self.servers:
+                try:
+                    rcode, host, ttl = await self._query(server, name)
+                except (asyncio.TimeoutError, OSError, ValueError, struct.error, IndexError):
+                    continue
+                if rcode == RCODE_NOERROR and host:
+                    self.stats['answered'] += 1
+                    self.cache[ip] = {'name': host, 'expires': time.time() + ttl}
+                    return host
+                if rcode in (RCODE_NOERROR, RCODE_NXDOMAIN):
+                    self.stats['negative'] += 1
+                    ttl = self.negative_ttl if ttl is None else ttl
+                    self.cache[ip] = {'name': None, 'expires': time.time() + ttl}
+                    return None
+                # SERVFAIL/REFUSED: ask the next server
+        self.stats['failed'] += 1
+        return None
+    
+    async def resolve(self, ip: str) -> Optional[str]:
+        """Hostname for ip, or None; concurrent calls for one address share a query"""
+        hit, host = self.cached(ip)
+        if hit:
+            self.stats['cached'] += 1
+            return host
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+        if ip not in self._inflight:
+            self._inflight[ip] = asyncio.ensure_future(self._lookup(ip))
+        try:
+            return await asyncio.shield(self._inflight[ip])
+        finally:
+            if self._inflight.get(ip) is not None and self._inflight[ip].done():
+                del self._inflight[ip]
+    
+    async def resolve_many(self, ips: Iterable[str]) -> Dict[str, Optional[str]]:
+        ips = list(dict.fromkeys(ips))
+        names = await asyncio.gather(*(self.resolve(ip) for ip in ips))
+        return dict(zip(ips, names))
+    
+    def close(self):
+        """Close the sockets; required before the event loop ends"""
+        for endpoint in self._endpoints.values():
+            if endpoint.done() and not endpoint.exception():
+                endpoint.result()[0].close()
+        self._endpoints = {}
+        self._inflight = {}
+        self._semaphore = None
+    
+    def lookup(self, ips: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Synchronous resolve_many in its own event loop; saves the cache"""
+        async def run():
+            try:
+                return await self.resolve_many(ips)
+            finally:
+                self.close()
+        names = asyncio.run(run())
+        self.save()
+        return names
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent reverse DNS lookups with a persistent cache")
+    parser.add_argument("addresses", nargs="+", help="IP addresses (or @FILE with one per line)")
+    parser.add_argument("--server", action="append", help="DNS server, host[:port] (default: /etc/resolv.conf)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per server")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the cache")
+    args = parser.parse_args()
+    
+    ips = []
+    for item in args.addresses:
+        if item.startswith('@'):
+            with open(item[1:], 'r') as f:
+                ips.extend(line.strip() for line in f if line.strip())
+        else:
+            ips.append(item)
+    
+    resolver = ReverseResolver(args.server, args.timeout, None if args.no_cache else DEFAULT_CACHE)
+    if not resolver.servers:
+        print("[!] No DNS servers configured", file=sys.stderr)
+        sys.exit(1)
+    
+    start = time.perf_counter()
+    names = resolver.lookup(ips)
+    for ip in ips:
+        print(f"{ip:<40} {names[ip] or 'Unknown'}")
+    stats = resolver.stats
+    print(f"[✓] {len(names)} address(es) in {time.perf_counter() - start:.2f}s: {stats['answered']} answered, "
+          f"{stats['negative']} negative, {stats['failed']} failed, {stats['cached']} from cache", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,24 @@ Excel Network Map Generator
 Creates Excel spreadsheet with network mapping data
 """
 
-import json
 import csv
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from device_table import DeviceTable
+from map_stream import MapReader
+from service_scanner import format_ports
+
 class ExcelGenerator:
     def __init__(self):
-        self.devices = []
+        self.devices = DeviceTable()
     
     def load_from_json(self, json_file: str):
         """Load network data from JSON file"""
         try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-                self.devices = data.get('devices', [])
+            # Devices are streamed from the file on each pass, not held
+            self.devices = MapReader(json_file)
             print(f"[✓] Loaded {len(self.devices)} device(s) from {json_file}")
         except FileNotFoundError:
             print(f"[!] File not found: {json_file}")
@@ -34,6 +36,8 @@ class ExcelGenerator:
             "hostname": hostname,
             "os": os
         }
+        if not isinstance(self.devices, DeviceTable):
+            self.devices = DeviceTable(self.devices)
         self.devices.append(device)
     
     def generate_csv(self, filename: str = "Network_Mapping.csv"):
@@ -43,7 +47,7 @@ class ExcelGenerator:
             return
         
         # Define headers
-        headers = ["Computer Name", "IP Address", "MAC Address", "Operating System"]
+        headers = ["Computer Name", "IP Address", "MAC Address", "Operating System", "Open Ports"]
         
         try:
             with open(filename, 'w', newline='') as f:
@@ -58,7 +62,8 @@ class ExcelGenerator:
                         device.get('hostname', 'Unknown'),
                         device.get('ip', 'Unknown'),
                         device.get('mac', 'Unknown'),
-                        device.get('os', 'Unknown')
+                        device.get('os', 'Unknown'),
+                        format_ports(device.get('open_ports'))
                     ]
                     writer.writerow(row)
             
@@ -90,7 +95,10 @@ class ExcelGenerator:
                 
                 # Write device data
                 for device in self.devices:
-                    writer.writerow(device)
+                    row = dict(device)
+                    if 'open_ports' in row:
+                        row['open_ports'] = format_ports(row['open_ports'])
+                    writer.writerow(row)
             
             print(f"[✓] Detailed CSV file created: {filename}")
         
@@ -184,7 +192,11 @@ def main():
             hostname = input("Hostname: ").strip()
             os = input("Operating System: ").strip()
             
-            generator.add_device(ip, mac, hostname, os)
+            try:
+                generator.add_device(ip, mac, hostname, os)
+            except ValueError as e:
+                print(f"[!] {e}\n")
+                continue
             print("[✓] Device added\\n")
     
     if not generator.devices:
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Network Map Streams
+Streaming writers and incremental readers for network maps
+"""
+
+import os
+import sys
+import json
+import argparse
+import ipaddress
+import textwrap
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Mapping, Optional
+
+MANIFEST_FORMAT = "network-map-ndjson/1"
+MAX_OPEN_SHARDS = 64
+READ_CHUNK = 1 << 16
+
+def shard_name(base: str, network: Optional[ipaddress._BaseNetwork]) -> str:
+    """'network_map.ndjson', or 'network_map.10.0.0.0_16.ndjson' for one shard"""
+    if network is None:
+        return f"{base}.ndjson"
+    return f"{base}.{network.network_address}_{network.prefixlen}.ndjson".replace(':', '-')
+
+def manifest_base(manifest: Path) -> str:
+    """'network_map' for network_map.manifest.json"""
+    name = manifest.name
+    for suffix in (".manifest.json", ".json"):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+def write_ndjson(manifest: str, devices: Iterable[Mapping], info: Optional[Dict] = None,
+                 shard_prefix: Optional[int] = None) -> Dict:
+    """Write devices as NDJSON shards plus a manifest; returns the manifest
+    
+    One compact JSON object per line, written as the devices are
+    iterated. With shard_prefix, each device goes to the shard of its
+    /shard_prefix network (e.g. 16 for one file per /16); shards are
+    opened on demand, at most MAX_OPEN_SHARDS at a time. Everything is
+    written to temporary files and renamed at the end, manifest last, so
+    readers only ever see a complete map.
+    """
+    manifest = Path(manifest)
+    base = manifest_base(manifest)
+    directory = manifest.parent
+    shards: Dict[Optional[ipaddress._BaseNetwork], Dict] = {}
+    handles = {}   # open shard files, least recently used first
+    
+    def handle(network):
+        f = handles.pop(network, None)
+        if f is None:
+            if len(handles) >= MAX_OPEN_SHARDS:
+                handles.pop(next(iter(handles))).close()
+            entry = shards.get(network)
+            if entry is None:
+                entry = {"file": shard_name(base, network)}
+                if network is not None:
+                    entry["subnet"] = str(network)
+                entry["devices"] = 0
+                shards[network] = entry
+            f = open(directory / f"{entry['file']}.tmp", 'a' if entry["devices"] else 'w')
+        handles[network] = f
+        return f
+    
+    try:
+        for device in devices:
+            network = None
+            if shard_prefix is not None:
+                address = ipaddress.ip_address(device["ip"])
+                network = ipaddress.ip_network((address, min(shard_prefix, address.max_prefixlen)), strict=False)
+            handle(network).write(json.dumps(dict(device), separators=(',', ':')) + '\n')
+            shards[network]["devices"] += 1
+        if not shards:
+            handle(None)   # an empty map still has its (empty) stream
+    finally:
+        for f in handles.values():
+            f.close()
+    
+    ordered = sorted(shards.items(), key=lambda item: (item[0] is not None, item[0] and
+                                                       (item[0].version, item[0].network_address)))
+    for _, entry in ordered:
+        os.replace(directory / f"{entry['file']}.tmp", directory / entry["file"])
+    
+    header = {
+        "format": MANIFEST_FORMAT,
+        **(info or {}),
+        "total_devices": sum(entry["devices"] for entry in shards.values()),
+        "shard_prefix": shard_prefix,
+        "shards": [entry for _, entry in ordered],
+    }
+    tmp = manifest.with_name(manifest.name + ".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(header, f, indent=4)
+    os.replace(tmp, manifest)
+    return header
+
+def write_json(filename: str, info: Dict, devices: Iterable[Mapping]):
+    """Write the classic network_map.json one device at a time
+    
+    The output matches json.dump({... 'devices': [...]}, indent=4) with
+    the devices last, without holding the device list in memory.
+    """
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'w') as f:
+        f.write("{\n")
+        for key, value in info.items():
+            f.write(f"    {json.dumps(key)}: {textwrap.indent(json.dumps(value, indent=4), '    ').lstrip()},\n")
+        f.write('    "devices": [')
+        separator = "\n"
+        for device in devices:
+            f.write(separator + textwrap.indent(json.dumps(dict(device), indent=4), ' ' * 8))
+            separator = ",\n"
+        f.write("\n    ]\n}" if separator == ",\n" else "]\n}")
+    os.replace(tmp, filename)
+
+class _JSONStream:
+    """Decodes one JSON value at a time from a file, holding one chunk"""
+    
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+    
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(READ_CHUNK)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at the end), not consumed"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+    
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in JSON map")
+        self.pos += 1
+    
+    def skip(self, char: str) -> bool:
+        if self.peek() == char:
+            self.pos += 1
+            return True
+        return False
+    
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number that ends the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof or not self._fill():
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+class MapReader:
+    """Incremental reader for a network map in any layout
+    
+    Accepts an NDJSON manifest (its shards are read in turn), a bare
+    .ndjson device stream, or a classic network_map.json, whose devices
+    are decoded one at a time. Each iteration re-reads the file(s) and
+    yields one device dict at a time, so memory stays constant however
+    large the map is. .header holds the map's other top-level fields
+    (scan_date, subnet, total_devices, ...).
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.header: Dict = {}
+        self._length = None
+        if self.path.suffix != ".ndjson":
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for _ in self._walk(_JSONStream(f), self.header, stop_at_devices=True):
+                    pass
+            if self.header.get("format", MANIFEST_FORMAT) != MANIFEST_FORMAT:
+                raise ValueError(f"Unsupported map format: {self.header['format']}")
+        if "total_devices" in self.header:
+            self._length = self.header["total_devices"]
+    
+    @property
+    def is_manifest(self) -> bool:
+        return "shards" in self.header
+    
+    def _walk(self, stream: _JSONStream, header: Dict, stop_at_devices: bool = False) -> Iterator[Dict]:
+        """Top-level fields into header; devices yielded as they are decoded"""
+        stream.expect('{')
+        while not stream.skip('}'):
+            key = stream.value()
+            stream.expect(':')
+            if key == "devices":
+                if stop_at_devices:
+                    return
+                stream.expect('[')
+                while not stream.skip(']'):
+                    yield stream.value()
+                    stream.skip(',')
+            else:
+                header[key] = stream.value()
+            stream.skip(',')
+    
+    def _lines(self, path: Path) -> Iterator[Dict]:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        if self.path.suffix == ".ndjson":
+            yield from self._lines(self.path)
+        elif self.is_manifest:
+            for shard in self.header["shards"]:
+                yield from self._lines(self.path.parent / shard["file"])
+        else:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                yield from self._walk(_JSONStream(f), {})
+    
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
+    
+    def __getitem__(self, index):
+        """Slices stream from the start (for previews); single items too"""
+        if isinstance(index, slice):
+            return list(islice(self, index.start, index.stop, index.step))
+        if index < 0:
+            index += len(self)
+        for device in islice(self, index, None):
+            return device
+        raise IndexError("map index out of range")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a network map to sharded NDJSON (or back)")
+    parser.add_argument("source", help="network_map.json, a manifest or an .ndjson stream")
+    parser.add_argument("target", help="output manifest (*.manifest.json) or classic map (*.json)")
+    parser.add_argument("--shard-prefix", type=int, metavar="BITS",
+                        help="one shard per /BITS network, e.g. 16 or 24")
+    args = parser.parse_args()
+    
+    try:
+        reader = MapReader(args.source)
+        info = {k: v for k, v in reader.header.items()
+                if k not in ("format", "total_devices", "shard_prefix", "shards")}
+        if args.target.endswith(".manifest.json"):
+            manifest = write_ndjson(args.target, reader, info, args.shard_prefix)
+            print(f"[✓] {manifest['total_devices']} device(s) in {len(manifest['shards'])} shard(s): {args.target}")
+        else:
+            info["total_devices"] = len(reader)
+            write_json(args.target, info, reader)
+            print(f"[✓] {info['total_devices']} device(s): {args.target}")
+    except (OSError, ValueError) as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -4,82 +4,174 @@ Network Mapper
 Creates comprehensive network topology maps from scan data
 """
 
-import subprocess
+import os
 import re
-import json
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import ipaddress
+import subprocess
 from datetime import datetime
-from typing import List, Dict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from device_table import DeviceTable
+from map_stream import write_json, write_ndjson
+from dns_resolver import ReverseResolver
+from os_fingerprint import match
+from pcap_ingest import ingest_files
+from service_scanner import ServiceScanner, format_ports, parse_ports, service_name
+
+try:
+    import yaml
+except ImportError:   # optional: built-in scan settings are used without it
+    yaml = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CONFIG = REPO_ROOT / "configs" / "network_config.yaml"
+
+DEFAULT_SCAN_SETTINGS = {
+    "ping_timeout": 2,
+    "ping_count": 2,
+    "arp_scan_interval": 5,
+    "max_concurrent_scans": 50,
+    "max_concurrent_lookups": 1000,
+    "dns_timeout": 2,
+    "port_profile": "top100",
+    "port_timeout": 1,
+    "max_concurrent_connections": 1000,
+    "max_connections_per_host": 32,
+    "grab_banners": False,
+}
+
+EXPORT_INTERVAL = 2.0   # seconds between live network_map.json snapshots
+
+NEIGHBOR_LINE = re.compile(r'^(\S+) \((\d+\.\d+\.\d+\.\d+)\) at ')
+IP_PATTERN = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+MAC_PATTERN = re.compile(r'((?:[0-9a-fA-F]{1,2}[:-]){5}[0-9a-fA-F]{1,2})')
+TTL_PATTERN = re.compile(r'ttl=(\d+)', re.IGNORECASE)
+VM_VENDORS = ("vmware", "virtualbox", "parallels")
+
+def load_config(path=DEFAULT_CONFIG) -> Dict:
+    """network_config.yaml as a dict; empty if missing or PyYAML is not installed"""
+    if yaml is None:
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+def normalize_mac(mac: str) -> str:
+    """aa:bb:cc:dd:ee:ff form of '0:c:29:...' (macOS) or 'AA-BB-...' (Windows)"""
+    return ':'.join(part.zfill(2) for part in re.split(r'[:-]', mac)).lower()
+
+def parse_neighbor_table(text: str) -> Dict[str, Dict]:
+    """{ip: {'mac', 'hostname'}} from /proc/net/arp or `arp -a` output
+    
+    Handles Linux/macOS `arp -a` ("name (ip) at mac ..."), Windows
+    ("ip  mac  dynamic") and /proc/net/arp. Incomplete entries are skipped;
+    hostname is None unless the table names the host.
+    """
+    entries = {}
+    for line in text.splitlines():
+        ip_match = IP_PATTERN.search(line)
+        mac_match = MAC_PATTERN.search(line)
+        if not ip_match or not mac_match:
+            continue
+        mac = normalize_mac(mac_match.group(1))
+        if mac == "00:00:00:00:00:00":
+            continue
+        named = NEIGHBOR_LINE.match(line.strip())
+        hostname = named.group(1) if named and named.group(1) != '?' else None
+        entries[ip_match.group(1)] = {"mac": mac, "hostname": hostname}
+    return entries
+
+def covering_network(ips: Iterable[str]) -> ipaddress.IPv4Network:
+    """Smallest network containing every address in ips"""
+    addresses = [int(ipaddress.ip_address(ip)) for ip in ips]
+    prefix = 32 - (min(addresses) ^ max(addresses)).bit_length()
+    return ipaddress.ip_network((min(addresses), prefix), strict=False)
 
 class NetworkMapper:
-    def __init__(self, subnet: str = "192.168.0"):
+    def __init__(self, subnet: Optional[str] = "192.168.0", settings: Optional[Dict] = None,
+                 dns_servers: Optional[List[str]] = None):
         self.subnet = subnet
-        self.devices = []
+        # "192.168.0" is shorthand for its /24; anything else is CIDR.
+        # None leaves the network to be inferred from a capture (ingest_pcap).
+        if subnet is None:
+            self.network = None
+        elif '/' in subnet:
+            self.network = ipaddress.ip_network(subnet, strict=False)
+        else:
+            self.network = ipaddress.ip_network(f"{subnet}.0/24")
+        self.settings = {**DEFAULT_SCAN_SETTINGS, **(settings or {})}
+        self.resolver = ReverseResolver(dns_servers, self.settings["dns_timeout"],
+                                        max_inflight=self.settings["max_concurrent_lookups"])
+        profile = self.settings["port_profile"]
+        self.scanner = None if profile in (None, "", "none") else ServiceScanner(
+            parse_ports(str(profile)),
+            self.settings["port_timeout"],
+            self.settings["max_concurrent_connections"],
+            self.settings["max_connections_per_host"],
+            self.settings["grab_banners"]
+        )
+        self.ping_ttls: Dict[str, int] = {}   # echo reply TTLs, for OS fingerprinting
+        self.devices = DeviceTable()
+    
+    def read_neighbor_table(self) -> Dict[str, Dict]:
+        """Current ARP/neighbor entries inside the mapped network"""
+        try:
+            if os.path.exists("/proc/net/arp"):
+                with open("/proc/net/arp", 'r') as f:
+                    text = f.read()
+            else:
+                text = subprocess.run(["arp", "-a"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"[!] Could not read the neighbor table: {e}")
+            return {}
+        return {ip: entry for ip, entry in parse_neighbor_table(text).items()
+                if ipaddress.ip_address(ip) in self.network}
+    
+    def new_device(self, ip: str, entry: Optional[Dict] = None) -> Dict:
+        """Device record in the network_map.json schema"""
+        mac = entry["mac"] if entry else "Unknown"
+        return {
+            "ip": ip,
+            "mac": mac,
+            "hostname": (entry or {}).get("hostname") or "Unknown",
+            "os": "Unknown",
+            "os_confidence": 0.0,
+            "os_hints": {},
+            "status": "Up",
+            "open_ports": [],
+            "vendor": self.lookup_vendor(mac)
+        }
     
-    def arp_scan(self) -> List[Dict]:
+    def arp_scan(self) -> DeviceTable:
         """Perform ARP scan to discover devices"""
-        print(f"[*] Scanning subnet: {self.subnet}.0/24")
+        print(f"[*] Scanning subnet: {self.network}")
         
         try:
-            # Run ARP command
-            result = subprocess.run(
-                ["arp", "-a"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            devices = []
+            devices = [self.new_device(ip, entry) for ip, entry in self.read_neighbor_table().items()]
             
-            for line in result.stdout.split('\\n'):
-                if self.subnet in line:
-                    # Parse line for IP and MAC
-                    ip_match = re.search(r'(\\d+\\.\\d+\\.\\d+\\.\\d+)', line)
-                    mac_match = re.search(r'([0-9a-fA-F]{1,2}[:-]){5}[0-9a-fA-F]{1,2}', line)
-                    
-                    if ip_match:
-                        ip = ip_match.group(1)
-                        mac = mac_match.group(0) if mac_match else "Unknown"
-                        
-                        # Try to extract hostname
-                        hostname_match = re.search(r'\\(([^)]+)\\)', line)
-                        hostname = hostname_match.group(1) if hostname_match else self.reverse_dns_lookup(ip)
-                        
-                        device = {
-                            "ip": ip,
-                            "mac": mac,
-                            "hostname": hostname,
-                            "os": "Unknown",
-                            "status": "Up",
-                            "open_ports": [],
-                            "vendor": self.lookup_vendor(mac)
-                        }
-                        
-                        devices.append(device)
+            # Resolve every unnamed device in one concurrent batch
+            names = self.resolver.lookup(d["ip"] for d in devices if d["hostname"] == "Unknown")
+            for device in devices:
+                device["hostname"] = names.get(device["ip"]) or device["hostname"]
             
-            self.devices = devices
-            return devices
+            self.devices = DeviceTable(devices)
+            return self.devices
         
         except Exception as e:
             print(f"[!] Error during ARP scan: {e}")
-            return []
+            return DeviceTable()
     
     def reverse_dns_lookup(self, ip: str) -> str:
         """Attempt reverse DNS lookup for hostname"""
-        try:
-            result = subprocess.run(
-                ["host", ip],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            
-            if "domain name pointer" in result.stdout:
-                hostname = result.stdout.split("pointer")[1].strip().rstrip('.')
-                return hostname
-        except:
-            pass
-        
-        return "Unknown"
+        return self.resolver.lookup([ip]).get(ip) or "Unknown"
     
     def lookup_vendor(self, mac: str) -> str:
         """Look up vendor from MAC address OUI"""
@@ -100,94 +192,309 @@ class NetworkMapper:
         
         return "Unknown"
     
+    def ping_command(self, ip: str) -> List[str]:
+        timeout = self.settings["ping_timeout"]
+        # -W is seconds on Linux, milliseconds on macOS
+        wait = str(int(timeout * 1000)) if sys.platform == "darwin" else str(timeout)
+        return ["ping", "-c", str(self.settings["ping_count"]), "-W", wait, ip]
+    
+    async def ping(self, ip: str) -> bool:
+        """True if ip answers; a hung ping is killed after its deadline
+        
+        The reply's TTL is kept in ping_ttls for OS fingerprinting.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *self.ping_command(ip),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        deadline = self.settings["ping_count"] * (self.settings["ping_timeout"] + 1) + 1
+        try:
+            output, _ = await asyncio.wait_for(proc.communicate(), deadline)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return False
+        
+        if proc.returncode != 0:
+            return False
+        ttl = TTL_PATTERN.search(output.decode('ascii', 'replace'))
+        if ttl:
+            self.ping_ttls[ip] = int(ttl.group(1))
+        return True
+    
+    async def sweep_stage(self, alive: Optional[asyncio.Queue] = None,
+                          swept: Optional[Set[str]] = None) -> int:
+        """Ping every host address with at most max_concurrent_scans pings
+        running; replying addresses go to the alive queue as they answer,
+        and every address whose ping has finished is added to swept.
+        Returns the number of replies.
+        """
+        if not shutil.which("ping"):
+            print("[!] ping not found; relying on the neighbor table only")
+            return 0
+        
+        hosts = iter(self.network.hosts())   # shared by the workers
+        replied = 0
+        
+        async def worker():
+            nonlocal replied
+            for ip in hosts:
+                ip = str(ip)
+                answered = await self.ping(ip)
+                if swept is not None:
+                    swept.add(ip)
+                if answered:
+                    replied += 1
+                    if alive is not None:
+                        await alive.put(ip)
+        
+        await asyncio.gather(*(worker() for _ in range(max(1, int(self.settings["max_concurrent_scans"])))))
+        return replied
+    
     def ping_sweep(self):
         """Perform ping sweep to populate ARP cache"""
-        print(f"[*] Performing ping sweep on {self.subnet}.0/24...")
-        
-        processes = []
-        for i in range(1, 255):
-            ip = f"{self.subnet}.{i}"
-            proc = subprocess.Popen(
-                ["ping", "-c", "1", "-W", "1", ip],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
+        print(f"[*] Performing ping sweep on {self.network}...")
+        replied = asyncio.run(self.sweep_stage())
+        print(f"[✓] Ping sweep complete ({replied} host(s) replied)")
+    
+    async def neighbor_stage(self, alive: asyncio.Queue, found: asyncio.Queue, consumers: int,
+                             swept: Set[str]):
+        """Turn replying addresses into device records from the neighbor table
+        
+        The table is re-read when a replying host is missing from it and every
+        arp_scan_interval seconds, so hosts that drop ICMP but answer ARP are
+        mapped as well. A host found only in the table waits until the sweep
+        is done with it (swept), so its ping reply TTL is not missed by
+        enrichment. Ends with one None per consumer.
+        """
+        interval = self.settings["arp_scan_interval"]
+        table = await asyncio.to_thread(self.read_neighbor_table)
+        last_read = time.monotonic()
+        seen = set()
+        
+        async def emit(ip):
+            if ip not in seen:
+                seen.add(ip)
+                await found.put(self.new_device(ip, table.get(ip)))
+        
+        while True:
+            try:
+                ip = await asyncio.wait_for(alive.get(), max(interval - (time.monotonic() - last_read), 0.1))
+            except asyncio.TimeoutError:
+                ip = ''
+            
+            if ip is None or ip not in table or time.monotonic() - last_read >= interval:
+                table = await asyncio.to_thread(self.read_neighbor_table)
+                last_read = time.monotonic()
+                for known in list(table):
+                    if ip is None or known in swept:
+                        await emit(known)
+            if ip is None:
+                break
+            if ip:
+                await emit(ip)
+        
+        for _ in range(consumers):
+            await found.put(None)
+    
+    async def enrich_stage(self, found: asyncio.Queue, enriched: asyncio.Queue):
+        """One enrichment worker: hostname, open ports and OS for each device"""
+        while True:
+            device = await found.get()
+            if device is None:
+                return
+            
+            # Reverse DNS and the port scan run side by side
+            lookups = {}
+            if device["hostname"] == "Unknown":
+                lookups["hostname"] = self.resolver.resolve(device["ip"])
+            if self.scanner:
+                lookups["open_ports"] = self.scanner.scan_host(device["ip"])
+            for key, value in zip(lookups, await asyncio.gather(*lookups.values())):
+                if value:
+                    device[key] = value
+            
+            # Fingerprint hints come from the probes above, not new traffic
+            if device["ip"] in self.ping_ttls:
+                device["os_hints"]["ttl"] = self.ping_ttls.pop(device["ip"])
+            if self.scanner:
+                device["os_hints"].update(self.scanner.hints.pop(device["ip"], {}))
+            
+            self.enrich_device(device)
+            await enriched.put(device)
+    
+    async def export_stage(self, enriched: asyncio.Queue, json_file: Optional[str] = None):
+        """Collect devices as they are confirmed, snapshotting json_file"""
+        last_export = time.monotonic()
+        while True:
+            device = await enriched.get()
+            if device is None:
+                break
+            self.devices.append(device)
+            print(f"[✓] {device['ip']:<16} {device['mac']:<18} {device['hostname']}")
+            if json_file and time.monotonic() - last_export >= EXPORT_INTERVAL:
+                self.export_json(json_file, quiet=True)
+                last_export = time.monotonic()
+        
+        self.devices.sort()
+    
+    async def map_network(self, json_file: Optional[str] = None) -> DeviceTable:
+        """Sweep -> neighbor read -> enrichment -> export as one pipeline
+        
+        Stages are joined by bounded queues, so a slow stage holds back the
+        ones before it instead of buffering the whole network, and each
+        device reaches the exporters as soon as it is enriched.
+        """
+        limit = max(1, int(self.settings["max_concurrent_scans"]))
+        lookups = max(1, int(self.settings["max_concurrent_lookups"]))
+        alive = asyncio.Queue(maxsize=limit)
+        found = asyncio.Queue(maxsize=limit)
+        enriched = asyncio.Queue(maxsize=limit)
+        swept = set()   # addresses the sweep has finished pinging
+        self.devices = DeviceTable()
+        
+        async def sweep():
+            try:
+                await self.sweep_stage(alive, swept)
+            finally:
+                await alive.put(None)
+        
+        async def enrich():
+            await asyncio.gather(*(self.enrich_stage(found, enriched) for _ in range(lookups)))
+            await enriched.put(None)
+        
+        try:
+            await asyncio.gather(
+                sweep(),
+                self.neighbor_stage(alive, found, lookups, swept),
+                enrich(),
+                self.export_stage(enriched, json_file)
             )
-            processes.append(proc)
+        finally:
+            self.resolver.close()
+            self.resolver.save()
+        return self.devices
+    
+    def run(self, json_file: Optional[str] = None) -> DeviceTable:
+        """Map the network with the async pipeline"""
+        print(f"[*] Mapping {self.network} "
+              f"(up to {self.settings['max_concurrent_scans']} concurrent scans)...")
+        return asyncio.run(self.map_network(json_file))
+    
+    def ingest_pcap(self, paths: List[str]) -> DeviceTable:
+        """Map the hosts seen in pcap/pcapng captures instead of scanning
         
-        # Wait for all pings to complete
-        for proc in processes:
-            proc.wait()
+        Nothing is sent: MACs come from ARP and DHCP, hostnames from DHCP,
+        NetBIOS and mDNS, and os_hints/open_ports from the TTLs and
+        SYN-ACKs in the capture. Without a subnet, only hosts named by
+        link-local traffic are mapped and the network is the smallest one
+        covering them.
+        """
+        print(f"[*] Reading {len(paths)} capture(s)...")
+        capture, elapsed = ingest_files(paths)
+        print(f"[✓] {capture.packets} packets ({capture.bytes / 1e6:.1f} MB) in {elapsed:.2f}s "
+              f"({capture.bytes / 1e6 / max(elapsed, 1e-9):.0f} MB/s)")
         
-        print("[✓] Ping sweep complete")
+        hosts = capture.hosts(self.network)
+        if self.network is None:
+            self.network = covering_network(hosts) if hosts else ipaddress.ip_network("0.0.0.0/0")
+        
+        self.devices = DeviceTable()
+        for ip in sorted(hosts, key=ipaddress.ip_address):
+            host = hosts[ip]
+            device = self.new_device(ip, {"mac": host["mac"] or "Unknown", "hostname": host["hostname"]})
+            device["status"] = "Seen"
+            device["os_hints"] = host["os_hints"]
+            device["open_ports"] = [{"port": port, "service": service_name(port)} for port in host["open_ports"]]
+            self.enrich_device(device)
+            self.devices.append(device)
+        return self.devices
     
-    def detect_os(self, device: Dict) -> str:
-        """Attempt to detect OS (basic detection)"""
-        # This is a simplified OS detection
-        # In real scenarios, you'd use tools like nmap
+    def detect_os(self, device: Dict) -> Tuple[str, float]:
+        """Guess (os, confidence) from os_hints and open ports
+        
+        Passive only: the hints are the ping reply TTL and the SYN-ACK
+        details the port scan already received (see os_fingerprint).
+        """
+        name, confidence = match(device.get('os_hints') or {}, device.get('open_ports') or [])
         
         vendor = device.get('vendor', '').lower()
+        if any(vm in vendor for vm in VM_VENDORS):
+            name = "Virtual Machine" if name == "Unknown" else f"{name} (Virtual Machine)"
         
-        if 'vmware' in vendor or 'virtualbox' in vendor or 'parallels' in vendor:
-            return "Virtual Machine"
+        return name, confidence
+    
+    def enrich_device(self, device: Dict):
+        """Fill in the derived fields of one device"""
+        # Detect OS
+        device['os'], device['os_confidence'] = self.detect_os(device)
         
-        # Default assumption for competition environment
-        return "Windows 10"
+        # Add scan timestamp
+        device['scan_time'] = datetime.now().isoformat()
     
     def enrich_device_data(self):
         """Enrich device data with additional information"""
         print("[*] Enriching device data...")
         
         for device in self.devices:
-            # Detect OS
-            device['os'] = self.detect_os(device)
-            
-            # Add scan timestamp
-            device['scan_time'] = datetime.now().isoformat()
+            self.enrich_device(device)
         
         print(f"[✓] Enriched {len(self.devices)} device(s)")
     
-    def export_json(self, filename: str = "network_map.json"):
-        """Export network map to JSON"""
-        data = {
+    def map_info(self) -> Dict:
+        """Top-level fields of network_map.json, without the devices"""
+        return {
             "scan_date": datetime.now().isoformat(),
-            "subnet": self.subnet + ".0/24",
-            "total_devices": len(self.devices),
-            "devices": self.devices
+            "subnet": str(self.network),
+            "total_devices": len(self.devices)
         }
+    
+    def export_json(self, filename: str = "network_map.json", quiet: bool = False):
+        """Export network map to JSON"""
+        # Streamed row by row and replaced atomically, so readers never
+        # see a half-written map
+        write_json(filename, self.map_info(), self.devices.iter_dicts())
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
-        
-        print(f"[✓] Network map exported to: {filename}")
+        if not quiet:
+            print(f"[✓] Network map exported to: {filename}")
+    
+    def export_ndjson(self, manifest: str = "network_map.manifest.json", shard_prefix: Optional[int] = None):
+        """Export network map as NDJSON shards plus a manifest"""
+        info = self.map_info()
+        del info["total_devices"]   # counted by the manifest itself
+        header = write_ndjson(manifest, self.devices.iter_dicts(), info, shard_prefix)
+        print(f"[✓] Network map exported to: {manifest} ({len(header['shards'])} shard(s))")
     
     def export_text(self, filename: str = "network_map.txt"):
         """Export network map to text format"""
         with open(filename, 'w') as f:
-            f.write("NETWORK TOPOLOGY MAP\\n")
-            f.write("="*80 + "\\n")
-            f.write(f"Scan Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\\n")
-            f.write(f"Subnet: {self.subnet}.0/24\\n")
-            f.write(f"Total Devices: {len(self.devices)}\\n")
-            f.write("="*80 + "\\n\\n")
+            f.write("NETWORK TOPOLOGY MAP\n")
+            f.write("="*80 + "\n")
+            f.write(f"Scan Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Subnet: {self.network}\n")
+            f.write(f"Total Devices: {len(self.devices)}\n")
+            f.write("="*80 + "\n\n")
             
             for i, device in enumerate(self.devices, 1):
-                f.write(f"Device {i}:\\n")
-                f.write(f"  IP Address:  {device['ip']}\\n")
-                f.write(f"  MAC Address: {device['mac']}\\n")
-                f.write(f"  Hostname:    {device['hostname']}\\n")
-                f.write(f"  OS:          {device['os']}\\n")
-                f.write(f"  Vendor:      {device['vendor']}\\n")
-                f.write(f"  Status:      {device['status']}\\n")
-                f.write("-"*80 + "\\n")
+                f.write(f"Device {i}:\n")
+                f.write(f"  IP Address:  {device['ip']}\n")
+                f.write(f"  MAC Address: {device['mac']}\n")
+                f.write(f"  Hostname:    {device['hostname']}\n")
+                f.write(f"  OS:          {device['os']} ({device.get('os_confidence', 0):.0%} confidence)\n")
+                f.write(f"  Vendor:      {device['vendor']}\n")
+                f.write(f"  Open Ports:  {format_ports(device.get('open_ports'))}\n")
+                f.write(f"  Status:      {device['status']}\n")
+                f.write("-"*80 + "\n")
         
         print(f"[✓] Network map exported to: {filename}")
     
     def print_summary(self):
         """Print network map summary"""
-        print("\\n" + "="*80)
+        print("\n" + "="*80)
         print("  NETWORK MAP SUMMARY")
         print("="*80)
-        print(f"Subnet:        {self.subnet}.0/24")
+        print(f"Subnet:        {self.network}")
         print(f"Scan Time:     {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Total Devices: {len(self.devices)}")
         print("="*80)
@@ -197,7 +504,7 @@ class NetworkMapper:
         for i, device in enumerate(self.devices, 1):
             print(f"{i:<4} {device['ip']:<16} {device['mac']:<20} {device['hostname']:<25} {device['os']:<15}")
         
-        print("="*80 + "\\n")
+        print("="*80 + "\n")
 
 def main():
     print("""
@@ -206,31 +513,60 @@ def main():
 ╚═══════════════════════════════════════════════════════════╝
     """)
     
-    import sys
+    parser = argparse.ArgumentParser(description="Map hosts on a subnet into network_map.json")
+    parser.add_argument("subnet", nargs="?",
+                        help="first three octets (e.g. 192.168.0) or a CIDR range (e.g. 10.0.0.0/22); "
+                        "default 192.168.0, or inferred with --pcap")
+    parser.add_argument("--pcap", nargs="+", metavar="FILE",
+                        help="map hosts seen in pcap/pcapng captures instead of scanning")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG), help="network_config.yaml with scan_settings")
+    parser.add_argument("--json", default="network_map.json", help="JSON map (updated live during the scan)")
+    parser.add_argument("--text", default="network_map.txt", help="text map")
+    parser.add_argument("--ndjson", metavar="MANIFEST",
+                        help="also write an NDJSON map: a manifest (e.g. network_map.manifest.json) and its shards")
+    parser.add_argument("--shard-prefix", type=int, metavar="BITS",
+                        help="split the NDJSON map into one shard per /BITS network (e.g. 24)")
+    parser.add_argument("--ports", help="port profile (top100, windows, rdp, smb, winrm, none) "
+                        "or list such as 22,80,8000-8100 (default: scan_settings.port_profile)")
+    parser.add_argument("--banners", action="store_true", help="capture service banners")
+    args = parser.parse_args()
     
-    subnet = sys.argv[1] if len(sys.argv) > 1 else "192.168.0"
+    config = load_config(args.config)
+    if yaml is None:
+        print("[*] PyYAML not installed; using default scan settings")
     
-    mapper = NetworkMapper(subnet)
+    settings = dict(config.get("scan_settings") or {})
+    if args.ports:
+        settings["port_profile"] = args.ports
+    if args.banners:
+        settings["grab_banners"] = True
     
-    # Perform ping sweep to populate ARP cache
-    mapper.ping_sweep()
+    network = config.get("network") or {}
+    subnet = args.subnet if args.subnet or args.pcap else "192.168.0"
+    try:
+        mapper = NetworkMapper(subnet, settings, network.get("dns_servers"))
+        if args.pcap:
+            devices = mapper.ingest_pcap(args.pcap)
+    except (OSError, ValueError) as e:
+        print(f"[!] {e}")
+        sys.exit(1)
     
-    # Scan network
-    devices = mapper.arp_scan()
+    if not args.pcap:
+        # Sweep, read neighbors and enrich devices concurrently
+        devices = mapper.run(args.json)
     
     if not devices:
         print("[!] No devices found on network")
         return
     
-    # Enrich data
-    mapper.enrich_device_data()
-    
     # Print summary
     mapper.print_summary()
     
     # Export to multiple formats
-    mapper.export_json()
-    mapper.export_text()
+    mapper.export_json(args.json)
+    mapper.export_text(args.text)
+    if args.ndjson:
+        mapper.export_ndjson(args.ndjson, args.shard_prefix)
     
     print("[✓] Network mapping complete!")
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+OS Fingerprint
+Passive OS guesses from probes the mapper already sends
+"""
+
+import sys
+import json
+import socket
+import struct
+import argparse
+from typing import Dict, Iterable, List, Tuple
+
+# Hop counts only lower a TTL, so the sender's initial TTL is the next of these
+INITIAL_TTLS = (32, 64, 128, 255)
+
+# Weight of each observed feature in a signature's score
+FEATURE_WEIGHTS = {
+    "ttl": 2.0,          # initial TTL of the ICMP echo reply
+    "window": 1.5,       # SYN-ACK window
+    "wscale": 1.0,       # SYN-ACK window scale, 0 when the option is absent
+    "timestamps": 1.0,   # SYN-ACK carried TCP timestamps
+}
+PORT_WEIGHT = 0.5        # per open port typical of the OS...
+PORT_CAP = 1.5           # ...up to this much in total
+MAX_SCORE = sum(FEATURE_WEIGHTS.values()) + PORT_CAP
+
+# Ties go to the earlier signature, so common systems come first
+SIGNATURES = [
+    {"os": "Windows 10/11", "family": "Windows",
+     "ttl": (128,), "window": (64240, 65535), "wscale": (8,), "timestamps": (False,),
+     "ports": (135, 139, 445, 3389, 5357, 5985)},
+    {"os": "Windows 7/2008", "family": "Windows",
+     "ttl": (128,), "window": (8192,), "wscale": (2, 8), "timestamps": (False,),
+     "ports": (135, 139, 445, 3389, 49152, 49153, 49154)},
+    {"os": "Linux", "family": "Unix",
+     "ttl": (64,), "window": (65160, 64240, 29200, 28960, 14480, 5792, 5840, 65483, 43690),
+     "wscale": (7, 9, 10), "timestamps": (True,),
+     "ports": (22, 111, 2049, 3306, 5432)},
+    {"os": "macOS", "family": "Unix",
+     "ttl": (64,), "window": (65535,), "wscale": (5, 6), "timestamps": (True,),
+     "ports": (88, 548, 3283, 5000, 5900)},
+    {"os": "FreeBSD", "family": "Unix",
+     "ttl": (64,), "window": (65535,), "wscale": (6, 7), "timestamps": (True,),
+     "ports": (22, 111)},
+    {"os": "Network Device", "family": "Network Device",
+     "ttl": (255,), "window": (4128, 8192), "wscale": (0,), "timestamps": (False,),
+     "ports": (22, 23, 179)},
+    {"os": "Printer", "family": "Printer",
+     "ttl": (64, 255), "window": (8760, 5840, 32768), "wscale": (0,), "timestamps": (False,),
+     "ports": (515, 631, 9100)},
+]
+
+# tcp_info layout (linux/tcp.h): byte 5 holds the option flags, byte 6 the
+# window scales; tcpi_snd_wnd (Linux 5.4+), the peer's window, sits at byte 228
+TCP_INFO_HEAD = struct.Struct('7B')
+TCPI_OPT_TIMESTAMPS = 1
+TCPI_OPT_WSCALE = 4
+TCPI_SND_WND = struct.Struct('I')
+TCPI_SND_WND_OFFSET = 228
+TCP_INFO_SIZE = 256
+
+def compile_signatures(signatures: List[Dict]) -> Dict[str, Dict]:
+    """{feature: {value: [signature index, ...]}} for one lookup per feature"""
+    table = {feature: {} for feature in (*FEATURE_WEIGHTS, "ports")}
+    for index, signature in enumerate(signatures):
+        for feature in table:
+            for value in signature.get(feature, ()):
+                table[feature].setdefault(value, []).append(index)
+    return table
+
+COMPILED = compile_signatures(SIGNATURES)
+
+def initial_ttl(ttl: int) -> int:
+    """The initial TTL a reply with this many hops left most likely started at"""
+    for initial in INITIAL_TTLS:
+        if ttl <= initial:
+            return initial
+    return INITIAL_TTLS[-1]
+
+def tcp_hints(sock) -> Dict:
+    """SYN-ACK window, window scale and timestamps of a connected socket
+    
+    Read from TCP_INFO, which the kernel filled in during the handshake, so
+    nothing extra is sent. Empty where TCP_INFO is unavailable (non-Linux);
+    'window' is missing on kernels older than 5.4.
+    """
+    if not hasattr(socket, "TCP_INFO"):
+        return {}
+    try:
+        raw = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, TCP_INFO_SIZE)
+    except OSError:
+        return {}
+    if len(raw) < TCP_INFO_HEAD.size:
+        return {}
+    
+    options, wscales = TCP_INFO_HEAD.unpack_from(raw)[5:7]
+    hints = {
+        "wscale": wscales & 0x0f if options & TCPI_OPT_WSCALE else 0,
+        "timestamps": bool(options & TCPI_OPT_TIMESTAMPS),
+    }
+    if len(raw) >= TCPI_SND_WND_OFFSET + TCPI_SND_WND.size:
+        window = TCPI_SND_WND.unpack_from(raw, TCPI_SND_WND_OFFSET)[0]
+        if window:
+            hints["window"] = window
+    return hints
+
+def match(hints: Dict, open_ports: Iterable = ()) -> Tuple[str, float]:
+    """(os, confidence) for the observed hints and open ports
+    
+    Each signature earns the weight of every feature it agrees with, plus
+    PORT_WEIGHT per matching open port up to PORT_CAP. Confidence is the
+    best score as a fraction of MAX_SCORE, so it grows with both agreement
+    and the amount of evidence. A tie between signatures of one family is
+    reported as the family. ('Unknown', 0.0) when nothing matched or the
+    best signatures span families (a bare TTL of 64 fits Unix and printers
+    alike).
+    """
+    scores = [0.0] * len(SIGNATURES)
+    
+    observed = dict(hints)
+    if observed.get("ttl"):
+        observed["ttl"] = initial_ttl(observed["ttl"])
+    for feature, weight in FEATURE_WEIGHTS.items():
+        if observed.get(feature) is None:
+            continue
+        for index in COMPILED[feature].get(observed[feature], ()):
+            scores[index] += weight
+    
+    port_scores = [0.0] * len(SIGNATURES)
+    for entry in open_ports:
+        port = entry["port"] if isinstance(entry, dict) else entry
+        for index in COMPILED["ports"].get(port, ()):
+            port_scores[index] += PORT_WEIGHT
+    scores = [score + min(ports, PORT_CAP) for score, ports in zip(scores, port_scores)]
+    
+    best = max(scores)
+    if best <= 0:
+        return "Unknown", 0.0
+    leaders = [SIGNATURES[i] for i, score in enumerate(scores) if score == best]
+    families = {signature["family"] for signature in leaders}
+    if len(families) > 1:
+        return "Unknown", 0.0
+    name = leaders[0]["os"] if len(leaders) == 1 else families.pop()
+    return name, round(best / MAX_SCORE, 2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Passive OS guesses for network_map.json devices")
+    parser.add_argument("map_file", nargs="?", default="network_map.json", help="network map to fingerprint")
+    args = parser.parse_args()
+    
+    try:
+        with open(args.map_file, 'r') as f:
+            devices = json.load(f).get("devices", [])
+    except (OSError, ValueError) as e:
+        print(f"[!] Could not read {args.map_file}: {e}")
+        sys.exit(1)
+    
+    print(f"{'IP Address':<16} {'OS':<18} {'Confidence':<11} Hints")
+    print("-"*80)
+    for device in devices:
+        name, confidence = match(device.get("os_hints") or {}, device.get("open_ports") or [])
+        hints = ", ".join(f"{k}={v}" for k, v in (device.get("os_hints") or {}).items())
+        print(f"{device.get('ip', '?'):<16} {name:<18} {confidence:<11.0%} {hints}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Capture Ingest
+Passive host discovery from pcap/pcapng files without scapy
+"""
+
+import sys
+import mmap
+import time
+import struct
+import argparse
+import ipaddress
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dns_resolver import DNS_HEADER, DNS_RECORD, read_name
+
+PCAP_MAGIC = {
+    b'\xd4\xc3\xb2\xa1': '<', b'\xa1\xb2\xc3\xd4': '>',   # microsecond timestamps
+    b'\x4d\x3c\xb2\xa1': '<', b'\xa1\xb2\x3c\x4d': '>',   # nanosecond timestamps
+}
+PCAP_HEADER_SIZE = 24
+PCAP_RECORD_SIZE = 16
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_BYTE_ORDER = 0x1A2B3C4D
+PCAPNG_IDB, PCAPNG_PB, PCAPNG_SPB, PCAPNG_EPB = 1, 2, 3, 6
+
+LINKTYPE_ETHERNET = 1
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+RAW_LINKTYPES = {12, 101, 228}   # bare IPv4 packets, no link-layer addresses
+
+ETH_IPV4 = 0x0800
+ETH_ARP = 0x0806
+VLAN_TYPES = {0x8100, 0x88a8, 0x9100}
+
+PROTO_TCP = 6
+PROTO_UDP = 17
+TCP_SYN_ACK = 0x12
+DHCP_PORTS = {67, 68}
+NETBIOS_NS_PORT = 137
+MDNS_PORT = 5353
+
+DHCP_COOKIE = b'\x63\x82\x53\x63'
+DHCP_OPT_HOSTNAME = 12
+DHCP_OPT_MESSAGE_TYPE = 53
+DHCP_OPT_FQDN = 81
+DHCP_ACK = 5
+TYPE_A = 1
+
+NO_ADDRESS = b'\0\0\0\0'
+
+def _mac(raw: bytes) -> str:
+    return ':'.join(f"{b:02x}" for b in raw)
+
+def netbios_name(encoded: bytes) -> Tuple[str, int]:
+    """(name, suffix byte) of a first-level encoded NetBIOS name (RFC 1001)"""
+    if len(encoded) != 32 or any(c < 0x41 or c > 0x50 for c in encoded):
+        raise ValueError("not a NetBIOS name")
+    raw = bytes(((encoded[i] - 0x41) << 4) | (encoded[i + 1] - 0x41) for i in range(0, 32, 2))
+    return raw[:15].decode('ascii', 'replace').rstrip(), raw[15]
+
+def tcp_option_hints(options: bytes) -> Dict:
+    """wscale/timestamps of a SYN-ACK's options, as os_fingerprint.tcp_hints reports them"""
+    hints = {"wscale": 0, "timestamps": False}
+    i = 0
+    while i < len(options):
+        kind = options[i]
+        if kind == 0:
+            break
+        if kind == 1:
+            i += 1
+            continue
+        if i + 1 >= len(options) or options[i + 1] < 2:
+            break
+        if kind == 3 and options[i + 1] == 3 and i + 2 < len(options):
+            hints["wscale"] = options[i + 2]
+        elif kind == 8:
+            hints["timestamps"] = True
+        i += options[i + 1]
+    return hints
+
+class CaptureIngest:
+    """Per-host evidence gathered from one or more captures
+    
+    Files are memory-mapped and walked record by record with precompiled
+    structs; each frame is inspected in place and only the few bytes that
+    become dictionary keys are copied, so the page cache is the only
+    buffer. What is kept per IPv4 host:
+    
+    - bindings:    MAC from ARP senders and DHCP ACKs (on-segment hosts)
+    - source_macs: MAC of the first IPv4 frame from the host (the router's
+                   for off-segment sources, so it is only used for hosts
+                   known to be on the segment)
+    - dhcp_names:  DHCP hostname by client MAC
+    - netbios / mdns: names the host registered or announced
+    - hints:       os_fingerprint hints (first unicast TTL, SYN-ACK details)
+    - ports:       source ports of SYN-ACKs, i.e. open ports
+    """
+    
+    def __init__(self):
+        self.bindings: Dict[bytes, bytes] = {}
+        self.source_macs: Dict[bytes, bytes] = {}
+        self.dhcp_names: Dict[bytes, str] = {}
+        self.netbios: Dict[bytes, str] = {}
+        self.mdns: Dict[bytes, str] = {}
+        self.hints: Dict[bytes, Dict] = {}
+        self.ports: Dict[bytes, set] = {}
+        self.packets = 0
+        self.bytes = 0
+    
+    def ingest(self, path: str) -> int:
+        """Read one pcap or pcapng file; returns the number of packets"""
+        with open(path, 'rb') as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:   # empty file
+                raise ValueError(f"{path}: not a pcap or pcapng file") from None
+        
+        with buf:
+            magic = buf[:4]
+            if magic in PCAP_MAGIC:
+                packets = self._read_pcap(buf, PCAP_MAGIC[magic])
+            elif len(buf) >= 12 and struct.unpack_from('<I', buf)[0] == PCAPNG_SHB:
+                packets = self._read_pcapng(buf)
+            else:
+                raise ValueError(f"{path}: not a pcap or pcapng file")
+            self.bytes += len(buf)
+        
+        self.packets += packets
+        return packets
+    
+    def _read_pcap(self, buf, order: str) -> int:
+        if len(buf) < PCAP_HEADER_SIZE:
+            return 0
+        linktype = struct.unpack_from(order + 'I', buf, 20)[0] & 0xFFFF
+        record = struct.Struct(order + '8xI')   # captured length
+        frame = self._frame
+        size = len(buf)
+        offset = PCAP_HEADER_SIZE
+        packets = 0
+        
+        while offset + PCAP_RECORD_SIZE <= size:
+            start = offset + PCAP_RECORD_SIZE
+            offset = start + record.unpack_from(buf, offset)[0]
+            if offset > size:   # truncated final record
+                break
+            frame(buf, linktype, start, offset)
+            packets += 1
+        return packets
+    
+    def _read_pcapng(self, buf) -> int:
+        frame = self._frame
+        size = len(buf)
+        offset = 0
+        order = '<'
+        interfaces: List[int] = []
+        packets = 0
+        
+        while offset + 12 <= size:
+            block_type = struct.unpack_from(order + 'I', buf, offset)[0]
+            if block_type == PCAPNG_SHB:
+                # Each section sets its own byte order and interface list
+                order = '<' if struct.unpack_from('<I', buf, offset + 8)[0] == PCAPNG_BYTE_ORDER else '>'
+                interfaces = []
+            length = struct.unpack_from(order + 'I', buf, offset + 4)[0]
+            if length < 12 or offset + length > size:
+                break
+            
+            if block_type == PCAPNG_EPB:
+                interface, captured = struct.unpack_from(order + 'I8xI', buf, offset + 8)
+                start = offset + 28
+                if interface < len(interfaces):
+                    frame(buf, interfaces[interface], start, min(start + captured, offset + length - 4))
+                packets += 1
+            elif block_type == PCAPNG_SPB:
+                start = offset + 12
+                if interfaces:
+                    original = struct.unpack_from(order + 'I', buf, offset + 8)[0]
+                    frame(buf, interfaces[0], start, min(start + original, offset + length - 4))
+                packets += 1
+            elif block_type == PCAPNG_PB:
+                interface, captured = struct.unpack_from(order + 'H10xI', buf, offset + 8)
+                start = offset + 28
+                if interface < len(interfaces):
+                    frame(buf, interfaces[interface], start, min(start + captured, offset + length - 4))
+                packets += 1
+            elif block_type == PCAPNG_IDB:
+                interfaces.append(struct.unpack_from(order + 'H', buf, offset + 8)[0])
+            offset += length
+        return packets
+    
+    def _frame(self, buf, linktype: int, offset: int, end: int):
+        """Dispatch one captured frame by link type and EtherType"""
+        if linktype == LINKTYPE_ETHERNET:
+            if end - offset < 14:
+                return
+            mac = buf[offset + 6:offset + 12]
+            ethertype = buf[offset + 12] << 8 | buf[offset + 13]
+            offset += 14
+            while ethertype in VLAN_TYPES and end - offset >= 4:
+                ethertype = buf[offset + 2] << 8 | buf[offset + 3]
+                offset += 4
+        elif linktype == LINKTYPE_LINUX_SLL:
+            if end - offset < 16:
+                return
+            mac = buf[offset + 6:offset + 12] if buf[offset + 5] == 6 else None
+            ethertype = buf[offset + 14] << 8 | buf[offset + 15]
+            offset += 16
+        elif linktype == LINKTYPE_LINUX_SLL2:
+            if end - offset < 20:
+                return
+            mac = buf[offset + 12:offset + 18] if buf[offset + 11] == 6 else None
+            ethertype = buf[offset] << 8 | buf[offset + 1]
+            offset += 20
+        elif linktype in RAW_LINKTYPES:
+            if end - offset < 20:
+                return
+            mac = None
+            ethertype = ETH_IPV4 if buf[offset] >> 4 == 4 else 0
+        else:
+            return
+        
+        if ethertype == ETH_IPV4:
+            self._ipv4(buf, offset, end, mac)
+        elif ethertype == ETH_ARP:
+            self._arp(buf, offset, end)
+    
+    def _arp(self, buf, offset: int, end: int):
+        # htype, ptype, hlen 6, plen 4, oper, then sender MAC/IP
+        if end - offset < 28 or buf[offset + 4] != 6 or buf[offset + 5] != 4:
+            return
+        sender = buf[offset + 14:offset + 18]
+        if sender != NO_ADDRESS:   # ARP probes come from 0.0.0.0
+            self.bindings[sender] = buf[offset + 8:offset + 14]
+    
+    def _ipv4(self, buf, offset: int, end: int, mac: Optional[bytes]):
+        if end - offset < 20:
+            return
+        header = (buf[offset] & 0x0F) * 4
+        source = buf[offset + 12:offset + 16]
+        if source != NO_ADDRESS:
+            if mac is not None and source not in self.source_macs:
+                self.source_macs[source] = mac
+            # Multicast goes out with fixed TTLs (255 for mDNS, often 1), not the OS default
+            if source not in self.hints and buf[offset + 16] < 224:
+                self.hints[source] = {"ttl": buf[offset + 8]}
+        
+        # Only first fragments carry the transport header
+        if (buf[offset + 6] & 0x1F) or buf[offset + 7]:
+            return
+        protocol = buf[offset + 9]
+        l4 = offset + header
+        
+        if protocol == PROTO_TCP:
+            if end - l4 < 20 or buf[l4 + 13] & TCP_SYN_ACK != TCP_SYN_ACK or source == NO_ADDRESS:
+                return
+            port = buf[l4] << 8 | buf[l4 + 1]
+            self.ports.setdefault(source, set()).add(port)
+            hints = self.hints.setdefault(source, {})
+            if "window" not in hints:
+                data_offset = (buf[l4 + 12] >> 4) * 4
+                hints["window"] = buf[l4 + 14] << 8 | buf[l4 + 15]
+                hints.update(tcp_option_hints(buf[l4 + 20:min(l4 + data_offset, end)]))
+        
+        elif protocol == PROTO_UDP:
+            if end - l4 < 8:
+                return
+            source_port = buf[l4] << 8 | buf[l4 + 1]
+            dest_port = buf[l4 + 2] << 8 | buf[l4 + 3]
+            try:
+                if source_port in DHCP_PORTS and dest_port in DHCP_PORTS:
+                    self._dhcp(buf[l4 + 8:end])
+                elif source_port == NETBIOS_NS_PORT:
+                    self._netbios(buf[l4 + 8:end])
+                elif source_port == MDNS_PORT:
+                    self._mdns(buf[l4 + 8:end])
+            except (IndexError, ValueError, struct.error):   # malformed payload
+                pass
+    
+    def _dhcp(self, payload: bytes):
+        if len(payload) < 240 or payload[236:240] != DHCP_COOKIE or payload[2] != 6:
+            return
+        mac = payload[28:34]
+        options = {}
+        i = 240
+        while i < len(payload) and payload[i] != 255:
+            if payload[i] == 0:
+                i += 1
+                continue
+            length = payload[i + 1]
+            options[payload[i]] = payload[i + 2:i + 2 + length]
+            i += 2 + length
+        
+        name = None
+        if DHCP_OPT_HOSTNAME in options:
+            name = options[DHCP_OPT_HOSTNAME].rstrip(b'\0').decode('ascii', 'replace')
+        elif len(options.get(DHCP_OPT_FQDN, b'')) > 3:
+            fqdn = options[DHCP_OPT_FQDN]
+            name = read_name(fqdn, 3)[0] if fqdn[0] & 0x04 else fqdn[3:].decode('ascii', 'replace')
+        if name:
+            self.dhcp_names[mac] = name.rstrip('.')
+        
+        # The server's ACK (yiaddr) and a configured client (ciaddr) bind IP and MAC
+        message = options.get(DHCP_OPT_MESSAGE_TYPE, b'\0')[0]
+        address = payload[16:20] if message == DHCP_ACK else payload[12:16]
+        if address != NO_ADDRESS:
+            self.bindings[address] = mac
+    
+    def _netbios(self, payload: bytes):
+        # Name registrations/refreshes and positive query responses
+        flags, questions, answers, _, additional = struct.unpack_from('!HHHHH', payload, 2)
+        opcode = (flags >> 11) & 0x0F
+        if payload[12] != 0x20 or payload[45] != 0:
+            return
+        if flags & 0x8000 and opcode == 0 and answers:
+            rdata = 56                    # answer follows the name at 12
+        elif not flags & 0x8000 and opcode in (5, 8, 9) and questions and additional:
+            rdata = 62                    # additional record after the question
+        else:
+            return
+        name, suffix = netbios_name(payload[13:45])
+        nb_flags = struct.unpack_from('!H', payload, rdata)[0]
+        address = payload[rdata + 2:rdata + 6]
+        if name and suffix in (0x00, 0x20) and not nb_flags & 0x8000 and len(address) == 4:
+            self.netbios.setdefault(address, name)
+    
+    def _mdns(self, payload: bytes):
+        # A records in announcements and answers: "<host>.local" -> address
+        _, flags, questions, answers, authorities, additional = DNS_HEADER.unpack_from(payload)
+        if not flags & 0x8000:
+            return
+        offset = DNS_HEADER.size
+        for _ in range(questions):
+            offset = read_name(payload, offset)[1] + 4
+        for _ in range(answers + authorities + additional):
+            name, offset = read_name(payload, offset)
+            rtype, _, _, length = DNS_RECORD.unpack_from(payload, offset)
+            offset += DNS_RECORD.size
+            if rtype == TYPE_A and length == 4 and name.endswith('.local'):
+                self.mdns.setdefault(payload[offset:offset + 4], name[:-len('.local')])
+            offset += length
+    
+    def hosts(self, network: Optional[ipaddress.IPv4Network] = None) -> Dict[str, Dict]:
+        """{ip: {'mac', 'hostname', 'os_hints', 'open_ports'}} for on-segment hosts
+        
+        Without a network, a host is on the segment when link-local traffic
+        (ARP, DHCP, NetBIOS, mDNS) names it. With one, every IPv4 source
+        inside it counts as well and hosts outside it are dropped.
+        """
+        local = set(self.bindings) | set(self.netbios) | set(self.mdns)
+        if network is not None:
+            local |= set(self.source_macs) | set(self.hints)
+        
+        ip_by_mac = {mac: ip for ip, mac in self.source_macs.items()}
+        ip_by_mac.update({mac: ip for ip, mac in self.bindings.items()})
+        dhcp_names = {ip_by_mac[mac]: name for mac, name in self.dhcp_names.items() if mac in ip_by_mac}
+        
+        hosts = {}
+        for raw in local:
+            address = ipaddress.IPv4Address(raw)
+            if address.is_multicast or address.is_unspecified or raw == b'\xff\xff\xff\xff':
+                continue
+            if network is not None and address not in network:
+                continue
+            mac = self.bindings.get(raw) or self.source_macs.get(raw)
+            hosts[str(address)] = {
+                "mac": _mac(mac) if mac else None,
+                "hostname": dhcp_names.get(raw) or self.netbios.get(raw) or self.mdns.get(raw),
+                "os_hints": self.hints.get(raw, {}),
+                "open_ports": sorted(self.ports.get(raw, ())),
+            }
+        return hosts
+
+def ingest_files(paths: Iterable[str]) -> Tuple[CaptureIngest, float]:
+    """(capture, seconds) after reading every file"""
+    capture = CaptureIngest()
+    start = time.perf_counter()
+    for path in paths:
+        capture.ingest(path)
+    return capture, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="List the hosts seen in pcap/pcapng captures")
+    parser.add_argument("captures", nargs="+", help="pcap or pcapng files")
+    parser.add_argument("--subnet", help="CIDR range whose IPv4 sources all count as hosts")
+    args = parser.parse_args()
+    
+    try:
+        network = ipaddress.ip_network(args.subnet, strict=False) if args.subnet else None
+        capture, elapsed = ingest_files(args.captures)
+    except (OSError, ValueError) as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+    
+    hosts = capture.hosts(network)
+    print(f"[✓] {capture.packets} packets ({capture.bytes / 1e6:.1f} MB) in {elapsed:.2f}s "
+          f"({capture.bytes / 1e6 / max(elapsed, 1e-9):.0f} MB/s)")
+    print(f"\n{'IP Address':<16} {'MAC Address':<18} {'Hostname':<24} {'Open Ports'}")
+    print("-"*80)
+    for ip in sorted(hosts, key=ipaddress.ip_address):
+        host = hosts[ip]
+        ports = ','.join(map(str, host['open_ports'])) or '-'
+        print(f"{ip:<16} {host['mac'] or 'Unknown':<18} {host['hostname'] or 'Unknown':<24} {ports}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Service Scanner
+Async TCP connect scan over port profiles with optional banner capture
+"""
+
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import ipaddress
+from typing import Dict, Iterable, List, Optional
+
+from os_fingerprint import tcp_hints
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+# nmap's 100 most common TCP ports
+TOP_100_PORTS = [
+    7, 9, 13, 21, 22, 23, 25, 26, 37, 53, 79, 80, 81, 88, 106, 110, 111, 113, 119, 135,
+    139, 143, 144, 179, 199, 389, 427, 443, 444, 445, 465, 513, 514, 515, 543, 544, 548,
+    554, 587, 631, 646, 873, 990, 993, 995, 1025, 1026, 1027, 1028, 1029, 1110, 1433,
+    1720, 1723, 1755, 1900, 2000, 2001, 2049, 2121, 2717, 3000, 3128, 3306, 3389, 3986,
+    4899, 5000, 5009, 5051, 5060, 5101, 5190, 5357, 5432, 5631, 5666, 5800, 5900, 6000,
+    6001, 6646, 7070, 8000, 8008, 8009, 8080, 8081, 8443, 8888, 9100, 9999, 10000, 32768,
+    49152, 49153, 49154, 49155, 49156, 49157,
+]
+
+PORT_PROFILES = {
+    "top100": TOP_100_PORTS,
+    "windows": [135, 139, 445, 3389, 5985, 5986],   # RPC, NetBIOS, SMB, RDP, WinRM
+    "rdp": [3389],
+    "smb": [139, 445],
+    "winrm": [5985, 5986],
+}
+
+# Names for ports /etc/services often lacks or names differently
+SERVICE_NAMES = {
+    135: "msrpc", 139: "netbios-ssn", 445: "smb", 3389: "rdp",
+    5985: "winrm", 5986: "winrm-https", 5357: "wsdapi", 8080: "http-proxy",
+}
+
+HTTP_PORTS = {80, 81, 8000, 8008, 8080, 8081, 8888}
+HTTP_PROBE = b"HEAD / HTTP/1.0\r\n\r\n"
+
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_CONCURRENCY = 1000
+DEFAULT_PER_HOST = 32
+BANNER_BYTES = 256
+
+def parse_ports(spec: str) -> List[int]:
+    """Ports from a profile name or a list such as '22,80,8000-8100'"""
+    if spec in PORT_PROFILES:
+        return list(PORT_PROFILES[spec])
+    ports = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if part in PORT_PROFILES:
+            ports.update(PORT_PROFILES[part])
+        elif '-' in part:
+            start, end = (int(p) for p in part.split('-', 1))
+            ports.update(range(start, end + 1))
+        else:
+            ports.add(int(part))
+    if not ports or min(ports) < 1 or max(ports) > 65535:
+        raise ValueError(f"Invalid port specification: {spec}")
+    return sorted(ports)
+
+def service_name(port: int) -> str:
+    if port in SERVICE_NAMES:
+        return SERVICE_NAMES[port]
+    try:
+        return socket.getservbyport(port, "tcp")
+    except OSError:
+        return "unknown"
+
+def format_ports(open_ports: List) -> str:
+    """'22/ssh, 445/smb' from open_ports entries (dicts or bare port numbers)"""
+    if not open_ports:
+        return "None"
+    return ", ".join(f"{p['port']}/{p.get('service', 'unknown')}" if isinstance(p, dict) else str(p)
+                     for p in open_ports)
+
+def descriptor_limit(requested: int) -> int:
+    """requested, capped to leave headroom under the open-file limit"""
+    if resource is None:
+        return requested
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - 64))
+
+def _clean_banner(data: bytes) -> str:
+    line = data.decode("latin-1").strip().splitlines()
+    return ''.join(c for c in (line[0] if line else '') if c.isprintable())[:120]
+
+class ServiceScanner:
+    """TCP connect scan with global and per-host concurrency limits
+    
+    The global limit caps open sockets across all hosts (and is kept below
+    the process's file-descriptor limit); the per-host limit keeps one host
+    from taking every slot. A connection that completes is an open port;
+    refused and timed-out ones are not reported. The SYN-ACK details of
+    each host's first open port are kept in .hints for OS fingerprinting.
+    """
+    
+    def __init__(self, ports: Iterable[int] = TOP_100_PORTS,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_concurrent: int = DEFAULT_CONCURRENCY,
+                 per_host: int = DEFAULT_PER_HOST,
+                 banners: bool = False):
+        self.ports = sorted(set(ports))
+        self.timeout = timeout
+        self.max_concurrent = descriptor_limit(max_concurrent)
+        self.per_host = max(1, per_host)
+        self.banners = banners
+        self.hints: Dict[str, Dict] = {}
+        self._global = None
+    
+    async def _probe(self, ip: str, port: int, host_limit: asyncio.Semaphore) -> Optional[Dict]:
+        async with host_limit, self._global:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), self.timeout)
+            except (asyncio.TimeoutError, OSError):
+                return None
+            
+            if ip not in self.hints:
+                self.hints[ip] = tcp_hints(writer.get_extra_info("socket"))
+            
+            result = {"port": port, "service": service_name(port)}
+            try:
+                if self.banners:
+                    if port in HTTP_PORTS:
+                        writer.write(HTTP_PROBE)
+                    banner = await asyncio.wait_for(reader.read(BANNER_BYTES), self.timeout)
+                    if banner:
+                        result["banner"] = _clean_banner(banner)
+            except (asyncio.TimeoutError, OSError):
+                pass
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+            return result
+    
+    async def scan_host(self, ip: str) -> List[Dict]:
+        """Open ports of one host as [{'port', 'service'[, 'banner']}]"""
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrent)
+        host_limit = asyncio.Semaphore(self.per_host)
+        results = await asyncio.gather(*(self._probe(ip, port, host_limit) for port in self.ports))
+        return [r for r in results if r]
+    
+    async def scan_hosts(self, ips: Iterable[str]) -> Dict[str, List[Dict]]:
+        ips = list(ips)
+        results = await asyncio.gather(*(self.scan_host(ip) for ip in ips))
+        return dict(zip(ips, results))
+
+def main():
+    parser = argparse.ArgumentParser(description="Async TCP connect scan")
+    parser.add_argument("targets", nargs="+", help="IP addresses or CIDR ranges")
+    parser.add_argument("-p", "--ports", default="top100",
+                        help=f"profile ({', '.join(PORT_PROFILES)}) or list, e.g. 22,80,8000-8100")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="connect timeout (seconds)")
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_CONCURRENCY, help="open sockets overall")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="open sockets per host")
+    parser.add_argument("--banners", action="store_true", help="capture service banners")
+    args = parser.parse_args()
+    
+    try:
+        ports = parse_ports(args.ports)
+    except ValueError as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+    
+    hosts = []
+    for target in args.targets:
+        network = ipaddress.ip_network(target, strict=False)
+        hosts.extend(str(ip) for ip in (network.hosts() if network.num_addresses > 1 else [network.network_address]))
+    
+    scanner = ServiceScanner(ports, args.timeout, args.max_concurrent, args.per_host, args.banners)
+    print(f"[*] Scanning {len(hosts)} host(s) x {len(ports)} port(s), "
+          f"{scanner.max_concurrent} concurrent connection(s)...")
+    start = time.perf_counter()
+    results = asyncio.run(scanner.scan_hosts(hosts))
+    
+    for ip, open_ports in results.items():
+        if not open_ports:
+            continue
+        print(f"\n{ip}")
+        for entry in open_ports:
+            banner = f"  {entry['banner']}" if entry.get("banner") else ""
+            print(f"  {entry['port']:>5}/tcp  {entry['service']:<16}{banner}")
+    print(f"\n[✓] Scan complete in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -4,25 +4,28 @@ Visual Network Mapper
 Creates ASCII art network topology diagrams
 """
 
-import json
 import sys
+from itertools import islice
 from typing import List, Dict
 
+from device_table import DeviceTable
+from map_stream import MapReader
+from service_scanner import format_ports
+
 class VisualMapper:
     def __init__(self):
-        self.devices = []
+        self.devices = DeviceTable()
         self.gateway = "192.168.0.1"
     
     def load_from_json(self, json_file: str):
         """Load network data from JSON"""
         try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-                self.devices = data.get('devices', [])
-                
-                # Try to determine gateway
-                subnet = data.get('subnet', '192.168.0.0/24')
-                self.gateway = subnet.split('/')[0].rsplit('.', 1)[0] + '.1'
+            # Devices are streamed from the file on each pass, not held
+            self.devices = MapReader(json_file)
+            
+            # Try to determine gateway
+            subnet = self.devices.header.get('subnet') or '192.168.0.0/24'
+            self.gateway = subnet.split('/')[0].rsplit('.', 1)[0] + '.1'
             
             print(f"[✓] Loaded {len(self.devices)} device(s)")
         except Exception as e:
@@ -94,8 +97,11 @@ class VisualMapper:
         lines.append("")
         
         # Create rows of devices (3 per row)
-        for i in range(0, len(self.devices), 3):
-            batch = self.devices[i:i+3]
+        devices = iter(self.devices)
+        while True:
+            batch = list(islice(devices, 3))
+            if not batch:
+                break
             
             # Top border
             top_line = "    "
@@ -131,6 +137,13 @@ class VisualMapper:
                 os_line += f"│ OS: {os:<15} │  "
             lines.append(os_line)
             
+            # Open ports
+            ports_line = "    "
+            for device in batch:
+                ports = format_ports(device.get('open_ports'))[:12]
+                ports_line += f"│ Ports: {ports:<12} │  "
+            lines.append(ports_line)
+            
             # Bottom border
             bottom_line = "    "
             for _ in batch:
@@ -138,7 +151,7 @@ class VisualMapper:
             lines.append(bottom_line)
             lines.append("")
         
-        return '\\n'.join(lines)
+        return '\n'.join(lines)
     
     def generate_tree_diagram(self) -> str:
         """Generate tree-style network diagram"""
@@ -163,12 +176,13 @@ class VisualMapper:
             lines.append(f"{prefix}{hostname}")
             lines.append(f"{continuation}├─ IP:  {ip}")
             lines.append(f"{continuation}├─ MAC: {mac}")
-            lines.append(f"{continuation}└─ OS:  {os}")
+            lines.append(f"{continuation}├─ OS:  {os}")
+            lines.append(f"{continuation}└─ Ports: {format_ports(device.get('open_ports'))}")
             
             if not is_last:
                 lines.append("│")
         
-        return '\\n'.join(lines)
+        return '\n'.join(lines)
     
     def save_diagram(self, diagram: str, filename: str):
         """Save diagram to file"""
@@ -188,7 +202,7 @@ def main():
     """)
     
     if len(sys.argv) < 2:
-        print("Usage: python3 visual_mapper.py <network_map.json> [diagram_type]")
+        print("Usage: python3 visual_mapper.py <network_map.json or *.manifest.json> [diagram_type]")
         print("\\nDiagram Types:")
         print("  simple   - Simple network diagram (default)")
         print("  detailed - Detailed diagram with all info")
@@ -5,10 +5,19 @@ Generates comprehensive competition reports
 """
 
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+MAPPING_DIR = REPO_ROOT / "scripts" / "05_network_mapping"
+
+if str(MAPPING_DIR) not in sys.path:
+    sys.path.insert(0, str(MAPPING_DIR))
+from map_stream import MapReader
+from service_scanner import format_ports
+
 class ReportGenerator:
     def __init__(self):
         self.team_name = ""
@@ -34,9 +43,8 @@ class ReportGenerator:
     def load_network_data(self, network_file: str = "network_map.json"):
         """Load network mapping data"""
         try:
-            with open(network_file, 'r') as f:
-                data = json.load(f)
-                self.network_data = data.get('devices', [])
+            # Devices are streamed from the file on each pass, not held
+            self.network_data = MapReader(network_file)
             print(f"[✓] Loaded network data: {len(self.network_data)} devices")
         except Exception as e:
             print(f"[!] Error loading network data: {e}")
@@ -95,19 +103,19 @@ COMPETITION OBJECTIVES
         
         for task in self.tasks:
             status = "✓ COMPLETED" if task.get('completed') else "○ PENDING"
-            details += f"Task {task['number']}: {task['name']}\\n"
-            details += f"  Category: {task['category']}\\n"
-            details += f"  Points: {task['points']}\\n"
-            details += f"  Status: {status}\\n"
+            details += f"Task {task['number']}: {task['name']}\n"
+            details += f"  Category: {task['category']}\n"
+            details += f"  Points: {task['points']}\n"
+            details += f"  Status: {status}\n"
             
             if task.get('completed') and task.get('completion_time'):
                 time = datetime.fromisoformat(task['completion_time']).strftime("%H:%M:%S")
-                details += f"  Completed: {time}\\n"
+                details += f"  Completed: {time}\n"
             
             if task.get('notes'):
-                details += f"  Notes: {task['notes']}\\n"
+                details += f"  Notes: {task['notes']}\n"
             
-            details += "\\n"
+            details += "\n"
         
         return details
     
@@ -124,13 +132,14 @@ NETWORK TOPOLOGY
 """
         
         for i, device in enumerate(self.network_data, 1):
-            section += f"Device {i}:\\n"
-            section += f"  Hostname:    {device.get('hostname', 'Unknown')}\\n"
-            section += f"  IP Address:  {device.get('ip', 'Unknown')}\\n"
-            section += f"  MAC Address: {device.get('mac', 'Unknown')}\\n"
-            section += f"  OS:          {device.get('os', 'Unknown')}\\n"
-            section += f"  Vendor:      {device.get('vendor', 'Unknown')}\\n"
-            section += "\\n"
+            section += f"Device {i}:\n"
+            section += f"  Hostname:    {device.get('hostname', 'Unknown')}\n"
+            section += f"  IP Address:  {device.get('ip', 'Unknown')}\n"
+            section += f"  MAC Address: {device.get('mac', 'Unknown')}\n"
+            section += f"  OS:          {device.get('os', 'Unknown')}\n"
+            section += f"  Vendor:      {device.get('vendor', 'Unknown')}\n"
+            section += f"  Open Ports:  {format_ports(device.get('open_ports'))}\n"
+            section += "\n"
         
         return section
     
@@ -142,14 +151,14 @@ NETWORK TOPOLOGY
 """
         
         if not self.discoveries:
-            section += "No discoveries logged.\\n\\n"
+            section += "No discoveries logged.\n\n"
         else:
             for discovery in self.discoveries:
                 timestamp = datetime.fromisoformat(discovery['timestamp']).strftime("%H:%M:%S")
-                section += f"[{timestamp}] {discovery['action']}\\n"
+                section += f"[{timestamp}] {discovery['action']}\n"
                 if discovery.get('details'):
-                    section += f"  {discovery['details']}\\n"
-                section += "\\n"
+                    section += f"  {discovery['details']}\n"
+                section += "\n"
         
         return section
     
@@ -236,15 +245,15 @@ RECOMMENDATIONS
         
         # Add all sections
         report += self.generate_executive_summary()
-        report += "\\n\\n"
+        report += "\n\n"
         report += self.generate_task_details()
-        report += "\\n"
+        report += "\n"
         report += self.generate_network_section()
-        report += "\\n"
+        report += "\n"
         report += self.generate_discoveries_section()
-        report += "\\n"
+        report += "\n"
         report += self.generate_methodology_section()
-        report += "\\n"
+        report += "\n"
         report += self.generate_lessons_learned()
         
         # Add footer
@@ -257,4 +266,33 @@ Generated by Competition Report Generator
 """
         
         # Save to file
-        with open(filename, 'w
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(report)
+        
+        print(f"[✓] Report saved to: {filename}")
+        return filename
+
+def main():
+    print("""
+╔═══════════════════════════════════════════════════════════╗
+║       REPORT GENERATOR - Competition Tool                 ║
+╚═══════════════════════════════════════════════════════════╝
+    """)
+    
+    if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help"):
+        print("Usage: python3 report_generator.py [network_map.json or *.manifest.json] [output]")
+        print("\nReads task_progress.json and competition_log.json from the current")
+        print("directory, plus the network map (default: network_map.json).")
+        return
+    
+    network_file = sys.argv[1] if len(sys.argv) > 1 else "network_map.json"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else "competition_report.txt"
+    
+    generator = ReportGenerator()
+    generator.load_task_data()
+    generator.load_network_data(network_file)
+    generator.load_log_data()
+    generator.generate_full_report(output_file)
+
+if __name__ == "__main__":
+    main()